@@ -1,2 +1,7 @@
 """Application package initialization."""
+import time
+
 __version__ = "1.0.0"
+
+# Reference point for the startup time reported once the API is ready
+started_at = time.perf_counter()
@@ -1,5 +1,6 @@
 """API routes package initialization."""
 from .prediction import router as prediction_router
 from .model import router as model_router
+from .metrics import router as metrics_router
 
-__all__ = ["prediction_router", "model_router"]
+__all__ = ["prediction_router", "model_router", "metrics_router"]
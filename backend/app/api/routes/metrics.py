@@ -0,0 +1,107 @@
+"""Metrics API routes and request instrumentation."""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+
+from app.core.metrics import metrics_registry, request_duration, requests_total, stage_duration
+
+router = APIRouter(tags=["metrics"])
+
+# [endpoint start, endpoint end] of the request being handled
+_endpoint_span: ContextVar[Optional[List[float]]] = ContextVar("endpoint_span", default=None)
+
+
+class MetricsRoute(APIRoute):
+    """
+    APIRoute that records request counts and latency per endpoint.
+
+    The time before the endpoint function starts is reported as the "parse"
+    stage (body read, JSON decoding, request validation) and the time after
+    it returns as the "serialize" stage (response validation and encoding).
+    For routes with a JSON body model, the body is read first so the part of
+    "parse" spent decoding and validating it is also reported as the
+    "validate" stage.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        call = self.dependant.call
+        if not asyncio.iscoroutinefunction(call):
+            return
+
+        async def timed_call(**values):
+            span = _endpoint_span.get()
+            if span is not None:
+                span[0] = time.perf_counter()
+            try:
+                return await call(**values)
+            finally:
+                if span is not None:
+                    span[1] = time.perf_counter()
+
+        # The request handler looks the endpoint up on the dependant at call time
+        self.dependant.call = timed_call
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        endpoint = self.path
+        # Streaming and binary endpoints read the body themselves
+        validates_body = self.body_field is not None
+
+        async def instrumented_handler(request: Request) -> Response:
+            span = [0.0, 0.0]
+            token = _endpoint_span.set(span)
+            start = time.perf_counter()
+            read = 0.0
+            status_code = 500
+            try:
+                if validates_body:
+                    # Cached on the request, the handler decodes it from there
+                    await request.body()
+                    read = time.perf_counter()
+                response = await handler(request)
+                status_code = response.status_code
+                return response
+            except HTTPException as e:
+                status_code = e.status_code
+                raise
+            except RequestValidationError:
+                status_code = 422
+                raise
+            finally:
+                end = time.perf_counter()
+                _endpoint_span.reset(token)
+                request_duration.observe(end - start, endpoint)
+                requests_total.inc(endpoint, str(status_code))
+                if span[1]:
+                    stage_duration.observe(span[0] - start, "parse")
+                    if read:
+                        stage_duration.observe(span[0] - read, "validate")
+                    stage_duration.observe(span[1] - span[0], "endpoint")
+                    stage_duration.observe(end - span[1], "serialize")
+
+        return instrumented_handler
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics",
+    description="Stage latency histograms, request counters and batch size distributions of all workers"
+)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Expose metrics in the Prometheus text format.
+
+    Returns:
+        Metrics merged across the server's worker processes
+    """
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,16 +1,27 @@
 """Model information API routes."""
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+import secrets
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Header, HTTPException, status
 from loguru import logger
 
 from app.schemas.response import (
     ModelInfoResponse,
+    ModelReloadResponse,
     FeatureImportanceResponse,
     HealthCheckResponse,
     ErrorResponse
 )
-from app.core.model_loader import model_loader
+from app.core.model_loader import ReloadInProgressError, model_loader
 from app.core.config import get_settings
+from app.core.executor import inference_executor
+from app.core.admission import admission_controller
+from app.api.rpc import rpc_server
+from app.services.decision_store import decision_log
+from app.services.explainer import explainer
+from app.services.micro_batcher import micro_batcher
+from app.services.prediction_service import prediction_service
+from app.services.shadow_scorer import shadow_scorer
 
 router = APIRouter(prefix="/model", tags=["model"])
 
@@ -31,7 +42,8 @@ async def get_model_info() -> Dict[str, Any]:
     Get information about the loaded model including version, metrics, and configuration.
     
     Returns:
-        Model metadata including version, performance metrics, and training info
+        Model metadata including version, performance metrics, training info
+        and the active artifact version
         
     Raises:
         HTTPException: If model info cannot be retrieved
@@ -39,8 +51,8 @@ async def get_model_info() -> Dict[str, Any]:
     try:
         logger.info("Retrieving model information")
         
-        metadata = model_loader.metadata
-        settings = get_settings()
+        artifacts = model_loader.artifacts
+        metadata = artifacts.metadata
         
         return {
             "model_version": metadata.get("version", "1.0"),
@@ -49,7 +61,10 @@ async def get_model_info() -> Dict[str, Any]:
             "performance_metrics": metadata.get("performance_metrics", {}),
             "features": metadata.get("features", []),
             "hyperparameters": metadata.get("hyperparameters", {}),
-            "training_data_size": metadata.get("training_samples", 5090096)
+            "training_data_size": metadata.get("training_samples", 5090096),
+            "artifact_version": artifacts.version,
+            "loaded_at": artifacts.loaded_at,
+            "type_codes": dict(artifacts.type_codes)
         }
         
     except Exception as e:
@@ -181,3 +196,122 @@ async def health_check() -> Dict[str, Any]:
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail={"status": "unhealthy", "message": str(e)}
         )
+
+
+@router.get(
+    "/stats",
+    status_code=status.HTTP_200_OK,
+    summary="Serving statistics",
+    description=(
+        "Inference executor, admission control, micro-batching, prediction cache, "
+        "velocity feature store, contributions, RPC listener, decision store and artifact version statistics"
+    )
+)
+async def get_serving_stats() -> Dict[str, Any]:
+    """
+    Get runtime statistics of the inference path.
+    
+    Returns:
+        Executor queue counters, admission control counters, achieved
+        micro-batch sizes, prediction cache, velocity store, contributions,
+        RPC listener and decision store counters and the active/recent
+        artifact versions
+    """
+    cache = prediction_service.cache
+    return {
+        "executor": inference_executor.stats(),
+        "admission": admission_controller.stats(),
+        "micro_batcher": micro_batcher.stats(),
+        "prediction_cache": cache.stats() if cache is not None else {"enabled": False},
+        "velocity_store": (
+            prediction_service.velocity_store.stats()
+            if prediction_service.velocity_store is not None else {"enabled": False}
+        ),
+        "contributions": explainer.stats(),
+        "rpc": rpc_server.stats(),
+        "decision_store": decision_log.stats(),
+        "artifacts": {
+            "active": model_loader.artifacts.info() if model_loader.is_loaded() else None,
+            "history": model_loader.history
+        }
+    }
+
+
+@router.get(
+    "/shadow",
+    status_code=status.HTTP_200_OK,
+    summary="Shadow model comparison",
+    description="Agreement of shadow (challenger) models with the primary model on live traffic"
+)
+async def get_shadow_stats() -> Dict[str, Any]:
+    """
+    Get shadow scoring statistics.
+    
+    Returns:
+        Load shedding counters and, per shadow model, decision and risk level
+        disagreement rates and probability differences against the primary model
+    """
+    return shadow_scorer.stats()
+
+
+@router.post(
+    "/reload",
+    response_model=ModelReloadResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Hot reload model artifacts",
+    description="Load the model artifacts from disk, warm them up and swap them in without downtime",
+    responses={
+        200: {"description": "Reload finished (or artifacts unchanged)"},
+        401: {"model": ErrorResponse, "description": "Missing or invalid admin key"},
+        403: {"model": ErrorResponse, "description": "Admin endpoints are disabled"},
+        409: {"model": ErrorResponse, "description": "A reload is already in progress"},
+        500: {"model": ErrorResponse, "description": "Reload failed; the active model is unchanged"}
+    }
+)
+async def reload_model(
+    x_admin_key: Optional[str] = Header(None, description="Admin API key (ADMIN_API_KEY)")
+) -> Dict[str, Any]:
+    """
+    Hot reload the configured model artifacts in this worker.
+    
+    In-flight requests finish on the artifacts they started with. With
+    several server workers, each one reloads on its own; use the artifact
+    watcher (ARTIFACT_WATCH_ENABLED) to roll a new model out to all of them.
+    
+    Args:
+        x_admin_key: Value of the X-Admin-Key header
+    
+    Returns:
+        Previous and active artifact versions and the reload duration
+        
+    Raises:
+        HTTPException: If unauthorized, already reloading, or loading fails
+    """
+    settings = get_settings()
+    if not settings.admin_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"error": "Admin endpoints disabled", "message": "Set ADMIN_API_KEY to enable model reloads"}
+        )
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.admin_api_key):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"error": "Unauthorized", "message": "Invalid or missing X-Admin-Key header"}
+        )
+    
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(None, model_loader.reload)
+    except ReloadInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "Reload in progress", "message": str(e)}
+        )
+    except Exception as e:
+        logger.error(f"Model reload failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Model reload failed", "message": f"Active model unchanged: {e}"}
+        )
+    
+    logger.info(f"Model reload: {result}")
+    return result
@@ -1,17 +1,165 @@
 """Prediction API routes for fraud detection."""
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Any, List, Literal, Optional, Tuple, Union
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Request, Response, status
+from fastapi import Path as PathParam
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
+from pydantic import ValidationError
 
 from app.schemas.transaction import TransactionInput, BatchTransactionInput
 from app.schemas.response import (
     PredictionResponse,
     BatchPredictionResponse,
-    ErrorResponse
+    ColumnarBatchPredictionResponse,
+    ErrorResponse,
+    StoredDecisionResponse
 )
-from app.services import prediction_service
+from app.services import prediction_service, micro_batcher, shadow_scorer, explainer
+from app.services import binary_batch
+from app.services.decision_store import decision_log, merge_decided, stored_prediction
+from app.core.config import get_settings
+from app.core.logging_config import log_prediction
+from app.core.executor import inference_executor, InferenceRejected, InferenceTimeout
+from app.core.admission import admission_controller, AdmissionRejected, Deadline
+from app.core.metrics import overload_decisions_total, stage_duration
+from app.api.routes.metrics import MetricsRoute
 
-router = APIRouter(prefix="/predictions", tags=["predictions"])
+router = APIRouter(prefix="/predictions", tags=["predictions"], route_class=MetricsRoute)
+
+
+def _json_response(content: Dict[str, Any]) -> ORJSONResponse:
+    """
+    Serialize service output with orjson.
+    
+    Returning a response object skips FastAPI's response_model re-validation
+    and jsonable_encoder pass; the service already produces plain, validated
+    values, and the response_model declarations remain for the OpenAPI schema.
+    """
+    with stage_duration.time("render"):
+        return ORJSONResponse(content)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response that can be sent while the request body is still arriving.
+    
+    Starlette's StreamingResponse listens for client disconnects by reading
+    from receive(), which would consume the request body the generator is
+    still parsing. This variant only streams.
+    """
+    
+    media_type = "application/x-ndjson"
+    
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _deadline_header() -> Any:
+    """X-Deadline-Ms request header parameter."""
+    return Header(
+        None,
+        alias="X-Deadline-Ms",
+        gt=0,
+        description=(
+            "Answer-time budget in milliseconds; overrides default_deadline_ms. Requests that "
+            "cannot be scored by the model in time are shed (see overload_policy)"
+        )
+    )
+
+
+def _explain_query() -> Any:
+    """explain query parameter."""
+    return Query(
+        False,
+        description=(
+            "Include per-feature contributions for every prediction; without it only "
+            "MEDIUM/HIGH risk predictions carry them, with contributions_mode=risky"
+        )
+    )
+
+
+async def _add_contributions(
+    transactions: List[TransactionInput],
+    predictions: Union[List[dict], Dict[str, Any]],
+    risk_levels: List[str],
+    explain: bool,
+    deadline: Deadline
+) -> None:
+    """
+    Attach feature contributions to the batch predictions that want them.
+    
+    Rows needing contributions are explained together in one call on the
+    explain executor; rows it skips (pool full, deadline) get none.
+    
+    Args:
+        transactions: Scored transactions
+        predictions: Records (list of dicts) or columnar (dict of lists) predictions
+        risk_levels: Risk level per transaction
+        explain: Whether the request passed explain=true
+        deadline: Request deadline
+    """
+    rows = [row for row, risk_level in enumerate(risk_levels) if explainer.wanted(risk_level, explain)]
+    if not rows:
+        return
+    contributions = await explainer.explain([transactions[row] for row in rows], deadline)
+    if isinstance(predictions, dict):
+        column: List[Optional[Dict[str, float]]] = [None] * len(transactions)
+        for row, values in zip(rows, contributions):
+            column[row] = values
+        predictions["contributions"] = column
+    else:
+        for row, values in zip(rows, contributions):
+            predictions[row]["contributions"] = values
+
+
+# Columns of predict_batch_columnar output besides "errors"
+_PREDICTION_COLUMNS = (
+    "fraud_probability", "is_fraud", "risk_level", "recommended_action", "confidence", "explanation"
+)
+
+
+def _overload_decision(transaction: TransactionInput, reason: str, message: str) -> ORJSONResponse:
+    """
+    Answer a single prediction the model could not score in time.
+    
+    With overload_policy "fallback" the answer is a rules-only decision,
+    flagged with decision_source "rules" and the X-Decision-Source header;
+    with "reject" it is a fast 503.
+    
+    Args:
+        transaction: Transaction that was not scored by the model
+        reason: Overload reason (in_flight, deadline, queue_full or timeout)
+        message: Human-readable detail
+    
+    Returns:
+        Rules-only prediction response
+    
+    Raises:
+        HTTPException: 503 with the reject policy
+    """
+    if get_settings().overload_policy == "reject":
+        overload_decisions_total.inc(reason, "rejected")
+        logger.warning(f"Overload ({reason}), shedding request: {message}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "Service overloaded", "message": message},
+            headers={"Retry-After": "1"}
+        )
+    
+    overload_decisions_total.inc(reason, "fallback")
+    logger.warning(f"Overload ({reason}), answering with a rules-only decision: {message}")
+    result = prediction_service.rules_decision(transaction, reason)
+    if transaction.transaction_id is not None:
+        # Not stored: a retry once the load has passed gets a model decision
+        result["transaction_id"] = transaction.transaction_id
+    response = _json_response({**result, "timestamp": datetime.utcnow()})
+    response.headers["X-Decision-Source"] = "rules"
+    return response
 
 
 @router.post(
@@ -19,36 +167,92 @@ router = APIRouter(prefix="/predictions", tags=["predictions"])
     response_model=PredictionResponse,
     status_code=status.HTTP_200_OK,
     summary="Predict fraud for a single transaction",
-    description="Analyze a single transaction and return fraud prediction with risk assessment",
+    description=(
+        "Analyze a single transaction and return fraud prediction with risk assessment. "
+        "Under overload, or when the X-Deadline-Ms budget cannot be met, the answer is a "
+        "rules-only decision with decision_source \"rules\" (or a 503 with overload_policy=reject). "
+        "MEDIUM/HIGH risk predictions, or all with ?explain=true, carry per-feature contributions"
+    ),
     responses={
         200: {"description": "Successful prediction"},
         400: {"model": ErrorResponse, "description": "Invalid input data"},
-        500: {"model": ErrorResponse, "description": "Internal server error"}
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Overloaded (overload_policy=reject)"},
+        504: {"model": ErrorResponse, "description": "Inference timed out (no deadline set)"}
     }
 )
-async def predict_single_transaction(transaction: TransactionInput) -> Dict[str, Any]:
+async def predict_single_transaction(
+    transaction: TransactionInput,
+    background_tasks: BackgroundTasks,
+    deadline_ms: Optional[float] = _deadline_header(),
+    explain: bool = _explain_query()
+) -> ORJSONResponse:
     """
     Predict fraud probability for a single transaction.
     
     Args:
         transaction: Transaction data to analyze
-        
+        background_tasks: Used to hand the request to shadow models after responding
+        deadline_ms: Answer-time budget (X-Deadline-Ms)
+        explain: Include feature contributions regardless of risk level
+    
     Returns:
         Prediction result with fraud probability, risk level, and recommended action
-        
+    
     Raises:
         HTTPException: If prediction fails
     """
+    settings = get_settings()
+    if transaction.transaction_id is not None and decision_log.enabled:
+        stored = await decision_log.find(transaction.transaction_id)
+        if stored is not None:
+            decision_log.count_duplicates(1)
+            return _json_response(stored_prediction(stored))
+    
+    deadline = admission_controller.deadline(deadline_ms)
     try:
-        logger.info(f"Processing single transaction prediction: type={transaction.type}, amount={transaction.amount}")
+        with admission_controller.admit(deadline):
+            # Get prediction with full explanation, off the event loop
+            timeout = deadline.timeout(settings.inference_timeout_seconds)
+            if settings.micro_batching_enabled:
+                result = await micro_batcher.submit(transaction, timeout=timeout)
+            else:
+                result = await inference_executor.run(
+                    prediction_service.predict_with_explanation, transaction, timeout=timeout
+                )
         
-        # Get prediction with full explanation
-        result = prediction_service.predict_with_explanation(transaction)
+        log_prediction(
+            "Prediction: type={type}, amount={amount:,.2f}, prob={fraud_probability:.4f}, risk={risk_level}",
+            type=transaction.type,
+            amount=transaction.amount,
+            fraud_probability=result["fraud_probability"],
+            is_fraud=result["is_fraud"],
+            risk_level=result["risk_level"]
+        )
         
-        logger.info(f"Prediction completed: fraud={result['is_fraud']}, risk={result['risk_level']}")
+        if explainer.wanted(result["risk_level"], explain):
+            result = {**result, "contributions": (await explainer.explain([transaction], deadline))[0]}
+        if transaction.transaction_id is not None:
+            result = {**result, "transaction_id": transaction.transaction_id}
+            decision_log.record([transaction], [result])
         
-        return result
+        if shadow_scorer.active:
+            background_tasks.add_task(shadow_scorer.submit, [transaction], [result])
         
+        return _json_response({**result, "timestamp": datetime.utcnow()})
+    
+    except AdmissionRejected as e:
+        return _overload_decision(transaction, e.reason, str(e))
+    except InferenceRejected as e:
+        return _overload_decision(transaction, "queue_full", str(e))
+    except InferenceTimeout as e:
+        if deadline.budget is not None:
+            return _overload_decision(transaction, "timeout", str(e))
+        logger.error(f"Inference timed out: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail={"error": "Prediction timed out", "message": str(e)}
+        )
     except ValueError as e:
         logger.error(f"Validation error in prediction: {str(e)}")
         raise HTTPException(
@@ -65,67 +269,136 @@ async def predict_single_transaction(transaction: TransactionInput) -> Dict[str,
 
 @router.post(
     "/batch",
-    response_model=BatchPredictionResponse,
+    response_model=Union[BatchPredictionResponse, ColumnarBatchPredictionResponse],
     status_code=status.HTTP_200_OK,
     summary="Predict fraud for multiple transactions",
-    description="Analyze multiple transactions in batch and return predictions for each",
+    description=(
+        "Analyze multiple transactions in batch and return predictions for each; "
+        "with ?format=columnar predictions are returned as parallel arrays. MEDIUM/HIGH "
+        "risk rows, or all rows with ?explain=true, carry per-feature contributions"
+    ),
     responses={
         200: {"description": "Successful batch prediction"},
         400: {"model": ErrorResponse, "description": "Invalid input data"},
-        500: {"model": ErrorResponse, "description": "Internal server error"}
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Overloaded or X-Deadline-Ms cannot be met"},
+        504: {"model": ErrorResponse, "description": "Inference timed out"}
     }
 )
-async def predict_batch_transactions(batch: BatchTransactionInput) -> Dict[str, Any]:
+async def predict_batch_transactions(
+    batch: BatchTransactionInput,
+    background_tasks: BackgroundTasks,
+    response_format: Literal["records", "columnar"] = Query(
+        "records",
+        alias="format",
+        description="records: list of prediction objects; columnar: parallel arrays"
+    ),
+    deadline_ms: Optional[float] = _deadline_header(),
+    explain: bool = _explain_query()
+) -> ORJSONResponse:
     """
     Predict fraud probability for multiple transactions in batch.
     
     Args:
         batch: Batch of transactions to analyze
-        
+        background_tasks: Used to hand the batch to shadow models after responding
+        response_format: Response layout (?format=)
+        deadline_ms: Answer-time budget (X-Deadline-Ms)
+        explain: Include feature contributions for every row
+    
     Returns:
         Batch prediction results with statistics
-        
+    
     Raises:
         HTTPException: If batch prediction fails
     """
+    deadline = admission_controller.deadline(deadline_ms)
+    transactions = batch.transactions
+    fresh_rows, stored, repeated = await decision_log.split_decided(transactions)
+    fresh = [transactions[row] for row in fresh_rows] if stored or repeated else transactions
     try:
-        logger.info(f"Processing batch prediction: {len(batch.transactions)} transactions")
+        if fresh:
+            with admission_controller.admit(deadline):
+                timeout = deadline.timeout(get_settings().inference_timeout_seconds)
+                if response_format == "columnar":
+                    predictions = await inference_executor.run(
+                        prediction_service.predict_batch_columnar, fresh, timeout=timeout
+                    )
+                    risk_levels = predictions["risk_level"]
+                else:
+                    predictions = await inference_executor.run(
+                        prediction_service.predict_batch, fresh, timeout=timeout
+                    )
+                    predictions = [
+                        {**result, "transaction_id": transaction.transaction_id}
+                        if transaction.transaction_id is not None else result
+                        for transaction, result in zip(fresh, predictions)
+                    ]
+                    risk_levels = [result["risk_level"] for result in predictions]
+            
+            await _add_contributions(fresh, predictions, risk_levels, explain, deadline)
+            decision_log.record_predictions(fresh, predictions)
+            
+            if shadow_scorer.active:
+                primary_results = predictions
+                if response_format == "columnar":
+                    primary_results = [
+                        {"fraud_probability": probability, "risk_level": risk_level}
+                        for probability, risk_level in zip(predictions["fraud_probability"], risk_levels)
+                    ]
+                background_tasks.add_task(shadow_scorer.submit, fresh, primary_results)
+        elif response_format == "columnar":
+            predictions = {key: [] for key in _PREDICTION_COLUMNS}
+            predictions["errors"] = []
+        else:
+            predictions = []
         
-        predictions = []
-        fraud_count = 0
-        high_risk_count = 0
+        if stored or repeated:
+            predictions = merge_decided(len(transactions), fresh_rows, predictions, stored, repeated)
+        if response_format == "columnar":
+            is_fraud = predictions["is_fraud"]
+            risk_levels = predictions["risk_level"]
+        else:
+            is_fraud = [result["is_fraud"] for result in predictions]
+            risk_levels = [result["risk_level"] for result in predictions]
         
-        for idx, transaction in enumerate(batch.transactions):
-            try:
-                result = prediction_service.predict_with_explanation(transaction)
-                predictions.append(result)
-                
-                if result["is_fraud"]:
-                    fraud_count += 1
-                if result["risk_level"] == "HIGH":
-                    high_risk_count += 1
-                    
-            except Exception as e:
-                logger.warning(f"Failed to process transaction {idx}: {str(e)}")
-                predictions.append({
-                    "is_fraud": False,
-                    "fraud_probability": 0.0,
-                    "risk_level": "UNKNOWN",
-                    "recommended_action": "MANUAL_REVIEW",
-                    "confidence": 0.0,
-                    "explanation": f"Processing failed: {str(e)}",
-                    "transaction_id": getattr(transaction, 'transaction_id', None)
-                })
+        fraud_count = sum(is_fraud)
+        high_risk_count = risk_levels.count("HIGH")
+        failed_count = risk_levels.count("UNKNOWN")
         
-        logger.info(f"Batch prediction completed: {fraud_count} frauds detected, {high_risk_count} high-risk")
+        # One summary line per batch
+        logger.info(
+            "Batch prediction: {transactions} transactions, {fraud_detected} fraud, "
+            "{high_risk} high-risk, {failed} failed, {duplicates} duplicate",
+            transactions=len(transactions),
+            fraud_detected=fraud_count,
+            high_risk=high_risk_count,
+            failed=failed_count,
+            duplicates=len(stored) + len(repeated)
+        )
         
-        return {
+        return _json_response({
             "predictions": predictions,
-            "total_transactions": len(batch.transactions),
+            "total_transactions": len(transactions),
             "fraud_detected": fraud_count,
             "high_risk_count": high_risk_count
-        }
-        
+        })
+    
+    except (AdmissionRejected, InferenceRejected) as e:
+        reason = e.reason if isinstance(e, AdmissionRejected) else "queue_full"
+        overload_decisions_total.inc(reason, "rejected")
+        logger.warning(f"Overload ({reason}), shedding batch: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "Service overloaded", "message": str(e)},
+            headers={"Retry-After": "1"}
+        )
+    except InferenceTimeout as e:
+        logger.error(f"Inference timed out: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail={"error": "Prediction timed out", "message": str(e)}
+        )
     except Exception as e:
         logger.error(f"Unexpected error in batch prediction: {str(e)}")
         raise HTTPException(
@@ -134,6 +407,188 @@ async def predict_batch_transactions(batch: BatchTransactionInput) -> Dict[str,
         )
 
 
+def _require_media_type(request: Request, media_type: str) -> None:
+    """Reject a binary batch whose Content-Type is not media_type."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != media_type:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail={"error": "Unsupported media type", "message": f"Expected Content-Type: {media_type}"}
+        )
+
+
+async def _score_binary(
+    scorer: Callable[..., Tuple[bytes, Dict[str, str]]],
+    media_type: str,
+    deadline: Deadline,
+    *args: Any
+) -> Response:
+    """
+    Run a binary batch scorer on the inference executor and wrap its output.
+    
+    Args:
+        scorer: binary_batch.score_arrow or binary_batch.score_raw
+        media_type: Response media type
+        deadline: Deadline of the request, checked by admission control
+        *args: Scorer arguments
+    
+    Returns:
+        Binary response with the scorer's headers
+    
+    Raises:
+        HTTPException: If the payload is invalid or scoring fails
+    """
+    try:
+        with admission_controller.admit(deadline):
+            timeout = deadline.timeout(get_settings().inference_timeout_seconds)
+            content, headers = await inference_executor.run(scorer, *args, timeout=timeout)
+        logger.info(f"Binary batch prediction: {headers['X-Row-Count']} rows ({media_type})")
+        return Response(content=content, media_type=media_type, headers=headers)
+    
+    except binary_batch.BatchTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={"error": "Batch too large", "message": str(e)}
+        )
+    except binary_batch.BinaryBatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Invalid batch payload", "message": str(e)}
+        )
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail={"error": "Arrow not available", "message": "Arrow batches require pyarrow (pip install pyarrow)"}
+        )
+    except (AdmissionRejected, InferenceRejected) as e:
+        reason = e.reason if isinstance(e, AdmissionRejected) else "queue_full"
+        overload_decisions_total.inc(reason, "rejected")
+        logger.warning(f"Overload ({reason}), shedding binary batch: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "Service overloaded", "message": str(e)},
+            headers={"Retry-After": "1"}
+        )
+    except InferenceTimeout as e:
+        logger.error(f"Inference timed out: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail={"error": "Prediction timed out", "message": str(e)}
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error in binary batch prediction: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "Batch prediction failed", "message": str(e)}
+        )
+
+
+_BINARY_ERROR_RESPONSES = {
+    400: {"model": ErrorResponse, "description": "Malformed payload"},
+    413: {"model": ErrorResponse, "description": "More rows than binary_batch_max_rows"},
+    415: {"model": ErrorResponse, "description": "Wrong Content-Type"},
+    500: {"model": ErrorResponse, "description": "Internal server error"},
+    503: {"model": ErrorResponse, "description": "Shed by admission control or inference queue full"},
+    504: {"model": ErrorResponse, "description": "Inference timed out"}
+}
+
+
+@router.post(
+    "/batch/arrow",
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+    summary="Predict fraud for an Arrow IPC batch",
+    description=(
+        "Scores an Arrow IPC stream with columns step, amount, oldbalanceOrg, newbalanceOrig, "
+        "oldbalanceDest, newbalanceDest and type (strings, plain or dictionary encoded) or "
+        "type_code (encoder codes, see /model/info). Returns an Arrow IPC stream with "
+        "fraud_probability, is_fraud, risk_level, recommended_action and confidence, in input order; "
+        "rows failing validation get risk_level UNKNOWN"
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {binary_batch.ARROW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}}
+        }
+    },
+    responses={
+        200: {"content": {binary_batch.ARROW_MEDIA_TYPE: {}}, "description": "Scores as an Arrow IPC stream"},
+        501: {"model": ErrorResponse, "description": "pyarrow is not installed"},
+        **_BINARY_ERROR_RESPONSES
+    }
+)
+async def predict_batch_arrow(
+    request: Request,
+    deadline_ms: Optional[float] = _deadline_header()
+) -> Response:
+    """
+    Score a columnar Arrow batch without per-transaction validation objects.
+    
+    Args:
+        request: Request whose body is an Arrow IPC stream
+        deadline_ms: Answer-time budget (X-Deadline-Ms)
+    
+    Returns:
+        Arrow IPC stream response
+    """
+    deadline = admission_controller.deadline(deadline_ms)
+    _require_media_type(request, binary_batch.ARROW_MEDIA_TYPE)
+    body = await request.body()
+    return await _score_binary(binary_batch.score_arrow, binary_batch.ARROW_MEDIA_TYPE, deadline, body)
+
+
+@router.post(
+    "/batch/raw",
+    response_class=Response,
+    status_code=status.HTTP_200_OK,
+    summary="Predict fraud for a packed float32 batch",
+    description=(
+        f"Scores X-Row-Count rows laid out as {binary_batch.RAW_REQUEST_LAYOUT}; type codes are "
+        f"the encoder codes from /model/info. Returns {binary_batch.RAW_RESPONSE_LAYOUT} with risk "
+        "codes LOW=0, MEDIUM=1, HIGH=2 and UNKNOWN=3 for rows failing validation"
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {binary_batch.RAW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}}
+        }
+    },
+    responses={
+        200: {"content": {binary_batch.RAW_MEDIA_TYPE: {}}, "description": "Packed probabilities and risk codes"},
+        **_BINARY_ERROR_RESPONSES
+    }
+)
+async def predict_batch_raw(
+    request: Request,
+    rows: int = Header(..., alias="X-Row-Count", ge=0, description="Number of rows in the body"),
+    deadline_ms: Optional[float] = _deadline_header()
+) -> Response:
+    """
+    Score a packed float32 batch without per-transaction validation objects.
+    
+    Args:
+        request: Request whose body is in the raw request layout
+        rows: Declared number of rows (X-Row-Count)
+        deadline_ms: Answer-time budget (X-Deadline-Ms)
+    
+    Returns:
+        Packed binary response
+    """
+    deadline = admission_controller.deadline(deadline_ms)
+    _require_media_type(request, binary_batch.RAW_MEDIA_TYPE)
+    if rows > get_settings().binary_batch_max_rows:
+        # Refuse before reading the body
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={
+                "error": "Batch too large",
+                "message": f"Batch has {rows} rows, the limit is {get_settings().binary_batch_max_rows}"
+            }
+        )
+    body = await request.body()
+    return await _score_binary(binary_batch.score_raw, binary_batch.RAW_MEDIA_TYPE, deadline, body, rows)
+
+
 @router.post(
     "/analyze",
     response_model=PredictionResponse,
@@ -141,50 +596,343 @@ async def predict_batch_transactions(batch: BatchTransactionInput) -> Dict[str,
     summary="Detailed fraud analysis (alias for /single)",
     description="Alternative endpoint for single transaction analysis"
 )
-async def analyze_transaction(transaction: TransactionInput) -> Dict[str, Any]:
+async def analyze_transaction(
+    transaction: TransactionInput,
+    background_tasks: BackgroundTasks,
+    deadline_ms: Optional[float] = _deadline_header(),
+    explain: bool = _explain_query()
+) -> ORJSONResponse:
     """Alias for predict_single_transaction with same functionality."""
-    return await predict_single_transaction(transaction)
+    return await predict_single_transaction(transaction, background_tasks, deadline_ms, explain)
 
 
 @router.post(
     "/approve",
     status_code=status.HTTP_200_OK,
     summary="Approve a transaction",
-    description="Mark a transaction as approved and allow it to proceed",
+    description=(
+        "Mark a transaction as approved and allow it to proceed. With the decision store enabled, "
+        "a transaction carrying a transaction_id must have been decided before; its stored decision "
+        "is marked approved and returned"
+    ),
     responses={
         200: {"description": "Transaction approved successfully"},
-        400: {"model": ErrorResponse, "description": "Invalid transaction data"}
+        400: {"model": ErrorResponse, "description": "Invalid transaction data"},
+        404: {"model": ErrorResponse, "description": "No decision stored for the transaction_id"},
+        503: {"model": ErrorResponse, "description": "Decision store write queue full"}
     }
 )
 async def approve_transaction(transaction: TransactionInput) -> Dict[str, Any]:
     """
     Approve a transaction that was flagged for review or appeared legitimate.
     
+    The stored decision is found by transaction_id alone; the other
+    transaction fields are not compared with the decided transaction.
+    
     Args:
         transaction: Transaction data to approve
-        
+    
     Returns:
-        Approval confirmation with transaction details
+        Approval confirmation with transaction details and, when stored,
+        the decision being approved
+    
+    Raises:
+        HTTPException: 404 if the transaction_id was never decided
     """
+    decision = None
+    if transaction.transaction_id is not None and decision_log.enabled:
+        try:
+            decision = await decision_log.approve(transaction.transaction_id)
+        except RuntimeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={"error": "Decision store overloaded", "message": str(e)},
+                headers={"Retry-After": "1"}
+            )
+        if decision is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "error": "Decision not found",
+                    "message": f"No decision is stored for transaction_id {transaction.transaction_id}"
+                }
+            )
+    
     try:
-        logger.info(f"Approving transaction: type={transaction.type}, amount={transaction.amount}")
+        logger.info(
+            f"Approving transaction: id={transaction.transaction_id}, "
+            f"type={transaction.type}, amount={transaction.amount}"
+        )
         
         return {
             "status": "approved",
             "message": "Transaction has been approved and will proceed",
+            "transaction_id": transaction.transaction_id,
             "transaction_details": {
                 "type": transaction.type,
                 "amount": float(transaction.amount),
                 "step": transaction.step,
-                "approval_timestamp": None  # Will be auto-generated
+                "approval_timestamp": decision["approved_at"] if decision is not None else None
             },
+            "decision": decision,
             "approved_by": "fraud_detection_system",
             "notes": "Transaction passed fraud detection analysis and was manually approved"
         }
-        
+    
     except Exception as e:
         logger.error(f"Error approving transaction: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"error": "Approval failed", "message": str(e)}
         )
+
+
+@router.get(
+    "/decisions/{transaction_id}",
+    response_model=StoredDecisionResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Look up a decision by transaction_id",
+    description="Return the stored decision of a transaction_id, with its approval status",
+    responses={
+        404: {"model": ErrorResponse, "description": "No decision stored for the transaction_id"},
+        501: {"model": ErrorResponse, "description": "The decision store is disabled"}
+    }
+)
+async def get_decision(
+    transaction_id: str = PathParam(..., min_length=1, max_length=128, description="Transaction identifier")
+) -> ORJSONResponse:
+    """
+    Look up a stored decision.
+    
+    Args:
+        transaction_id: Transaction identifier
+    
+    Returns:
+        The stored decision record
+    
+    Raises:
+        HTTPException: 404 if not found, 501 if the decision store is disabled
+    """
+    if not decision_log.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail={"error": "Decision store disabled", "message": "Set DECISION_STORE_ENABLED=true to store decisions"}
+        )
+    record = await decision_log.find(transaction_id)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "Decision not found", "message": f"No decision is stored for transaction_id {transaction_id}"}
+        )
+    return _json_response(record)
+
+
+def _stream_overload_results(transactions: List[TransactionInput], reason: str, message: str) -> List[dict]:
+    """
+    Answer a stream chunk the model could not score in time.
+    
+    With overload_policy "fallback" every line gets a rules-only decision;
+    with "reject" every line gets a failed (UNKNOWN, manual review) result.
+    The stream itself continues with the next chunk either way.
+    
+    Args:
+        transactions: Transactions of the chunk that were not scored
+        reason: Overload reason (in_flight, deadline, queue_full or timeout)
+        message: Human-readable detail
+    
+    Returns:
+        One result per transaction
+    """
+    if get_settings().overload_policy == "reject":
+        overload_decisions_total.inc(reason, "rejected", amount=len(transactions))
+        logger.warning(f"Overload ({reason}), failing {len(transactions)} stream lines: {message}")
+        return [
+            prediction_service.failed_result(transaction, f"Service overloaded: {message}")
+            for transaction in transactions
+        ]
+    
+    overload_decisions_total.inc(reason, "fallback", amount=len(transactions))
+    logger.warning(f"Overload ({reason}), answering {len(transactions)} stream lines with rules-only decisions: {message}")
+    return [prediction_service.rules_decision(transaction, reason) for transaction in transactions]
+
+
+async def _score_stream_chunk(
+    chunk: List[Tuple[int, Union[TransactionInput, str]]],
+    deadline_ms: Optional[float] = None
+) -> bytes:
+    """
+    Score one chunk of parsed NDJSON lines and render the result lines.
+    
+    Each chunk goes through admission control as a request of its own.
+    
+    Args:
+        chunk: (line number, transaction or parse error message) pairs
+        deadline_ms: Answer-time budget of the chunk (X-Deadline-Ms)
+    
+    Returns:
+        NDJSON-encoded results, one line per input line, in input order
+    """
+    transactions = [item for _, item in chunk if isinstance(item, TransactionInput)]
+    fresh_rows, stored, repeated = await decision_log.split_decided(transactions)
+    fresh = [transactions[row] for row in fresh_rows] if stored or repeated else transactions
+    
+    predictions: List[dict] = []
+    if fresh:
+        settings = get_settings()
+        deadline = admission_controller.deadline(deadline_ms)
+        # Waiting for executor room ends at the deadline, or after the inference timeout without one
+        wait = deadline if deadline.budget is not None else Deadline(settings.inference_timeout_seconds or None)
+        while True:
+            try:
+                with admission_controller.admit(deadline):
+                    predictions = await inference_executor.run(
+                        prediction_service.predict_batch, fresh,
+                        timeout=wait.timeout(settings.inference_timeout_seconds)
+                    )
+                break
+            except AdmissionRejected as e:
+                predictions = _stream_overload_results(fresh, e.reason, str(e))
+                break
+            except InferenceRejected as e:
+                remaining = wait.remaining()
+                if remaining is not None and remaining <= 0:
+                    predictions = _stream_overload_results(fresh, "queue_full", str(e))
+                    break
+                # Apply backpressure to the upload instead of failing the stream
+                await asyncio.sleep(0.01)
+            except InferenceTimeout as e:
+                predictions = _stream_overload_results(fresh, "timeout", str(e))
+                break
+            except Exception as e:
+                logger.error(f"Stream chunk scoring failed: {str(e)}")
+                predictions = [
+                    prediction_service.failed_result(transaction, str(e))
+                    for transaction in fresh
+                ]
+                break
+        predictions = [
+            {**result, "transaction_id": transaction.transaction_id}
+            if transaction.transaction_id is not None else result
+            for transaction, result in zip(fresh, predictions)
+        ]
+        decision_log.record_predictions(fresh, predictions)
+        
+        if shadow_scorer.active:
+            await shadow_scorer.submit(fresh, predictions)
+    if stored or repeated:
+        predictions = merge_decided(len(transactions), fresh_rows, predictions, stored, repeated)
+    
+    scored = iter(predictions)
+    lines = []
+    for line_number, item in chunk:
+        if isinstance(item, TransactionInput):
+            record = {"line": line_number, **next(scored)}
+        else:
+            record = {"line": line_number, "error": item}
+        lines.append(orjson.dumps(record))
+    return b"\n".join(lines) + b"\n"
+
+
+def _parse_stream_line(line: bytes) -> Union[TransactionInput, str]:
+    """Parse one NDJSON line into a transaction, or an error message."""
+    try:
+        return TransactionInput.model_validate_json(line)
+    except ValidationError as e:
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in error['loc']) or 'body'}: {error['msg']}"
+            for error in e.errors()
+        )
+
+
+@router.post(
+    "/stream",
+    response_class=NDJSONStreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Stream fraud predictions for NDJSON input",
+    description=(
+        "Accepts newline-delimited JSON transactions of any length and streams "
+        "NDJSON predictions back as each fixed-size chunk is scored"
+    ),
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "One JSON result per input line, in input order"
+        }
+    }
+)
+async def predict_stream(
+    request: Request,
+    deadline_ms: Optional[float] = _deadline_header()
+) -> NDJSONStreamingResponse:
+    """
+    Score an unbounded NDJSON upload in fixed-size chunks.
+    
+    Each non-empty input line yields one output line carrying its 1-based line
+    number and either the prediction or an "error" message. Memory use is
+    bounded by stream_chunk_size and stream_max_line_bytes, independent of the
+    upload size, and results start flowing before the upload has finished.
+    A full inference queue slows the upload down; a chunk shed by admission
+    control, or that still cannot be scored by its deadline (else within
+    inference_timeout_seconds), is answered according to overload_policy
+    and the stream goes on.
+    
+    Args:
+        request: Raw request whose body is NDJSON transactions
+        deadline_ms: Answer-time budget of each chunk (X-Deadline-Ms)
+    
+    Returns:
+        Streaming NDJSON response
+    """
+    settings = get_settings()
+    chunk_size = settings.stream_chunk_size
+    max_line_bytes = settings.stream_max_line_bytes
+    
+    async def results() -> AsyncIterator[bytes]:
+        chunk: List[Tuple[int, Union[TransactionInput, str]]] = []
+        buffer = b""
+        line_number = 0
+        total = 0
+        
+        def add_line(line: bytes) -> None:
+            nonlocal line_number
+            line_number += 1
+            if len(line) > max_line_bytes:
+                chunk.append((line_number, f"Line exceeds {max_line_bytes} bytes"))
+            elif line.strip():
+                chunk.append((line_number, _parse_stream_line(line)))
+        
+        skipping = False
+        async for piece in request.stream():
+            if skipping:
+                # Discard the rest of an oversized line up to its newline
+                newline = piece.find(b"\n")
+                if newline == -1:
+                    continue
+                piece = piece[newline + 1:]
+                skipping = False
+            
+            buffer += piece
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                add_line(line)
+            
+            if len(buffer) > max_line_bytes:
+                line_number += 1
+                chunk.append((line_number, f"Line exceeds {max_line_bytes} bytes"))
+                buffer = b""
+                skipping = True
+            
+            while len(chunk) >= chunk_size:
+                total += chunk_size
+                yield await _score_stream_chunk(chunk[:chunk_size], deadline_ms)
+                del chunk[:chunk_size]
+        
+        if buffer:
+            add_line(buffer)
+        if chunk:
+            total += len(chunk)
+            yield await _score_stream_chunk(chunk, deadline_ms)
+        
+        logger.info(f"Stream prediction completed: {total} lines")
+    
+    return NDJSONStreamingResponse(results())
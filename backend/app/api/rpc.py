@@ -0,0 +1,452 @@
+"""
+Binary RPC listener for internal callers.
+
+A length-prefixed msgpack protocol over TCP or a Unix socket, served from
+the API's event loop next to the HTTP routes. It scores through the same
+PredictionService, executor, admission control and metrics as
+/predictions/single, without the HTTP, JSON and response-model layers.
+
+Protocol:
+    Every frame is a 4-byte big-endian payload length followed by a msgpack
+    payload. A request is [msgid, method, params] and its response is
+    [msgid, error, result]; error is None on success, otherwise
+    {"code", "error", "message"} with HTTP-like codes (400, 500, 503, 504).
+    Connections are long-lived and pipelined: a client may send many
+    requests before reading, and responses are written as they complete,
+    matched to requests by msgid.
+
+Methods:
+    ping                -> "pong"
+    predict             params {"transaction": {...}, "deadline_ms": float,
+                        "explain": bool}; returns the /predictions/single body
+                        without its timestamp (a duplicate transaction_id
+                        returns the stored decision, with its timestamp)
+"""
+import asyncio
+import itertools
+import os
+import socket
+import struct
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from loguru import logger
+from pydantic import ValidationError
+
+from app.schemas.transaction import TransactionInput
+from app.services import prediction_service, micro_batcher, shadow_scorer, explainer
+from app.services.decision_store import decision_log, stored_prediction
+from app.core.config import get_settings
+from app.core.logging_config import log_prediction
+from app.core.executor import inference_executor, InferenceRejected, InferenceTimeout
+from app.core.admission import admission_controller, AdmissionRejected
+from app.core.metrics import overload_decisions_total, request_duration, requests_total
+
+# Frame header: payload length, unsigned 32-bit big-endian
+FRAME_HEADER = struct.Struct(">I")
+
+
+class RpcError(Exception):
+    """Error answered to an RPC call, with an HTTP-like status code."""
+
+    def __init__(self, code: int, error: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.error = error
+        self.message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Wire representation of the error."""
+        return {"code": self.code, "error": self.error, "message": self.message}
+
+
+def _msgpack() -> Any:
+    """Import msgpack, with a helpful message when it is missing."""
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("The RPC listener needs the msgpack package: pip install msgpack")
+    return msgpack
+
+
+def pack_frame(message: Any) -> bytes:
+    """Encode a message as one length-prefixed msgpack frame."""
+    payload = _msgpack().packb(message, use_bin_type=True)
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader, max_bytes: int) -> Optional[bytes]:
+    """
+    Read one frame payload.
+
+    Args:
+        reader: Connection stream
+        max_bytes: Largest accepted payload
+
+    Returns:
+        The payload, or None when the peer closed the connection between frames
+
+    Raises:
+        ValueError: If the frame is larger than max_bytes
+        asyncio.IncompleteReadError: If the connection closed mid-frame
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > max_bytes:
+        raise ValueError(f"Frame of {length} bytes exceeds rpc_max_frame_bytes ({max_bytes})")
+    return await reader.readexactly(length)
+
+
+class RpcServer:
+    """
+    msgpack RPC listener running on the API's event loop.
+
+    Each connection has a reader loop that decodes frames and starts one
+    task per request, up to rpc_max_inflight at a time; further frames are
+    not read until a request finishes, which pushes back on the client
+    through TCP flow control. Responses are written by the request tasks as
+    they complete. Under gunicorn every worker runs its own listener: TCP
+    listeners share the port (SO_REUSEPORT), while a Unix socket path should
+    contain "{pid}" to give each worker its own socket.
+    """
+
+    def __init__(self):
+        """Initialize a stopped server; call start() from the lifespan hook."""
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._address: Optional[str] = None
+        self._unix_path: Optional[str] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._background: Set[asyncio.Task] = set()
+        self._connections_total = 0
+        self._methods: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+            "ping": self._ping,
+            "predict": self._predict
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether the listener accepts connections."""
+        return self._server is not None
+
+    async def start(self) -> None:
+        """
+        Start listening on rpc_unix_socket, or on rpc_host:rpc_port.
+
+        Raises:
+            ImportError: If msgpack is not installed
+            OSError: If the address cannot be bound
+        """
+        _msgpack()
+        settings = get_settings()
+        if settings.rpc_unix_socket:
+            path = settings.rpc_unix_socket.replace("{pid}", str(os.getpid()))
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=path)
+            self._unix_path = path
+            self._address = f"unix:{path}"
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection,
+                host=settings.rpc_host,
+                port=settings.rpc_port,
+                reuse_port=hasattr(socket, "SO_REUSEPORT")
+            )
+            self._address = f"{settings.rpc_host}:{settings.rpc_port}"
+        logger.info(f"✓ RPC listener on {self._address}")
+
+    async def stop(self) -> None:
+        """Stop listening and close open connections."""
+        if self._server is None:
+            return
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, *self._background, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        if self._unix_path and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
+        logger.info("RPC listener stopped")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection until the peer closes it."""
+        settings = get_settings()
+        self._connections_total += 1
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        inflight = asyncio.Semaphore(settings.rpc_max_inflight)
+        write_lock = asyncio.Lock()
+        requests: Set[asyncio.Task] = set()
+        try:
+            while True:
+                try:
+                    payload = await read_frame(reader, settings.rpc_max_frame_bytes)
+                except (ValueError, asyncio.IncompleteReadError) as e:
+                    logger.warning(f"Closing RPC connection: {e}")
+                    break
+                if payload is None:
+                    break
+                await inflight.acquire()
+                task = asyncio.ensure_future(self._serve(payload, writer, write_lock, inflight))
+                requests.add(task)
+                task.add_done_callback(requests.discard)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if requests:
+                await asyncio.gather(*requests, return_exceptions=True)
+            self._connections.discard(connection)
+            writer.close()
+
+    async def _serve(
+        self,
+        payload: bytes,
+        writer: asyncio.StreamWriter,
+        write_lock: asyncio.Lock,
+        inflight: asyncio.Semaphore
+    ) -> None:
+        """Answer one request frame and record its metrics."""
+        start = time.perf_counter()
+        msgid = None
+        endpoint = "rpc:invalid"
+        try:
+            try:
+                msgid, method, params = _msgpack().unpackb(payload, raw=False)
+            except Exception:
+                raise RpcError(400, "Invalid request", "Expected a msgpack array [msgid, method, params]")
+            handler = self._methods.get(method)
+            if handler is None:
+                raise RpcError(400, "Unknown method", f"Method '{method}' does not exist")
+            endpoint = f"rpc:{method}"
+            if params is not None and not isinstance(params, dict):
+                raise RpcError(400, "Invalid request", "params must be a map")
+            response = [msgid, None, await handler(params or {})]
+            status_code = 200
+        except RpcError as e:
+            response = [msgid, e.to_dict(), None]
+            status_code = e.code
+        except Exception as e:
+            logger.error(f"Unexpected error in RPC call: {str(e)}")
+            response = [msgid, RpcError(500, "Prediction failed", "An unexpected error occurred").to_dict(), None]
+            status_code = 500
+        finally:
+            inflight.release()
+
+        try:
+            frame = pack_frame(response)
+            async with write_lock:
+                writer.write(frame)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            request_duration.observe(time.perf_counter() - start, endpoint)
+            requests_total.inc(endpoint, str(status_code))
+
+    async def _ping(self, params: Dict[str, Any]) -> str:
+        """Liveness check."""
+        return "pong"
+
+    async def _predict(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score one transaction, as /predictions/single does.
+
+        Args:
+            params: {"transaction": {...}} plus optional deadline_ms and explain
+
+        Returns:
+            Prediction result
+
+        Raises:
+            RpcError: 400 for invalid input, 503 when overloaded with the
+                reject policy, 504 on timeout without a deadline
+        """
+        settings = get_settings()
+        try:
+            transaction = TransactionInput.model_validate(params.get("transaction"))
+        except ValidationError as e:
+            raise RpcError(400, "Invalid transaction data", str(e))
+        deadline_ms = params.get("deadline_ms")
+        if deadline_ms is not None and (not isinstance(deadline_ms, (int, float)) or deadline_ms <= 0):
+            raise RpcError(400, "Invalid request", "deadline_ms must be a positive number")
+        explain = bool(params.get("explain", False))
+
+        if transaction.transaction_id is not None and decision_log.enabled:
+            stored = await decision_log.find(transaction.transaction_id)
+            if stored is not None:
+                decision_log.count_duplicates(1)
+                return stored_prediction(stored)
+
+        deadline = admission_controller.deadline(deadline_ms)
+        try:
+            with admission_controller.admit(deadline):
+                timeout = deadline.timeout(settings.inference_timeout_seconds)
+                if settings.micro_batching_enabled:
+                    result = await micro_batcher.submit(transaction, timeout=timeout)
+                else:
+                    result = await inference_executor.run(
+                        prediction_service.predict_with_explanation, transaction, timeout=timeout
+                    )
+        except AdmissionRejected as e:
+            return self._overload_decision(transaction, e.reason, str(e))
+        except InferenceRejected as e:
+            return self._overload_decision(transaction, "queue_full", str(e))
+        except InferenceTimeout as e:
+            if deadline.budget is not None:
+                return self._overload_decision(transaction, "timeout", str(e))
+            logger.error(f"Inference timed out: {str(e)}")
+            raise RpcError(504, "Prediction timed out", str(e))
+        except ValueError as e:
+            logger.error(f"Validation error in prediction: {str(e)}")
+            raise RpcError(400, "Invalid transaction data", str(e))
+
+        log_prediction(
+            "Prediction: type={type}, amount={amount:,.2f}, prob={fraud_probability:.4f}, risk={risk_level}",
+            type=transaction.type,
+            amount=transaction.amount,
+            fraud_probability=result["fraud_probability"],
+            is_fraud=result["is_fraud"],
+            risk_level=result["risk_level"]
+        )
+
+        if explainer.wanted(result["risk_level"], explain):
+            result = {**result, "contributions": (await explainer.explain([transaction], deadline))[0]}
+        if transaction.transaction_id is not None:
+            result = {**result, "transaction_id": transaction.transaction_id}
+            decision_log.record([transaction], [result])
+
+        if shadow_scorer.active:
+            task = asyncio.ensure_future(shadow_scorer.submit([transaction], [result]))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return result
+
+    @staticmethod
+    def _overload_decision(transaction: TransactionInput, reason: str, message: str) -> Dict[str, Any]:
+        """Rules-only answer for an overloaded call, or a 503 with the reject policy."""
+        if get_settings().overload_policy == "reject":
+            overload_decisions_total.inc(reason, "rejected")
+            logger.warning(f"Overload ({reason}), shedding RPC call: {message}")
+            raise RpcError(503, "Service overloaded", message)
+        overload_decisions_total.inc(reason, "fallback")
+        logger.warning(f"Overload ({reason}), answering RPC call with a rules-only decision: {message}")
+        result = prediction_service.rules_decision(transaction, reason)
+        if transaction.transaction_id is not None:
+            # Not stored: a retry once the load has passed gets a model decision
+            result["transaction_id"] = transaction.transaction_id
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get listener address and connection counts."""
+        return {
+            "enabled": self.running,
+            "address": self._address,
+            "open_connections": len(self._connections),
+            "connections_total": self._connections_total
+        }
+
+
+class RpcClient:
+    """
+    Minimal pipelining client for the RPC listener.
+
+    Calls from many coroutines share one connection; each waits for the
+    response carrying its msgid.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_frame_bytes: int):
+        """Initialize on an open connection; use connect() to build one."""
+        self._reader = reader
+        self._writer = writer
+        self._max_frame_bytes = max_frame_bytes
+        self._ids = itertools.count()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(
+        cls,
+        host: str = "127.0.0.1",
+        port: int = 8001,
+        unix_socket: Optional[str] = None,
+        max_frame_bytes: int = 1 << 20
+    ) -> "RpcClient":
+        """
+        Open a connection to an RPC listener.
+
+        Args:
+            host: Listener host
+            port: Listener port
+            unix_socket: Unix socket path, used instead of host and port
+            max_frame_bytes: Largest accepted response payload
+
+        Returns:
+            Connected client
+        """
+        if unix_socket:
+            reader, writer = await asyncio.open_unix_connection(unix_socket)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, max_frame_bytes)
+
+    async def _receive(self) -> None:
+        """Resolve pending calls as their responses arrive."""
+        error: Exception = ConnectionError("RPC connection closed")
+        try:
+            while True:
+                payload = await read_frame(self._reader, self._max_frame_bytes)
+                if payload is None:
+                    break
+                msgid, rpc_error, result = _msgpack().unpackb(payload, raw=False)
+                future = self._pending.pop(msgid, None)
+                if future is None or future.done():
+                    continue
+                if rpc_error is not None:
+                    future.set_exception(RpcError(rpc_error["code"], rpc_error["error"], rpc_error["message"]))
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            error = e
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a method and wait for its result.
+
+        Raises:
+            RpcError: If the server answered with an error
+            ConnectionError: If the connection closed first
+        """
+        if self._receiver.done():
+            raise ConnectionError("RPC connection closed")
+        msgid = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msgid] = future
+        async with self._write_lock:
+            self._writer.write(pack_frame([msgid, method, params]))
+            await self._writer.drain()
+        return await future
+
+    async def predict(self, transaction: Dict[str, Any], **params: Any) -> Dict[str, Any]:
+        """Score one transaction; extra keyword arguments are deadline_ms and explain."""
+        return await self.call("predict", {"transaction": transaction, **params})
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self._writer.close()
+        self._receiver.cancel()
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+
+# Global RPC listener instance
+rpc_server = RpcServer()
@@ -0,0 +1,590 @@
+"""
+Command line interface for offline fraud scoring.
+
+Usage (from backend/):
+    python -m app.cli score Fraud.csv scored.parquet [--workers 8] [--chunk-size 100000]
+    python -m app.cli convert [--force] [--onnx]
+    python -m app.cli memory [--pid MASTER_PID]
+    python -m app.cli cascade-fit train.csv [--max-disagreement 0.001]
+    python -m app.cli cascade-report holdout.csv [--json report.json]
+    python -m app.cli consume transactions.ndjson decisions.ndjson [--no-follow]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from app.core import cascade as scoring_cascade
+from app.core import native_artifacts
+from app.core.config import get_settings
+from app.core.inference_backends import OnnxRuntimeBackend, export_onnx, onnx_model_path
+from app.core.model_loader import ModelArtifacts, model_loader
+from app.core.process_memory import server_memory
+from app.core.tree_ensemble import CompiledTreeEnsemble, parity_probe
+from app.services.prediction_service import PredictionService, prediction_service
+from app.services.stream_consumer import StreamConsumer
+from app.services.stream_sources import open_sink, open_source
+
+# Compact dtypes for the PaySim columns the model uses
+INPUT_DTYPES: Dict[str, str] = {
+    "step": "int32",
+    "type": "category",
+    "amount": "float32",
+    "oldbalanceOrg": "float32",
+    "newbalanceOrig": "float32",
+    "oldbalanceDest": "float32",
+    "newbalanceDest": "float32",
+}
+
+
+def _init_worker() -> None:
+    """Load model artifacts once per worker process."""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    settings = get_settings()
+    model_loader.load_all(
+        model_path=settings.model_path,
+        encoder_path=settings.encoder_path,
+        metadata_path=settings.metadata_path,
+        feature_importance_path=settings.feature_importance_path
+    )
+    # Parallelism comes from the process pool; one scoring thread per worker
+    model_loader.artifacts.backend.configure_threads(1)
+
+
+def score_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Score a chunk of PaySim-format rows.
+
+    Uses the same preprocessing and risk classification as PredictionService.
+    Rows with an unknown type or non-finite values are flagged for manual review.
+
+    Args:
+        frame: DataFrame with the INPUT_DTYPES columns
+
+    Returns:
+        The frame with fraud_probability, is_fraud, risk_level and
+        recommended_action columns added
+    """
+    numeric = frame[list(PredictionService.NUMERIC_FEATURES)].to_numpy(dtype=np.float32)
+    features, known_types, finite = prediction_service.build_features(
+        numeric, frame["type"].astype(str).to_numpy()
+    )
+    valid = known_types & finite
+
+    probabilities = np.zeros(len(frame), dtype=np.float32)
+    if valid.any():
+        probabilities[valid] = prediction_service.predict_proba(features[valid])
+
+    risk_codes = prediction_service.classify_risk_batch(probabilities)
+    risk_levels = np.array(PredictionService.RISK_LEVELS + ("UNKNOWN",))
+    actions = np.array(PredictionService.RISK_ACTIONS + ("MANUAL_REVIEW",))
+    risk_codes[~valid] = len(PredictionService.RISK_LEVELS)
+
+    result = frame.copy()
+    result["fraud_probability"] = probabilities
+    result["is_fraud"] = valid & (probabilities >= 0.5)
+    result["risk_level"] = pd.Categorical(risk_levels[risk_codes], categories=risk_levels)
+    result["recommended_action"] = pd.Categorical(actions[risk_codes], categories=actions)
+    return result
+
+
+def _read_chunks(path: Path, chunk_size: int, columns: List[str]) -> Iterator[pd.DataFrame]:
+    """Yield input chunks with compact dtypes from a CSV or Parquet file."""
+    dtypes = {column: INPUT_DTYPES.get(column, "object") for column in columns}
+    if path.suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Reading Parquet requires pyarrow (pip install pyarrow)")
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas().astype(dtypes)
+    else:
+        yield from pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunk_size)
+
+
+class _OutputWriter:
+    """Append scored chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: Path):
+        """Initialize a writer for path; the format follows its extension."""
+        self.path = path
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, frame: pd.DataFrame) -> None:
+        """Append one scored chunk."""
+        if self.path.suffix.lower() == ".parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise SystemExit("Writing Parquet requires pyarrow (pip install pyarrow)")
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                         header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self) -> None:
+        """Finalize the output file."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_file(
+    input_path: Path,
+    output_path: Path,
+    workers: int,
+    chunk_size: int,
+    keep_columns: Optional[List[str]] = None
+) -> int:
+    """
+    Score a PaySim-format file chunk by chunk on a process pool.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    regardless of the input size. Output rows keep the input order.
+
+    Args:
+        input_path: CSV or Parquet input
+        output_path: CSV or Parquet output (chosen by extension)
+        workers: Number of worker processes
+        chunk_size: Rows per chunk
+        keep_columns: Extra input columns to carry into the output
+
+    Returns:
+        Number of rows scored
+    """
+    columns = list(INPUT_DTYPES) + [c for c in (keep_columns or []) if c not in INPUT_DTYPES]
+    writer = _OutputWriter(output_path)
+    rows = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in _read_chunks(input_path, chunk_size, columns):
+            pending.append(pool.submit(score_frame, chunk))
+            if len(pending) >= 2 * workers:
+                scored = pending.popleft().result()
+                writer.write(scored)
+                rows += len(scored)
+                print(
+                    f"  {rows:,} rows ({rows / (time.perf_counter() - start):,.0f} rows/sec)",
+                    file=sys.stderr
+                )
+        while pending:
+            scored = pending.popleft().result()
+            writer.write(scored)
+            rows += len(scored)
+    writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Scored {rows:,} rows in {elapsed:.1f}s "
+        f"({rows / elapsed if elapsed else 0:,.0f} rows/sec) -> {output_path}"
+    )
+    return rows
+
+
+def convert_artifacts(force: bool = False, onnx: bool = False) -> Path:
+    """
+    Convert the configured model and encoder pickles to the native format.
+
+    The result is the cache entry the API loads at startup instead of the
+    pickles; load times of both formats are printed for comparison.
+
+    Args:
+        force: Rewrite the conversion even if it already exists
+        onnx: Also export the model for the onnxruntime inference backend
+
+    Returns:
+        The native artifact directory
+    """
+    settings = get_settings()
+    start = time.perf_counter()
+    model, model_hash = model_loader.load_model(settings.model_path)
+    encoder, encoder_hash = model_loader.load_encoder(settings.encoder_path)
+    pickle_ms = (time.perf_counter() - start) * 1000
+
+    directory = model_loader.native_artifact_dir(model_hash, encoder_hash)
+    if force:
+        shutil.rmtree(directory, ignore_errors=True)
+    if not (directory / native_artifacts.MANIFEST_FILE).exists():
+        native_artifacts.convert(model, encoder, directory, {"model": model_hash, "encoder": encoder_hash})
+
+    start = time.perf_counter()
+    _, _, manifest = native_artifacts.load(directory, {"model": model_hash, "encoder": encoder_hash})
+    native_ms = (time.perf_counter() - start) * 1000
+
+    booster_size = (directory / manifest["booster_file"]).stat().st_size
+    print(f"Native artifact: {directory}")
+    print(f"  booster {booster_size / 1024:,.0f} KiB, parity max |diff| {manifest['parity_max_diff']:.2e}")
+    print(f"  load time: pickle {pickle_ms:.1f} ms, native {native_ms:.1f} ms")
+    if onnx:
+        export_onnx_model(model, ModelArtifacts.fingerprint_version(model_hash, encoder_hash), force)
+    return directory
+
+
+def export_onnx_model(model: Any, version: str, force: bool = False) -> Path:
+    """
+    Export a model to ONNX for the onnxruntime inference backend.
+
+    The export is named after the artifact version, so the API only picks it
+    up for the exact model and encoder it was made from.
+
+    Args:
+        model: Loaded model
+        version: Artifact version of the model and encoder
+        force: Rewrite the export even if it already exists
+
+    Returns:
+        The .onnx file
+    """
+    path = onnx_model_path(get_settings().onnx_models_dir, version)
+    if force or not path.exists():
+        try:
+            start = time.perf_counter()
+            export_onnx(model, model.get_booster().num_features(), path)
+        except ImportError as e:
+            raise SystemExit(f"ONNX export needs the onnxmltools and onnx packages ({e})")
+        print(f"ONNX export: {path} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    try:
+        backend = OnnxRuntimeBackend(path)
+    except ImportError:
+        print("  onnxruntime not installed, parity not checked")
+        return path
+    with np.errstate(invalid="ignore"):
+        probe = parity_probe(CompiledTreeEnsemble.from_booster(model))
+    max_diff = float(np.max(np.abs(backend.predict(probe) - model.predict_proba(probe)[:, 1])))
+    print(f"  {path.stat().st_size / 1024:,.0f} KiB, parity max |diff| {max_diff:.2e}")
+    return path
+
+
+def _load_artifacts() -> ModelArtifacts:
+    """Load the configured artifact set without a cascade, quietly."""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    settings = get_settings()
+    return model_loader.load_artifacts(
+        settings.model_path, settings.encoder_path, settings.metadata_path, settings.feature_importance_path
+    )
+
+
+def _load_feature_rows(
+    path: Path,
+    artifacts: ModelArtifacts,
+    limit: int
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Read a PaySim-format file into a feature matrix of its valid rows.
+
+    Args:
+        path: CSV or Parquet input
+        artifacts: Artifact set whose encoder builds the features
+        limit: Maximum number of rows to read (0 for all)
+
+    Returns:
+        Tuple of (feature matrix, type names, isFraud labels or None if the
+        file has no isFraud column)
+    """
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+        available = set(pq.ParquetFile(path).schema.names)
+    else:
+        available = set(pd.read_csv(path, nrows=0).columns)
+    columns = list(INPUT_DTYPES) + (["isFraud"] if "isFraud" in available else [])
+
+    features, types, labels = [], [], []
+    rows = 0
+    for chunk in _read_chunks(path, 500_000, columns):
+        if limit:
+            chunk = chunk.iloc[:limit - rows]
+        numeric = chunk[list(PredictionService.NUMERIC_FEATURES)].to_numpy(dtype=np.float32)
+        chunk_types = chunk["type"].astype(str).to_numpy()
+        chunk_features, known_types, finite = prediction_service.build_features(numeric, chunk_types, artifacts)
+        valid = known_types & finite
+        features.append(chunk_features[valid])
+        types.append(chunk_types[valid])
+        if "isFraud" in columns:
+            labels.append(chunk["isFraud"].astype(int).to_numpy()[valid])
+        rows += len(chunk)
+        if limit and rows >= limit:
+            break
+    if not features:
+        raise SystemExit(f"No rows in {path}")
+    return (
+        np.concatenate(features),
+        np.concatenate(types),
+        np.concatenate(labels) if labels else None
+    )
+
+
+def fit_cascade(
+    input_path: Path,
+    output_dir: Path,
+    max_disagreement: float,
+    depth: int,
+    trees: int,
+    limit: int
+) -> Path:
+    """
+    Fit a scoring cascade for the configured model and save it.
+
+    Args:
+        input_path: Training data (PaySim-format CSV or Parquet)
+        output_dir: Cascade directory to write
+        max_disagreement: Allowed share of shallow answers in a different
+            risk level than the full model's, per side
+        depth: Shallow tree depth
+        trees: Number of shallow trees
+        limit: Maximum number of rows to fit on (0 for all)
+
+    Returns:
+        Path of the written manifest
+    """
+    settings = get_settings()
+    artifacts = _load_artifacts()
+    features, _, _ = _load_feature_rows(input_path, artifacts, limit)
+    print(f"Fitting a cascade for model version {artifacts.version} on {len(features):,} rows")
+
+    cascade = scoring_cascade.fit_cascade(
+        artifacts.model,
+        artifacts.version,
+        artifacts.feature_names,
+        dict(artifacts.type_codes),
+        features,
+        settings.medium_risk_threshold,
+        settings.high_risk_threshold,
+        max_disagreement=max_disagreement,
+        shallow_depth=depth,
+        shallow_trees=trees
+    )
+    manifest = scoring_cascade.save_cascade(cascade, output_dir)
+
+    print(f"{'type':<10} {'rows':>10} {'max score':>10} {'mean score':>11}  stage")
+    for name, entry in cascade.type_bounds.items():
+        stage = "type_bound" if entry["bound"] is not None else "shallow/full"
+        print(f"{name:<10} {entry['rows']:>10,} {entry['max_score']:>10.4f} {entry['mean_score']:>11.4f}  {stage}")
+    print(f"Shallow model: {trees} trees of depth {depth}, answers below {cascade.low_cutoff:.4f} "
+          f"and at or above {cascade.high_cutoff:.4f}")
+    print(f"Cascade written to {manifest.parent} (fit in {cascade.fit_report['fit_seconds']}s); "
+          f"set CASCADE_ENABLED=true to serve with it")
+    return manifest
+
+
+def cascade_report(input_path: Path, cascade_dir: Path, limit: int, json_path: Optional[Path] = None) -> Dict:
+    """
+    Print how much traffic a cascade short-circuits and what it costs in accuracy.
+
+    Args:
+        input_path: Evaluation data (PaySim-format CSV or Parquet), ideally
+            not the data the cascade was fit on
+        cascade_dir: Cascade directory
+        limit: Maximum number of rows to evaluate (0 for all)
+        json_path: Also write the report as JSON here
+
+    Returns:
+        The report dictionary (see app.core.cascade.evaluate_cascade)
+    """
+    settings = get_settings()
+    artifacts = _load_artifacts()
+    try:
+        cascade = scoring_cascade.load_cascade(
+            cascade_dir, artifacts.version, artifacts.feature_names, dict(artifacts.type_codes),
+            settings.compiled_ensemble_max_rows
+        )
+    except (FileNotFoundError, ValueError) as e:
+        raise SystemExit(f"Cannot use the cascade in {cascade_dir}: {e}")
+    features, types, labels = _load_feature_rows(input_path, artifacts, limit)
+    report = scoring_cascade.evaluate_cascade(
+        cascade, artifacts.model, features, types,
+        settings.medium_risk_threshold, settings.high_risk_threshold, labels
+    )
+
+    print(f"Cascade {cascade.fit_id} on {report['rows']:,} rows of {input_path}")
+    print(f"{'type':<10} {'rows':>10} {'type_bound':>11} {'shallow':>9} {'full':>9} {'short-circuited':>16}")
+    for name, entry in report["by_type"].items():
+        print(f"{name:<10} {entry['rows']:>10,} {entry['type_bound']:>11,} {entry['shallow']:>9,} "
+              f"{entry['full']:>9,} {entry['short_circuited']:>16.2%}")
+    stages = report["stages"]
+    print(f"{'all':<10} {report['rows']:>10,} {stages['type_bound']:>11,} {stages['shallow']:>9,} "
+          f"{stages['full']:>9,} {report['short_circuited']:>16.2%}")
+    print(f"Risk level agreement with the full model: {report['risk_level_agreement']:.4%}, "
+          f"is_fraud decisions changed: {report['decision_changes']:,}, "
+          f"max |probability diff| {report['max_abs_probability_diff']:.4f}")
+    print(f"Scoring time: full model {report['full_seconds']:.2f}s, cascade {report['cascade_seconds']:.2f}s")
+    if "labels" in report:
+        print(f"Against isFraud labels ({report['labels']['fraud_rows']:,} fraud rows):")
+        for key in ("accuracy", "precision", "recall"):
+            print(f"  {key:<10} full {report['labels']['full'][key]:.6f}  "
+                  f"cascade {report['labels']['cascade'][key]:.6f}  delta {report['labels']['delta'][key]:+.6f}")
+
+    if json_path is not None:
+        json_path.write_text(json.dumps({"cascade": cascade.info(), **report}, indent=2))
+    return report
+
+
+def memory_report(master_pid: int) -> None:
+    """
+    Print per-process memory of a running pre-fork server.
+
+    USS is what each worker costs on its own; with the model shared
+    copy-on-write it should stay far below the master's RSS.
+
+    Args:
+        master_pid: Process id of the gunicorn master
+    """
+    report = server_memory(master_pid)
+    if not report:
+        raise SystemExit(f"No memory information for pid {master_pid} (Linux /proc required)")
+
+    print(f"{'pid':>8} {'role':<7} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9} {'shared MB':>10}")
+    for process in report:
+        print(
+            f"{process['pid']:>8} {process['role']:<7} {process['rss_mb']:>9.1f} {process['pss_mb']:>9.1f} "
+            f"{process['uss_mb']:>9.1f} {process['shared_mb']:>10.1f}"
+        )
+    workers = [process for process in report if process["role"] == "worker"]
+    print(f"Total (PSS): {sum(process['pss_mb'] for process in report):,.1f} MB "
+          f"for {len(workers)} worker(s); sum of RSS would suggest "
+          f"{sum(process['rss_mb'] for process in report):,.1f} MB")
+    if workers:
+        print(f"Unique memory per worker: {sum(process['uss_mb'] for process in workers) / len(workers):,.1f} MB")
+
+
+def consume(source_uri: str, sink_uri: str, follow: bool = True) -> Dict[str, Any]:
+    """
+    Run the stream consumer worker until the source ends or SIGTERM/SIGINT.
+
+    On a signal the current batch is finished and its offset committed;
+    records read ahead but not yet scored are consumed again on restart.
+
+    Args:
+        source_uri: File or named pipe path, "file:<path>" or "unix:<socket path>"
+        sink_uri: Output NDJSON file, or "-" for stdout
+        follow: Keep reading a file as it grows (tail) instead of stopping at its end
+
+    Returns:
+        Final consumer statistics
+    """
+    settings = get_settings()
+    model_loader.load_all(
+        model_path=settings.model_path,
+        encoder_path=settings.encoder_path,
+        metadata_path=settings.metadata_path,
+        feature_importance_path=settings.feature_importance_path,
+        compile_trees=settings.compile_tree_ensemble
+    )
+    consumer = StreamConsumer(
+        open_source(source_uri, follow=follow, max_line_bytes=settings.stream_max_line_bytes),
+        open_sink(sink_uri, fsync=settings.consumer_sink_fsync)
+    )
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: consumer.stop())
+    return consumer.run()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Fraud detection tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="Score a PaySim-format CSV/Parquet file")
+    score.add_argument("input", type=Path, help="Input .csv or .parquet file")
+    score.add_argument("output", type=Path, help="Output .csv or .parquet file")
+    score.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    score.add_argument("--chunk-size", type=int, default=100_000, help="Rows per chunk")
+    score.add_argument("--keep", default="", help="Comma-separated extra columns to keep, e.g. nameOrig,isFraud")
+
+    convert = commands.add_parser("convert", help="Convert the model and encoder pickles to the native format")
+    convert.add_argument("--force", action="store_true", help="Rewrite an existing conversion")
+    convert.add_argument("--onnx", action="store_true", help="Also export the model to ONNX (onnxruntime backend)")
+
+    memory = commands.add_parser("memory", help="Report per-worker memory of a running gunicorn server")
+    memory.add_argument(
+        "--pid",
+        type=int,
+        help="Master process id, defaults to the one in GUNICORN_PID_FILE"
+    )
+
+    cascade_fit = commands.add_parser("cascade-fit", help="Fit a scoring cascade for the configured model")
+    cascade_fit.add_argument("input", type=Path, help="Training .csv or .parquet file (PaySim format)")
+    cascade_fit.add_argument("--output-dir", type=Path, help="Cascade directory, defaults to models/cascade")
+    cascade_fit.add_argument(
+        "--max-disagreement",
+        type=float,
+        default=0.001,
+        help="Allowed share of shallow-model answers whose risk level differs from the full model's"
+    )
+    cascade_fit.add_argument("--depth", type=int, default=4, help="Shallow model tree depth")
+    cascade_fit.add_argument("--trees", type=int, default=30, help="Shallow model trees")
+    cascade_fit.add_argument("--limit", type=int, default=2_000_000, help="Rows to fit on, 0 for all")
+
+    report = commands.add_parser("cascade-report", help="Report short-circuit rate and accuracy delta of a cascade")
+    report.add_argument("input", type=Path, help="Evaluation .csv or .parquet file (PaySim format)")
+    report.add_argument("--cascade-dir", type=Path, help="Cascade directory, defaults to models/cascade")
+    report.add_argument("--limit", type=int, default=0, help="Rows to evaluate, 0 for all")
+    report.add_argument("--json", type=Path, help="Also write the report as JSON")
+
+    consume_parser = commands.add_parser("consume", help="Score a transaction stream continuously (worker mode)")
+    consume_parser.add_argument(
+        "source",
+        help="NDJSON file or named pipe (tailed), file:<path>, or unix:<socket path> to listen on"
+    )
+    consume_parser.add_argument("sink", help="Decision NDJSON file, or - for stdout")
+    consume_parser.add_argument(
+        "--no-follow",
+        action="store_true",
+        help="Stop at the end of a file instead of waiting for more lines"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "score":
+        keep = [column.strip() for column in args.keep.split(",") if column.strip()]
+        score_file(args.input, args.output, args.workers, args.chunk_size, keep)
+    elif args.command == "convert":
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+        convert_artifacts(args.force, args.onnx)
+    elif args.command == "memory":
+        pid = args.pid
+        if pid is None:
+            pid_file = Path(os.getenv(
+                "GUNICORN_PID_FILE", os.path.join(tempfile.gettempdir(), "fraud-detection-api.pid")
+            ))
+            if not pid_file.exists():
+                raise SystemExit(f"No pid file at {pid_file}; pass --pid")
+            pid = int(pid_file.read_text().strip())
+        memory_report(pid)
+    elif args.command == "cascade-fit":
+        fit_cascade(
+            args.input, args.output_dir or get_settings().cascade_dir,
+            args.max_disagreement, args.depth, args.trees, args.limit
+        )
+    elif args.command == "cascade-report":
+        cascade_report(args.input, args.cascade_dir or get_settings().cascade_dir, args.limit, args.json)
+    elif args.command == "consume":
+        consume(args.source, args.sink, follow=not args.no_follow)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,41 @@
 """Core package initialization."""
 from .config import Settings, get_settings
-from .model_loader import ModelLoader, model_loader
+from .model_loader import (
+    ArtifactWatcher,
+    ModelArtifacts,
+    ModelLoader,
+    ReloadInProgressError,
+    artifact_watcher,
+    model_loader
+)
+from .executor import (
+    InferenceExecutor,
+    InferenceRejected,
+    InferenceTimeout,
+    inference_executor
+)
+from .admission import (
+    AdmissionController,
+    AdmissionRejected,
+    Deadline,
+    admission_controller
+)
 
-__all__ = ["Settings", "get_settings", "ModelLoader", "model_loader"]
+__all__ = [
+    "Settings",
+    "get_settings",
+    "ArtifactWatcher",
+    "ModelArtifacts",
+    "ModelLoader",
+    "ReloadInProgressError",
+    "artifact_watcher",
+    "model_loader",
+    "InferenceExecutor",
+    "InferenceRejected",
+    "InferenceTimeout",
+    "inference_executor",
+    "AdmissionController",
+    "AdmissionRejected",
+    "Deadline",
+    "admission_controller"
+]
@@ -0,0 +1,167 @@
+"""
+Admission control module.
+Sheds prediction requests up front, while a fast answer is still possible,
+when the service is saturated or cannot meet a request's deadline.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from .config import get_settings
+from .executor import InferenceExecutor, inference_executor
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when admission control sheds a request."""
+
+    def __init__(self, reason: str, message: str):
+        """
+        Initialize a rejection.
+
+        Args:
+            reason: Machine-readable cause ("in_flight" or "deadline")
+            message: Human-readable explanation
+        """
+        super().__init__(message)
+        self.reason = reason
+
+
+class Deadline:
+    """Answer-time budget of one request, counted from its creation."""
+
+    def __init__(self, budget_seconds: Optional[float]):
+        """
+        Start a deadline now.
+
+        Args:
+            budget_seconds: Time allowed for the answer, None for no deadline
+        """
+        self.budget = budget_seconds
+        self.started = time.perf_counter()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (may be negative), None without one."""
+        if self.budget is None:
+            return None
+        return self.budget - (time.perf_counter() - self.started)
+
+    def timeout(self, cap: Optional[float] = None) -> Optional[float]:
+        """
+        Timeout for an inference call made now.
+
+        Args:
+            cap: Longest timeout to return (e.g. the configured inference
+                timeout), None or 0 for no cap
+
+        Returns:
+            The remaining budget (at least 0) up to cap, or None without a
+            deadline, leaving the executor's own timeout in force
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        remaining = max(remaining, 0.0)
+        return min(remaining, cap) if cap else remaining
+
+
+class AdmissionController:
+    """
+    Admission control for the prediction endpoints.
+
+    A request is admitted unless the number of prediction requests in flight
+    has reached admission_max_in_flight, or the inference executor's latency
+    estimate (from its queue length and observed queue delay) exceeds the
+    request's remaining deadline. Shedding at the door keeps the answer time
+    of rejected requests short instead of letting them time out in the queue.
+
+    The in-flight count is only updated from the event loop.
+    """
+
+    def __init__(self, executor: InferenceExecutor = inference_executor):
+        """Initialize a controller for the given executor."""
+        self.executor = executor
+        self._in_flight = 0
+        self._admitted = 0
+        self._shed: Dict[str, int] = {}
+
+    def deadline(self, deadline_ms: Optional[float] = None) -> Deadline:
+        """
+        Build the deadline of a request.
+
+        Args:
+            deadline_ms: Budget from the X-Deadline-Ms header, None for the
+                configured default_deadline_ms
+
+        Returns:
+            Deadline starting now (without a budget if neither is positive)
+        """
+        if deadline_ms is None:
+            deadline_ms = get_settings().default_deadline_ms
+        return Deadline(deadline_ms / 1000 if deadline_ms and deadline_ms > 0 else None)
+
+    def check(self, deadline: Deadline) -> None:
+        """
+        Decide whether a request may be scored now.
+
+        Args:
+            deadline: Deadline of the request
+
+        Raises:
+            AdmissionRejected: If the request should be shed
+        """
+        settings = get_settings()
+        if not settings.admission_control_enabled:
+            return
+
+        max_in_flight = settings.admission_max_in_flight
+        if max_in_flight and self._in_flight >= max_in_flight:
+            self._reject("in_flight", f"{self._in_flight} prediction requests in flight (limit {max_in_flight})")
+
+        remaining = deadline.remaining()
+        if remaining is not None:
+            estimate = self.executor.estimate_latency()
+            if remaining <= 0 or estimate > remaining:
+                self._reject(
+                    "deadline",
+                    f"Estimated inference latency {estimate * 1000:.1f} ms exceeds "
+                    f"the remaining deadline budget {max(remaining, 0.0) * 1000:.1f} ms"
+                )
+
+    def _reject(self, reason: str, message: str) -> None:
+        """Count a shed request and raise AdmissionRejected."""
+        self._shed[reason] = self._shed.get(reason, 0) + 1
+        raise AdmissionRejected(reason, message)
+
+    @contextmanager
+    def admit(self, deadline: Deadline) -> Iterator[None]:
+        """
+        Admit a request for the duration of the with block.
+
+        Args:
+            deadline: Deadline of the request
+
+        Raises:
+            AdmissionRejected: If the request is shed (before the block runs)
+        """
+        self.check(deadline)
+        self._in_flight += 1
+        self._admitted += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get in-flight and shedding counters."""
+        return {
+            "enabled": get_settings().admission_control_enabled,
+            "in_flight": self._in_flight,
+            "admitted": self._admitted,
+            "shed": dict(self._shed),
+            "estimated_latency_ms": round(self.executor.estimate_latency() * 1000, 3)
+        }
+
+
+# Global instance
+admission_controller = AdmissionController()
@@ -0,0 +1,498 @@
+"""
+Scoring cascade module.
+Answers clear-cut rows with cheap stages and sends only ambiguous rows
+to the full tree ensemble.
+
+Stages, in order:
+- type_bound: transaction types whose full-model scores never reached the
+  MEDIUM threshold in the fit data are answered LOW, for rows inside the
+  type's training feature ranges, with the type's mean full-model score in
+  the fit data as their probability (the maximum score only decides which
+  types qualify; reported, it would overstate every row's risk)
+- shallow: a small tree ensemble distilled from the full model answers rows
+  it scores clearly LOW or clearly HIGH, using cutoffs calibrated offline
+- full: every other row is scored by the full model
+
+A cascade is fit offline for one artifact version (python -m app.cli
+cascade-fit) and stored as a manifest plus the shallow booster.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import xgboost as xgb
+
+from .native_artifacts import BoosterClassifier
+from .tree_ensemble import CompiledTreeEnsemble
+
+CASCADE_FORMAT_VERSION = 2
+MANIFEST_FILE = "cascade.json"
+SHALLOW_MODEL_FILE = "shallow.ubj"
+
+# Stage codes returned by ScoringCascade.route
+STAGES = ("type_bound", "shallow", "full")
+TYPE_BOUND, SHALLOW, FULL = range(len(STAGES))
+
+# Column of the encoded transaction type in the feature matrix
+TYPE_COLUMN = 6
+
+
+class ScoringCascade:
+    """
+    Cheap stages in front of the full model, fit for one artifact version.
+
+    Per-type bounds and scores are held as arrays indexed by type code (NaN
+    bound: the type always goes on to the shallow stage). The shallow model is
+    evaluated with the compiled evaluator for small batches and with
+    XGBoost's inplace predictor otherwise, like the full model.
+    """
+
+    def __init__(
+        self,
+        model_version: str,
+        feature_names: Sequence[str],
+        type_bounds: Dict[str, Dict[str, Any]],
+        type_codes: Dict[str, int],
+        shallow: xgb.Booster,
+        low_cutoff: float,
+        high_cutoff: float,
+        fit_report: Optional[Dict[str, Any]] = None,
+        compiled_max_rows: int = 4
+    ):
+        """
+        Initialize a cascade; use fit_cascade() or load_cascade() to build one.
+
+        Args:
+            model_version: Artifact version the cascade was fit for
+            feature_names: Feature matrix columns, in order
+            type_bounds: Per type name: "bound" (max full-model probability,
+                None if the type is not short-circuited), "mean_score" (the
+                probability reported for its rows) and the per-column
+                "low"/"high" ranges and "missing" flags of its fit rows
+            type_codes: Type name -> encoder code of the artifact version
+            shallow: Distilled shallow booster (binary:logistic)
+            low_cutoff: Shallow probabilities below this are answered as LOW
+            high_cutoff: Shallow probabilities at or above this are answered as HIGH
+            fit_report: Statistics recorded while fitting
+            compiled_max_rows: Largest batch evaluated with the compiled shallow model
+        """
+        self.model_version = model_version
+        self.feature_names = list(feature_names)
+        self.type_bounds = type_bounds
+        self.low_cutoff = float(low_cutoff)
+        self.high_cutoff = float(high_cutoff)
+        self.fit_report = dict(fit_report or {})
+        self.compiled_max_rows = compiled_max_rows
+
+        self.shallow = BoosterClassifier(shallow)
+        self.shallow_compiled = CompiledTreeEnsemble.from_booster(shallow)
+
+        n_codes = max(type_codes.values()) + 1 if type_codes else 0
+        n_features = len(self.feature_names)
+        self._bound = np.full(n_codes, np.nan, dtype=np.float32)
+        self._score = np.full(n_codes, np.nan, dtype=np.float32)
+        self._low = np.full((n_codes, n_features), np.inf, dtype=np.float32)
+        self._high = np.full((n_codes, n_features), -np.inf, dtype=np.float32)
+        self._missing = np.zeros((n_codes, n_features), dtype=bool)
+        for name, code in type_codes.items():
+            entry = type_bounds.get(name)
+            if entry is None or entry.get("bound") is None:
+                continue
+            self._bound[code] = entry["bound"]
+            self._score[code] = entry["mean_score"]
+            self._low[code] = np.array([np.inf if v is None else v for v in entry["low"]], dtype=np.float32)
+            self._high[code] = np.array([-np.inf if v is None else v for v in entry["high"]], dtype=np.float32)
+            self._missing[code] = entry["missing"]
+
+    @property
+    def fit_id(self) -> str:
+        """Short fingerprint of the fitted cascade."""
+        payload = json.dumps(
+            [self.model_version, self.type_bounds, self.low_cutoff, self.high_cutoff],
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+    @property
+    def bounded_types(self) -> Tuple[str, ...]:
+        """Types answered by the type_bound stage."""
+        return tuple(name for name, entry in self.type_bounds.items() if entry.get("bound") is not None)
+
+    def shallow_proba(self, features: np.ndarray) -> np.ndarray:
+        """Fraud probabilities of the shallow model."""
+        if len(features) <= self.compiled_max_rows:
+            return self.shallow_compiled.predict_proba(features)[:, 1]
+        return self.shallow.predict_proba(features)[:, 1]
+
+    def route(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Answer the rows the cheap stages can decide.
+
+        Args:
+            features: (N, F) float32 feature matrix of valid rows
+
+        Returns:
+            Tuple of ((N,) float32 probabilities, NaN for rows left to the
+            full model; (N,) int8 stage codes, FULL for those rows)
+        """
+        n_rows = len(features)
+        probabilities = np.full(n_rows, np.nan, dtype=np.float32)
+        stages = np.full(n_rows, FULL, dtype=np.int8)
+        if n_rows == 0:
+            return probabilities, stages
+
+        codes = features[:, TYPE_COLUMN].astype(np.intp)
+        bounds = self._bound[codes]
+        bounded = ~np.isnan(bounds)
+        if bounded.any():
+            rows = np.flatnonzero(bounded)
+            values = features[rows]
+            codes_in = codes[rows]
+            inside = (values >= self._low[codes_in]) & (values <= self._high[codes_in])
+            inside |= np.isnan(values) & self._missing[codes_in]
+            rows = rows[inside.all(axis=1)]
+            probabilities[rows] = self._score[codes[rows]]
+            stages[rows] = TYPE_BOUND
+
+        rest = np.flatnonzero(stages == FULL)
+        if len(rest):
+            shallow = self.shallow_proba(features[rest])
+            clear = (shallow < self.low_cutoff) | (shallow >= self.high_cutoff)
+            rows = rest[clear]
+            probabilities[rows] = shallow[clear]
+            stages[rows] = SHALLOW
+        return probabilities, stages
+
+    def info(self) -> Dict[str, Any]:
+        """Summary for status endpoints."""
+        return {
+            "fit_id": self.fit_id,
+            "model_version": self.model_version,
+            "bounded_types": list(self.bounded_types),
+            "low_cutoff": round(self.low_cutoff, 6),
+            "high_cutoff": round(self.high_cutoff, 6) if np.isfinite(self.high_cutoff) else None,
+            "shallow_trees": self.shallow_compiled.n_trees,
+            "fitted_at": self.fit_report.get("fitted_at")
+        }
+
+
+def _calibrate_cutoffs(
+    shallow: np.ndarray,
+    full: np.ndarray,
+    medium_threshold: float,
+    high_threshold: float,
+    max_disagreement: float
+) -> Tuple[float, float]:
+    """
+    Widest shallow cutoffs whose answers stay within max_disagreement.
+
+    The LOW cutoff is the largest value (at most the MEDIUM threshold) such
+    that, of the rows scoring below it, at most a max_disagreement share is
+    not LOW under the full model; the HIGH cutoff mirrors it from above.
+
+    Returns:
+        (low_cutoff, high_cutoff); 0.0 / inf when no row can be answered
+    """
+    ranks = np.arange(1, len(shallow) + 1)
+
+    order = np.argsort(shallow, kind="stable")
+    ascending = shallow[order]
+    wrong = np.cumsum(full[order] >= medium_threshold)
+    # A cutoff must sit strictly above the answered rows and below the next one
+    distinct = np.append(ascending[1:] > ascending[:-1], True)
+    ok = np.flatnonzero((wrong <= max_disagreement * ranks) & (ascending < medium_threshold) & distinct)
+    low_cutoff = 0.0
+    if len(ok):
+        last = ok[-1]
+        upper = ascending[last + 1] if last + 1 < len(ascending) else medium_threshold
+        low_cutoff = float(min((ascending[last] + upper) / 2, medium_threshold))
+
+    order = np.argsort(-shallow, kind="stable")
+    descending = shallow[order]
+    wrong = np.cumsum(full[order] < high_threshold)
+    distinct = np.append(descending[1:] < descending[:-1], True)
+    ok = np.flatnonzero((wrong <= max_disagreement * ranks) & (descending >= high_threshold) & distinct)
+    high_cutoff = float("inf")
+    if len(ok):
+        high_cutoff = float(descending[ok[-1]])
+    return low_cutoff, high_cutoff
+
+
+def fit_cascade(
+    model: Any,
+    model_version: str,
+    feature_names: Sequence[str],
+    type_codes: Dict[str, int],
+    features: np.ndarray,
+    medium_threshold: float,
+    high_threshold: float,
+    max_disagreement: float = 0.001,
+    shallow_depth: int = 4,
+    shallow_trees: int = 30,
+    calibration_share: float = 0.25,
+    seed: int = 0
+) -> ScoringCascade:
+    """
+    Fit a cascade in front of a model from a sample of its input rows.
+
+    The full model scores every row. Types whose maximum score stays below
+    the MEDIUM threshold get a type bound. The shallow model is trained on
+    the full model's probabilities (soft labels) for the remaining types and
+    its cutoffs are calibrated on a held-out share of the rows.
+
+    Args:
+        model: Full model exposing predict_proba
+        model_version: Artifact version of the model
+        feature_names: Feature matrix columns, in order
+        type_codes: Type name -> encoder code
+        features: (N, F) float32 feature matrix of valid rows
+        medium_threshold: MEDIUM risk threshold
+        high_threshold: HIGH risk threshold
+        max_disagreement: Largest share of shallow answers allowed to fall
+            in a different risk level than the full model's, per side
+        shallow_depth: Depth of the shallow trees
+        shallow_trees: Number of shallow trees
+        calibration_share: Share of rows held out to calibrate the cutoffs
+        seed: Random seed of the split
+
+    Returns:
+        Fitted ScoringCascade
+
+    Raises:
+        ValueError: If there are too few rows to fit
+    """
+    if len(features) < 100:
+        raise ValueError(f"Need at least 100 rows to fit a cascade, got {len(features)}")
+    start = time.perf_counter()
+    full = np.asarray(model.predict_proba(features)[:, 1], dtype=np.float64)
+
+    codes = features[:, TYPE_COLUMN].astype(np.intp)
+    type_bounds: Dict[str, Dict[str, Any]] = {}
+    for name, code in sorted(type_codes.items()):
+        rows = codes == code
+        if not rows.any():
+            continue
+        values = features[rows]
+        missing = np.isnan(values)
+        low = np.where(missing, np.inf, values).min(axis=0)
+        high = np.where(missing, -np.inf, values).max(axis=0)
+        max_score = float(full[rows].max())
+        type_bounds[name] = {
+            "rows": int(rows.sum()),
+            "max_score": round(max_score, 6),
+            "mean_score": round(float(full[rows].mean()), 6),
+            "bound": max_score if max_score < medium_threshold else None,
+            "low": [None if np.isinf(v) else float(v) for v in low],
+            "high": [None if np.isinf(v) else float(v) for v in high],
+            "missing": missing.any(axis=0).tolist()
+        }
+
+    bounded_codes = [type_codes[name] for name, entry in type_bounds.items() if entry["bound"] is not None]
+    remaining = np.flatnonzero(~np.isin(codes, bounded_codes))
+    rng = np.random.default_rng(seed)
+    rng.shuffle(remaining)
+    n_calibration = max(int(len(remaining) * calibration_share), 1)
+    calibration, training = remaining[:n_calibration], remaining[n_calibration:]
+    if len(training) == 0:
+        training = calibration
+
+    dtrain = xgb.DMatrix(features[training], label=full[training], feature_names=list(feature_names))
+    shallow = xgb.train(
+        {
+            "objective": "binary:logistic",
+            "max_depth": shallow_depth,
+            "eta": 0.3,
+            "tree_method": "hist"
+        },
+        dtrain,
+        num_boost_round=shallow_trees
+    )
+    shallow_scores = BoosterClassifier(shallow).predict_proba(features[calibration])[:, 1]
+    low_cutoff, high_cutoff = _calibrate_cutoffs(
+        shallow_scores.astype(np.float64), full[calibration],
+        medium_threshold, high_threshold, max_disagreement
+    )
+
+    fit_report = {
+        "fitted_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "rows": int(len(features)),
+        "training_rows": int(len(training)),
+        "calibration_rows": int(len(calibration)),
+        "max_disagreement": max_disagreement,
+        "shallow_depth": shallow_depth,
+        "shallow_trees": shallow_trees,
+        "medium_threshold": medium_threshold,
+        "high_threshold": high_threshold,
+        "fit_seconds": round(time.perf_counter() - start, 1)
+    }
+    return ScoringCascade(
+        model_version, feature_names, type_bounds, type_codes,
+        shallow, low_cutoff, high_cutoff, fit_report
+    )
+
+
+def save_cascade(cascade: ScoringCascade, directory: Path) -> Path:
+    """
+    Write a cascade as a manifest plus the shallow booster.
+
+    Args:
+        cascade: Fitted cascade
+        directory: Target directory (created if missing)
+
+    Returns:
+        Path of the manifest
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    cascade.shallow.get_booster().save_model(str(directory / SHALLOW_MODEL_FILE))
+    manifest = {
+        "format_version": CASCADE_FORMAT_VERSION,
+        "model_version": cascade.model_version,
+        "feature_names": cascade.feature_names,
+        "type_bounds": cascade.type_bounds,
+        "low_cutoff": cascade.low_cutoff,
+        "high_cutoff": cascade.high_cutoff if np.isfinite(cascade.high_cutoff) else None,
+        "shallow_file": SHALLOW_MODEL_FILE,
+        "fit_report": cascade.fit_report
+    }
+    path = directory / MANIFEST_FILE
+    path.write_text(json.dumps(manifest, indent=2))
+    return path
+
+
+def load_cascade(
+    directory: Path,
+    model_version: str,
+    feature_names: Sequence[str],
+    type_codes: Dict[str, int],
+    compiled_max_rows: int = 4
+) -> ScoringCascade:
+    """
+    Load a cascade for an artifact version.
+
+    Args:
+        directory: Cascade directory
+        model_version: Artifact version it must have been fit for
+        feature_names: Feature matrix columns of that version
+        type_codes: Type name -> encoder code of that version
+        compiled_max_rows: Largest batch evaluated with the compiled shallow model
+
+    Returns:
+        Loaded ScoringCascade
+
+    Raises:
+        FileNotFoundError: If there is no cascade in directory
+        ValueError: If the cascade was fit for another version or layout
+    """
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST_FILE).read_text())
+    if manifest.get("format_version") != CASCADE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported cascade format version {manifest.get('format_version')}")
+    if manifest["model_version"] != model_version:
+        raise ValueError(
+            f"Cascade was fit for model version {manifest['model_version']}, not {model_version}"
+        )
+    if list(manifest["feature_names"]) != list(feature_names):
+        raise ValueError(f"Cascade features {manifest['feature_names']} do not match the model's")
+
+    shallow = xgb.Booster()
+    shallow.load_model(str(directory / manifest["shallow_file"]))
+    high_cutoff = manifest["high_cutoff"]
+    return ScoringCascade(
+        manifest["model_version"],
+        manifest["feature_names"],
+        manifest["type_bounds"],
+        type_codes,
+        shallow,
+        manifest["low_cutoff"],
+        float("inf") if high_cutoff is None else high_cutoff,
+        manifest.get("fit_report"),
+        compiled_max_rows
+    )
+
+
+def evaluate_cascade(
+    cascade: ScoringCascade,
+    model: Any,
+    features: np.ndarray,
+    type_names: np.ndarray,
+    medium_threshold: float,
+    high_threshold: float,
+    labels: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Compare cascade scoring with full-model scoring on the same rows.
+
+    Args:
+        cascade: Cascade to evaluate
+        model: Full model exposing predict_proba
+        features: (N, F) float32 feature matrix of valid rows
+        type_names: (N,) transaction type names
+        medium_threshold: MEDIUM risk threshold
+        high_threshold: HIGH risk threshold
+        labels: Optional (N,) ground-truth fraud labels
+
+    Returns:
+        Short-circuit fractions (overall and per type), agreement with the
+        full model, timings and, with labels, accuracy of both
+    """
+    start = time.perf_counter()
+    full = np.asarray(model.predict_proba(features)[:, 1], dtype=np.float64)
+    full_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cascaded, stages = cascade.route(features)
+    remaining = np.flatnonzero(stages == FULL)
+    if len(remaining):
+        cascaded[remaining] = model.predict_proba(features[remaining])[:, 1]
+    cascade_seconds = time.perf_counter() - start
+    cascaded = cascaded.astype(np.float64)
+
+    def risk(probabilities: np.ndarray) -> np.ndarray:
+        return np.digitize(probabilities, (medium_threshold, high_threshold))
+
+    n_rows = len(features)
+    short = stages != FULL
+    report: Dict[str, Any] = {
+        "rows": n_rows,
+        "stages": {name: int((stages == code).sum()) for code, name in enumerate(STAGES)},
+        "short_circuited": round(float(short.mean()), 6) if n_rows else 0.0,
+        "by_type": {},
+        "risk_level_agreement": round(float((risk(full) == risk(cascaded)).mean()), 6) if n_rows else 1.0,
+        "decision_changes": int(((full >= 0.5) != (cascaded >= 0.5)).sum()),
+        "max_abs_probability_diff": round(float(np.abs(full - cascaded).max()), 6) if n_rows else 0.0,
+        "full_seconds": round(full_seconds, 3),
+        "cascade_seconds": round(cascade_seconds, 3)
+    }
+    for name in sorted(set(type_names.tolist())):
+        rows = type_names == name
+        report["by_type"][name] = {
+            "rows": int(rows.sum()),
+            "short_circuited": round(float(short[rows].mean()), 6),
+            **{stage: int((stages[rows] == code).sum()) for code, stage in enumerate(STAGES)}
+        }
+
+    if labels is not None:
+        labels = labels.astype(bool)
+
+        def accuracy(probabilities: np.ndarray) -> Dict[str, float]:
+            predicted = probabilities >= 0.5
+            true_positive = int((predicted & labels).sum())
+            return {
+                "accuracy": round(float((predicted == labels).mean()), 6),
+                "precision": round(true_positive / max(int(predicted.sum()), 1), 6),
+                "recall": round(true_positive / max(int(labels.sum()), 1), 6)
+            }
+
+        full_metrics, cascade_metrics = accuracy(full), accuracy(cascaded)
+        report["labels"] = {
+            "fraud_rows": int(labels.sum()),
+            "full": full_metrics,
+            "cascade": cascade_metrics,
+            "delta": {key: round(cascade_metrics[key] - full_metrics[key], 6) for key in full_metrics}
+        }
+    return report
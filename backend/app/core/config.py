@@ -4,9 +4,10 @@ Loads environment variables and provides application settings.
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Literal, Optional
 from functools import lru_cache
 import os
+import tempfile
 from pathlib import Path
 
 
@@ -83,15 +84,165 @@ class Settings(BaseSettings):
         feature_importance_file = os.getenv("FEATURE_IMPORTANCE_FILE", "feature_importance.json")
         return str(self.models_dir / feature_importance_file)
     
+    @property
+    def native_artifacts_dir(self) -> Path:
+        """Cache of native (UBJSON + manifest) conversions of the pickled model and encoder."""
+        return self.models_dir / "native"
+    
+    @property
+    def shadow_models_dir(self) -> Path:
+        """Directory holding one sub-directory per shadow (challenger) model."""
+        return self.models_dir / "shadow"
+    
+    @property
+    def onnx_models_dir(self) -> Path:
+        """ONNX exports of the model, one <artifact version>.onnx file each."""
+        return self.models_dir / "onnx"
+    
+    @property
+    def cascade_dir(self) -> Path:
+        """Scoring cascade fitted for the model (python -m app.cli cascade-fit)."""
+        return self.models_dir / "cascade"
+    
     # Risk Thresholds
     high_risk_threshold: float = 0.8
     medium_risk_threshold: float = 0.4
     
+    # Native model artifacts: preferred over the pickles when converted from the same files
+    native_artifacts_enabled: bool = True
+    native_artifacts_auto_convert: bool = True  # convert on a pickle load, for the next start
+    
+    # Hot reload of model artifacts
+    artifact_watch_enabled: bool = False
+    artifact_watch_interval_seconds: float = 5.0
+    admin_api_key: Optional[str] = None
+    
+    # Shadow models scored after the primary response is sent
+    shadow_enabled: bool = False
+    shadow_workers: int = 1
+    shadow_queue_depth: int = 8
+    shadow_output_path: str = "logs/shadow_predictions.jsonl"
+    
+    # Full-model inference backend: "xgboost" (Booster.inplace_predict),
+    # "sklearn" (the model's predict_proba) or "onnxruntime" (needs the
+    # onnxruntime package and an export from: python -m app.cli convert --onnx)
+    inference_backend: Literal["xgboost", "sklearn", "onnxruntime"] = "xgboost"
+    
+    # Threads per full-model call of the inference backend, 0 keeps the
+    # library's default (all cores); gunicorn.conf.py sets 1 since its
+    # workers already use every core
+    xgboost_threads: int = 0
+    
+    # Compiled tree evaluator, used for batches up to compiled_ensemble_max_rows.
+    # Off by default: it beats XGBClassifier.predict_proba only on single rows
+    # (121 vs 214 us) but not the default xgboost backend (103 us), and from 2
+    # rows up it is slower than every backend (python -m
+    # benchmarks.bench_tree_ensemble / bench_backends, 1 thread)
+    compile_tree_ensemble: bool = False
+    compiled_ensemble_max_rows: int = 1
+    
+    # Scoring cascade: per-type score bounds and a shallow distilled model answer
+    # clear-cut rows before the full model (needs a cascade fit for the model)
+    cascade_enabled: bool = False
+    
+    # Inference Executor
+    inference_workers: int = min(4, os.cpu_count() or 1)
+    inference_queue_depth: int = 64
+    inference_timeout_seconds: float = 5.0
+    
+    # Admission control: shed requests that cannot be answered within their
+    # deadline (X-Deadline-Ms header, else default_deadline_ms; 0 = no deadline)
+    admission_control_enabled: bool = True
+    admission_max_in_flight: int = 0  # prediction requests in flight, 0 = unlimited
+    default_deadline_ms: float = 0.0
+    overload_policy: Literal["fallback", "reject"] = "fallback"  # single predictions only
+    
+    # Micro-batching of concurrent single predictions (opt-in)
+    micro_batching_enabled: bool = False
+    micro_batch_max_size: int = 32
+    micro_batch_max_wait_us: int = 500
+    micro_batch_queue_depth: int = 1024  # requests waiting to be batched; more are shed as queue_full
+    
+    # Prediction cache keyed on feature vector + artifact version
+    prediction_cache_enabled: bool = True
+    prediction_cache_backend: Literal["memory", "shared"] = "memory"
+    prediction_cache_max_entries: int = 100_000
+    prediction_cache_ttl_seconds: float = 300.0
+    prediction_cache_shm_name: str = "fraud_prediction_cache"
+    
+    # Per-account velocity features (for transactions carrying nameOrig/nameDest).
+    # The store is only updated while the active model uses velocity features
+    velocity_features_enabled: bool = True
+    velocity_window_steps: int = 24  # steps are hours in PaySim
+    # Least recently seen accounts are evicted past velocity_max_accounts. Each
+    # takes 4 channels x velocity_window_steps x 8 bytes of buckets plus ~220
+    # bytes of totals, bookkeeping and LRU entry: ~1 KB at 24 steps (~50 MB
+    # for the default 50k accounts), ~2.3 KB at the 64-step maximum
+    velocity_max_accounts: int = 50_000
+    
+    # Per-prediction feature contributions (XGBoost pred_contribs), on their own pool.
+    # "on_request": explain=true requests only; "risky": also every MEDIUM/HIGH
+    # row, which then waits for exact TreeSHAP (~6 ms per single prediction)
+    # unless contributions_approximate is set
+    contributions_mode: Literal["off", "on_request", "risky"] = "on_request"
+    contributions_approximate: bool = False  # Saabas instead of exact TreeSHAP (~100x cheaper here)
+    contributions_workers: int = 1
+    contributions_queue_depth: int = 16
+    
+    # Binary RPC listener for internal callers (length-prefixed msgpack, see
+    # app.api.rpc); needs the msgpack package. A Unix socket path replaces
+    # host/port, "{pid}" in it is replaced by the worker's pid
+    rpc_enabled: bool = False
+    rpc_host: str = "127.0.0.1"
+    rpc_port: int = 8001
+    rpc_unix_socket: Optional[str] = None
+    rpc_max_inflight: int = 64  # pipelined requests in progress per connection
+    rpc_max_frame_bytes: int = 1_048_576
+    
+    # Binary (Arrow IPC / packed float32) batch scoring
+    binary_batch_max_rows: int = 100_000
+    
+    # Streaming NDJSON scoring
+    stream_chunk_size: int = 512
+    stream_max_line_bytes: int = 65536
+    
+    # Stream consumer worker (python -m app.cli consume): micro-batches of up
+    # to consumer_batch_size records, waiting at most consumer_linger_ms for a
+    # batch to fill; at most consumer_buffer_records are read ahead of scoring
+    consumer_batch_size: int = 256
+    consumer_linger_ms: float = 5.0
+    consumer_buffer_records: int = 4096
+    consumer_checkpoint_path: str = "logs/consumer_checkpoint.json"
+    consumer_commit_interval_seconds: float = 1.0
+    consumer_sink_fsync: bool = False  # fsync file sinks before each commit
+    consumer_metrics_path: str = "logs/consumer_metrics.prom"  # Prometheus textfile, "" to disable
+    
+    # Decision store: decisions of transactions carrying a transaction_id are
+    # kept so a retried id gets the stored decision back and /approve and
+    # /decisions/{id} can refer to it. Writes are group-committed off the
+    # request path: up to decision_store_batch_size per commit, lingering
+    # decision_store_linger_ms for more; past decision_store_queue_depth
+    # pending writes new decisions are not stored (counted as dropped)
+    decision_store_enabled: bool = False
+    decision_store_backend: Literal["sqlite", "memory"] = "sqlite"
+    decision_store_path: str = "data/decisions.sqlite3"
+    decision_store_synchronous: Literal["OFF", "NORMAL", "FULL"] = "NORMAL"  # SQLite WAL durability
+    decision_store_batch_size: int = 512
+    decision_store_linger_ms: float = 2.0
+    decision_store_queue_depth: int = 10_000
+    
+    # Metrics: per-worker snapshots in metrics_dir are merged by /metrics (empty disables)
+    metrics_dir: str = os.path.join(tempfile.gettempdir(), "fraud_detection_metrics")
+    metrics_flush_interval_seconds: float = 1.0
+    
     # Rate Limiting
     rate_limit_per_minute: int = 100
     
     # Logging
     log_level: str = "INFO"
+    log_file: str = "logs/app.log"
+    log_serialize: bool = True  # one JSON record per line in log_file
+    prediction_log_sample_rate: float = 0.01  # share of single predictions logged
     
     class Config:
         env_file = ".env"
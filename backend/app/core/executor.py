@@ -0,0 +1,212 @@
+"""
+Inference executor module.
+Runs CPU-bound model calls on a bounded thread pool so they never block the event loop.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from loguru import logger
+
+from .config import get_settings
+from .metrics import stage_duration
+
+# Weight of the newest observation in the queue delay / service time averages
+EWMA_ALPHA = 0.2
+
+
+class InferenceRejected(RuntimeError):
+    """Raised when the inference queue is full and a request is shed."""
+
+
+class InferenceTimeout(TimeoutError):
+    """Raised when an inference call does not finish within its timeout."""
+
+
+class InferenceExecutor:
+    """
+    Bounded executor for model inference.
+
+    XGBoost releases the GIL while predicting, so a thread pool gives real
+    parallelism while keeping a single copy of the model in memory. The number
+    of calls queued or running is capped; calls beyond the cap are rejected
+    immediately instead of piling up behind the pool. Queue delay and service
+    time are tracked as moving averages, so callers can tell how long a new
+    call would take before submitting it (see estimate_latency).
+    """
+
+    def __init__(self, name: str = "inference"):
+        """Initialize an executor that is started lazily or from the lifespan hook."""
+        self.name = name
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._max_workers = 0
+        self._max_pending = 0
+        self._timeout = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._queue_delay = 0.0
+        self._service_time = 0.0
+
+    def start(
+        self,
+        max_workers: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        timeout_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Start the worker pool.
+
+        Args:
+            max_workers: Number of inference threads
+            queue_depth: Calls allowed to wait for a free thread
+            timeout_seconds: Default per-call timeout (0 disables it)
+        """
+        settings = get_settings()
+        max_workers = max_workers or settings.inference_workers
+        queue_depth = settings.inference_queue_depth if queue_depth is None else queue_depth
+        timeout_seconds = (
+            settings.inference_timeout_seconds if timeout_seconds is None else timeout_seconds
+        )
+
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix=self.name
+            )
+            self._max_workers = max_workers
+            self._max_pending = max_workers + queue_depth
+            self._timeout = timeout_seconds or None
+
+        logger.info(
+            f"Inference executor '{self.name}' started: workers={max_workers}, "
+            f"queue_depth={queue_depth}, timeout={timeout_seconds}s"
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, dropping calls that have not started yet."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            logger.info(f"Inference executor '{self.name}' stopped")
+
+    def _release(self, _future) -> None:
+        """Free a queue slot once the underlying call has finished."""
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def _observe(self, queue_delay: float, service_time: float) -> None:
+        """Fold one call's queue delay and service time into the moving averages."""
+        stage_duration.observe(queue_delay, f"{self.name}_queue")
+        with self._lock:
+            if self._service_time:
+                self._queue_delay += EWMA_ALPHA * (queue_delay - self._queue_delay)
+                self._service_time += EWMA_ALPHA * (service_time - self._service_time)
+            else:
+                self._queue_delay, self._service_time = queue_delay, service_time
+
+    def estimate_latency(self) -> float:
+        """
+        Estimate how long a call submitted now would take to finish, in seconds.
+
+        A call that finds a free thread takes one average service time. Behind
+        a busy pool it also waits for the calls queued ahead of it, estimated
+        from the queue length and from the recently observed queue delay,
+        whichever is larger. The observed delay only counts while calls are
+        queued, so an idle pool never looks slow because of an old spike.
+
+        Returns:
+            Estimated latency, 0.0 before the first call has completed
+        """
+        with self._lock:
+            if not self._service_time or not self._max_workers:
+                return 0.0
+            queued_ahead = self._pending + 1 - self._max_workers
+            if queued_ahead <= 0:
+                return self._service_time
+            wait = max(queued_ahead / self._max_workers * self._service_time, self._queue_delay)
+            return wait + self._service_time
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run func(*args) on the pool and await its result.
+
+        Args:
+            func: Blocking callable to execute
+            *args: Positional arguments for func
+            timeout: Per-call timeout in seconds, defaults to the configured one
+
+        Returns:
+            The return value of func
+
+        Raises:
+            InferenceRejected: If the queue is full
+            InferenceTimeout: If the call does not finish in time
+        """
+        if self._executor is None:
+            self.start()
+
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self._rejected += 1
+                raise InferenceRejected(
+                    f"Inference queue is full ({self._max_pending} calls pending)"
+                )
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def timed_call() -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self._observe(started - submitted, time.perf_counter() - started)
+
+        try:
+            future = self._executor.submit(timed_call)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # The slot is held until the call really finishes, even after a timeout
+        future.add_done_callback(self._release)
+
+        timeout = self._timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            raise InferenceTimeout(f"Inference did not finish within {timeout}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get current queue and outcome counters."""
+        with self._lock:
+            return {
+                "workers": self._max_workers,
+                "max_pending": self._max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "queue_delay_ms": round(self._queue_delay * 1000, 3),
+                "service_time_ms": round(self._service_time * 1000, 3)
+            }
+
+
+# Global instance
+inference_executor = InferenceExecutor()
@@ -0,0 +1,288 @@
+"""
+Inference backend module.
+Interchangeable implementations of the full-model call behind one
+interface, selected with the inference_backend setting.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .native_artifacts import BoosterClassifier, model_iteration_range
+
+# Output of the exported ONNX graph holding (N, 2) class probabilities
+ONNX_PROBABILITY_OUTPUT = "probabilities"
+ONNX_INPUT = "features"
+
+
+class InferenceBackend(ABC):
+    """
+    Computes fraud probabilities of a feature matrix with one model.
+
+    Implementations must be safe to call from several inference threads at
+    once and must not copy the model per call.
+    """
+
+    name = "base"
+
+    def __init__(self, threads: int = 0):
+        """
+        Initialize the backend.
+
+        Args:
+            threads: Threads per call, 0 keeps the library default
+        """
+        self.threads = threads
+
+    @abstractmethod
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Fraud probabilities of a batch.
+
+        Args:
+            batch: (N, F) float32 feature matrix in model feature order
+
+        Returns:
+            (N,) float32 array of fraud probabilities
+        """
+
+    @abstractmethod
+    def configure_threads(self, threads: int) -> None:
+        """
+        Set the threads used per call.
+
+        Args:
+            threads: Thread count, 0 for the library default
+        """
+
+    def warmup(self, batch: np.ndarray) -> float:
+        """
+        Score a batch once to pay first-call costs and check the output.
+
+        Args:
+            batch: Representative feature matrix
+
+        Returns:
+            Warmup time in milliseconds
+
+        Raises:
+            ValueError: If the backend returns invalid probabilities
+        """
+        start = time.perf_counter()
+        probabilities = self.predict(batch)
+        if probabilities.shape != (len(batch),) or not np.all((probabilities >= 0) & (probabilities <= 1)):
+            raise ValueError(f"Warmup of the {self.name} backend produced invalid probabilities: {probabilities}")
+        return (time.perf_counter() - start) * 1000
+
+    def info(self) -> Dict[str, Any]:
+        """Backend name and configuration."""
+        return {"name": self.name, "threads": self.threads}
+
+
+class XGBoostNativeBackend(InferenceBackend):
+    """Booster.inplace_predict on the float32 matrix, without a DMatrix or wrapper."""
+
+    name = "xgboost"
+
+    def __init__(self, model: Any, threads: int = 0):
+        """
+        Initialize from a model exposing get_booster().
+
+        Args:
+            model: BoosterClassifier or XGBClassifier
+            threads: Threads per call, 0 keeps XGBoost's default
+        """
+        super().__init__(threads)
+        self.booster = model.get_booster()
+        if isinstance(model, BoosterClassifier):
+            self.iteration_range = model.iteration_range
+        else:
+            self.iteration_range = model_iteration_range(model)
+        if threads:
+            self.configure_threads(threads)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """Fraud probabilities from the booster."""
+        return np.asarray(
+            self.booster.inplace_predict(batch, iteration_range=self.iteration_range),
+            dtype=np.float32
+        )
+
+    def configure_threads(self, threads: int) -> None:
+        """Set the booster's nthread."""
+        self.threads = threads
+        self.booster.set_param({"nthread": threads})
+
+
+class SklearnBackend(InferenceBackend):
+    """
+    The model object's own predict_proba.
+
+    With a pickle this is the XGBClassifier sklearn wrapper, which builds a
+    DMatrix per call; with native artifacts it is the BoosterClassifier shim.
+    """
+
+    name = "sklearn"
+
+    def __init__(self, model: Any, threads: int = 0):
+        """
+        Initialize from a model exposing predict_proba.
+
+        Args:
+            model: Classifier with predict_proba (and set_params for threads)
+            threads: Threads per call, 0 keeps the model's setting
+        """
+        super().__init__(threads)
+        self.model = model
+        if threads:
+            self.configure_threads(threads)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """Fraud probabilities from predict_proba."""
+        return np.asarray(self.model.predict_proba(batch)[:, 1], dtype=np.float32)
+
+    def configure_threads(self, threads: int) -> None:
+        """Set n_jobs on the model."""
+        self.threads = threads
+        if threads and hasattr(self.model, "set_params"):
+            self.model.set_params(n_jobs=threads)
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """
+    ONNX Runtime session over a model exported at build time (export_onnx).
+
+    Requires the optional onnxruntime package.
+    """
+
+    name = "onnxruntime"
+
+    def __init__(self, model_path: Path, threads: int = 0):
+        """
+        Load an exported model.
+
+        Args:
+            model_path: .onnx file written by export_onnx
+            threads: Intra-op threads per call, 0 keeps ONNX Runtime's default
+
+        Raises:
+            ImportError: If onnxruntime is not installed
+            FileNotFoundError: If the model file does not exist
+        """
+        import onnxruntime  # noqa: F401 - fail early when the package is missing
+
+        super().__init__(threads)
+        self.model_path = Path(model_path)
+        if not self.model_path.exists():
+            raise FileNotFoundError(f"ONNX model not found: {self.model_path}")
+        self._model_bytes = self.model_path.read_bytes()
+        self._session = self._create_session(threads)
+
+    def _create_session(self, threads: int) -> Any:
+        """Create an inference session with the given intra-op thread count."""
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        return onnxruntime.InferenceSession(
+            self._model_bytes, options, providers=["CPUExecutionProvider"]
+        )
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """Fraud probabilities from the session's probability output."""
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        probabilities = self._session.run([ONNX_PROBABILITY_OUTPUT], {ONNX_INPUT: batch})[0]
+        return np.asarray(probabilities[:, 1], dtype=np.float32)
+
+    def configure_threads(self, threads: int) -> None:
+        """Recreate the session, since thread counts are fixed at creation."""
+        self.threads = threads
+        self._session = self._create_session(threads)
+
+    def info(self) -> Dict[str, Any]:
+        """Backend name, configuration and model file."""
+        return {**super().info(), "model_path": str(self.model_path)}
+
+
+BACKENDS = ("xgboost", "sklearn", "onnxruntime")
+
+
+def onnx_model_path(directory: Path, version: str) -> Path:
+    """Path of the ONNX export of an artifact version."""
+    return Path(directory) / f"{version}.onnx"
+
+
+def export_onnx(model: Any, n_features: int, path: Path) -> Path:
+    """
+    Export a binary:logistic XGBoost model to ONNX.
+
+    Only the trees predict_proba uses are exported (iteration_range).
+    Requires the optional onnxmltools and onnx packages.
+
+    Args:
+        model: BoosterClassifier or XGBClassifier
+        n_features: Number of input columns
+        path: Output .onnx file
+
+    Returns:
+        The written path
+    """
+    from onnxmltools import convert_xgboost
+    from onnxmltools.convert.common.data_types import FloatTensorType
+
+    if isinstance(model, BoosterClassifier):
+        begin, end = model.iteration_range
+    else:
+        begin, end = model_iteration_range(model)
+    booster = model.get_booster()
+    booster = booster[begin:end] if end else booster.copy()
+    # The converter only understands positional feature names (f0, f1, ...)
+    booster.feature_names = None
+    booster.feature_types = None
+
+    onnx_model = convert_xgboost(booster, initial_types=[(ONNX_INPUT, FloatTensorType([None, n_features]))])
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(onnx_model.SerializeToString())
+    tmp_path.replace(path)
+    return path
+
+
+def create_backend(
+    name: str,
+    model: Any,
+    threads: int = 0,
+    onnx_path: Optional[Path] = None
+) -> InferenceBackend:
+    """
+    Build an inference backend for a loaded model.
+
+    Args:
+        name: One of BACKENDS
+        model: Loaded model (BoosterClassifier or XGBClassifier)
+        threads: Threads per call, 0 for the library default
+        onnx_path: Exported model file for the onnxruntime backend
+
+    Returns:
+        The backend
+
+    Raises:
+        ValueError: If the name is unknown or onnx_path is missing for onnxruntime
+        ImportError: If the backend's optional package is not installed
+        FileNotFoundError: If the ONNX export does not exist
+    """
+    if name == "xgboost":
+        return XGBoostNativeBackend(model, threads)
+    if name == "sklearn":
+        return SklearnBackend(model, threads)
+    if name == "onnxruntime":
+        if onnx_path is None:
+            raise ValueError("The onnxruntime backend needs the path of an exported model")
+        return OnnxRuntimeBackend(onnx_path, threads)
+    raise ValueError(f"Unknown inference backend '{name}', expected one of {BACKENDS}")
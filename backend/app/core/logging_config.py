@@ -0,0 +1,64 @@
+"""
+Logging configuration module.
+Sets up queued loguru sinks and sampled, structured per-prediction logging.
+"""
+
+import random
+import sys
+from typing import Any, Optional
+from loguru import logger
+
+from .config import Settings, get_settings
+
+CONSOLE_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
+
+def configure_logging(settings: Optional[Settings] = None) -> None:
+    """
+    Configure the application log sinks.
+
+    Both sinks are enqueued: the calling thread only puts the record on a
+    queue and a background thread does the formatting of the output, disk
+    writes, rotation and compression. The file sink writes one JSON record
+    per line when log_serialize is set, carrying any fields bound with
+    logger.bind().
+
+    Args:
+        settings: Application settings, defaults to get_settings()
+    """
+    settings = settings or get_settings()
+    logger.remove()
+    logger.add(
+        sys.stdout,
+        format=CONSOLE_FORMAT,
+        level=settings.log_level,
+        enqueue=True
+    )
+    if settings.log_file:
+        logger.add(
+            settings.log_file,
+            rotation="100 MB",
+            retention="10 days",
+            compression="zip",
+            level=settings.log_level,
+            serialize=settings.log_serialize,
+            enqueue=True
+        )
+
+
+def log_prediction(message: str, **fields: Any) -> None:
+    """
+    Log one prediction, subject to prediction_log_sample_rate.
+
+    Nothing is formatted for predictions that are not sampled.
+
+    Args:
+        message: Message template, formatted with the fields ("risk={risk_level}")
+        **fields: Structured fields attached to the record
+    """
+    rate = get_settings().prediction_log_sample_rate
+    if rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+        logger.bind(sample_rate=rate).info(message, **fields)
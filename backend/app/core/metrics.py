@@ -0,0 +1,423 @@
+"""
+Metrics module.
+Low-overhead counters and fixed-bucket histograms, merged across server
+workers and rendered in the Prometheus text exposition format.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from loguru import logger
+
+from .config import get_settings
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds, from 50us up to 10s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Row count buckets for batch size distributions
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+class _Metric:
+    """
+    Base class for sharded metrics.
+
+    Every thread updates its own shard (a dict keyed on label values), so
+    the hot path takes no lock; readers sum the shards.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize an empty metric."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[LabelValues, Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict[LabelValues, Any]:
+        """Get the calling thread's shard, registering it on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[LabelValues, Any] = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _shard_items(self) -> Iterable[Tuple[LabelValues, Any]]:
+        """Snapshot of all (labels, value) pairs of all shards."""
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # list() copies the dict in one step, so concurrent inserts are safe
+            yield from list(shard.items())
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """
+        Increment the counter.
+
+        Args:
+            *labels: Label values, in labelnames order
+            amount: Increment
+        """
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def collect(self) -> Dict[LabelValues, float]:
+        """Sum of all shards per label set."""
+        totals: Dict[LabelValues, float] = {}
+        for labels, value in self._shard_items():
+            totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down; the last set() per label set wins.
+
+    Gauges are set by one owner (not per request), so values live in a
+    single dict instead of per-thread shards. Merged across workers by sum.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize an empty gauge."""
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        """
+        Set the gauge.
+
+        Args:
+            value: New value
+            *labels: Label values, in labelnames order
+        """
+        self._values[labels] = float(value)
+
+    def collect(self) -> Dict[LabelValues, float]:
+        """Current value per label set."""
+        return dict(self._values)
+
+
+class _Timer:
+    """Context manager observing elapsed seconds into a histogram."""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: "Histogram", labels: LabelValues):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class Histogram(_Metric):
+    """Histogram with fixed bucket upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = ()
+    ):
+        """Initialize a histogram; an implicit +Inf bucket is appended."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+            *labels: Label values, in labelnames order
+        """
+        shard = self._shard()
+        # Per-bucket counts (last slot is +Inf) followed by the sum
+        state = shard.get(labels)
+        if state is None:
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def time(self, *labels: str) -> _Timer:
+        """Context manager that observes the duration of its block in seconds."""
+        return _Timer(self, labels)
+
+    def collect(self) -> Dict[LabelValues, List[float]]:
+        """Sum of all shards per label set, as [bucket counts..., sum]."""
+        totals: Dict[LabelValues, List[float]] = {}
+        for labels, state in self._shard_items():
+            state = list(state)
+            if labels in totals:
+                totals[labels] = [a + b for a, b in zip(totals[labels], state)]
+            else:
+                totals[labels] = state
+        return totals
+
+
+class MetricsRegistry:
+    """
+    Set of metrics for one worker process.
+
+    With several server workers, each one periodically writes a snapshot of
+    its metrics to metrics_dir as <parent pid>-<pid>.json; render() merges
+    the live local values with the snapshots of sibling workers (same parent
+    pid, still alive), so any worker can answer a /metrics scrape.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._directory: Optional[Path] = None
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = ()
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, buckets, labelnames))
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> Dict[str, List[List[Any]]]:
+        """Collected values of every metric, JSON serializable."""
+        return {
+            name: [[list(labels), value] for labels, value in metric.collect().items()]
+            for name, metric in self._metrics.items()
+        }
+
+    # Snapshot files for cross-worker aggregation
+
+    def _snapshot_path(self) -> Path:
+        return self._directory / f"{os.getppid()}-{os.getpid()}.json"
+
+    def write_snapshot(self) -> None:
+        """Atomically write this worker's snapshot file."""
+        if self._directory is None:
+            return
+        path = self._snapshot_path()
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp_path, path)
+
+    def _sibling_snapshots(self) -> List[Dict[str, List[List[Any]]]]:
+        """Snapshots written by other live workers of the same server."""
+        if self._directory is None:
+            return []
+        snapshots = []
+        for path in self._directory.glob(f"{os.getppid()}-*.json"):
+            pid = int(path.stem.split("-")[1])
+            if pid == os.getpid():
+                continue
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                path.unlink(missing_ok=True)
+                continue
+            except PermissionError:
+                pass
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def start(self, directory: Optional[str] = None, interval_seconds: Optional[float] = None) -> None:
+        """
+        Start publishing snapshots for sibling workers.
+
+        Args:
+            directory: Snapshot directory, defaults to settings; empty disables publishing
+            interval_seconds: Publish interval, defaults to settings
+        """
+        settings = get_settings()
+        directory = settings.metrics_dir if directory is None else directory
+        if not directory or (self._task is not None and not self._task.done()):
+            return
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        interval = interval_seconds or settings.metrics_flush_interval_seconds
+        self._task = asyncio.get_running_loop().create_task(self._publish(interval))
+        logger.info(f"Publishing metrics snapshots to {self._directory} every {interval}s")
+
+    async def stop(self) -> None:
+        """Stop publishing and remove this worker's snapshot file."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._directory is not None:
+            self._snapshot_path().unlink(missing_ok=True)
+
+    async def _publish(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.write_snapshot()
+            except OSError as e:
+                logger.warning(f"Failed to write metrics snapshot: {e}")
+
+    # Exposition
+
+    def render(self) -> str:
+        """
+        Render merged metrics of all workers in Prometheus text format.
+
+        Returns:
+            Exposition text (version 0.0.4)
+        """
+        snapshots = [self.snapshot()] + self._sibling_snapshots()
+        lines = [
+            "# HELP fraud_metrics_workers Number of worker processes merged into this scrape",
+            "# TYPE fraud_metrics_workers gauge",
+            f"fraud_metrics_workers {len(snapshots)}"
+        ]
+
+        for name, metric in self._metrics.items():
+            merged: Dict[LabelValues, Any] = {}
+            for snapshot in snapshots:
+                for labels, value in snapshot.get(name, []):
+                    labels = tuple(labels)
+                    if labels not in merged:
+                        merged[labels] = value
+                    elif isinstance(value, list):
+                        merged[labels] = [a + b for a, b in zip(merged[labels], value)]
+                    else:
+                        merged[labels] += value
+
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels in sorted(merged):
+                label_pairs = [f'{key}="{value}"' for key, value in zip(metric.labelnames, labels)]
+                if isinstance(metric, Histogram):
+                    state = merged[labels]
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float("inf"),), state[:-1]):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(float(bound))
+                        bucket_labels = _labels(label_pairs + [f'le="{le}"'])
+                        lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(label_pairs)} {state[-1]}")
+                    lines.append(f"{name}_count{_labels(label_pairs)} {cumulative}")
+                else:
+                    lines.append(f"{name}{_labels(label_pairs)} {merged[labels]}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(pairs: List[str]) -> str:
+    """Format label pairs as {a="1",b="2"}."""
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+# Global registry and application metrics
+metrics_registry = MetricsRegistry()
+
+stage_duration = metrics_registry.histogram(
+    "fraud_stage_duration_seconds",
+    "Time spent in each stage of the prediction pipeline",
+    LATENCY_BUCKETS,
+    ("stage",)
+)
+request_duration = metrics_registry.histogram(
+    "fraud_request_duration_seconds",
+    "Prediction request handling time (to first byte for streaming responses)",
+    LATENCY_BUCKETS,
+    ("endpoint",)
+)
+requests_total = metrics_registry.counter(
+    "fraud_requests_total",
+    "Prediction requests by endpoint and HTTP status",
+    ("endpoint", "status")
+)
+batch_rows = metrics_registry.histogram(
+    "fraud_batch_rows",
+    "Rows per predict_batch call (source=request), per model call after the cache (source=model) "
+    "and per contributions call (source=explain)",
+    BATCH_SIZE_BUCKETS,
+    ("source",)
+)
+predictions_total = metrics_registry.counter(
+    "fraud_predictions_total",
+    "Scored transactions by risk level",
+    ("risk_level",)
+)
+overload_decisions_total = metrics_registry.counter(
+    "fraud_overload_decisions_total",
+    "Requests not scored by the model due to overload, by reason and outcome (fallback or rejected)",
+    ("reason", "outcome")
+)
+cascade_rows_total = metrics_registry.counter(
+    "fraud_cascade_rows_total",
+    "Rows scored through the scoring cascade, by the stage that answered them",
+    ("stage",)
+)
+consumer_records_total = metrics_registry.counter(
+    "fraud_consumer_records_total",
+    "Records handled by the stream consumer worker, by outcome (scored or invalid)",
+    ("outcome",)
+)
+consumer_lag = metrics_registry.gauge(
+    "fraud_consumer_lag",
+    "Stream consumer backlog after the committed offset, in the source's offset unit (bytes or records)",
+    ("unit",)
+)
+consumer_committed_offset = metrics_registry.gauge(
+    "fraud_consumer_committed_offset",
+    "Last offset committed by the stream consumer worker"
+)
+decision_store_records_total = metrics_registry.counter(
+    "fraud_decision_store_records_total",
+    "Decision store activity by outcome: decisions stored (committed), dropped (write queue full) "
+    "and duplicate transaction_ids answered from the store",
+    ("outcome",)
+)
@@ -1,27 +1,206 @@
 """
 Model loader module.
-Handles loading of ML models, encoders, and metadata at application startup.
+Handles loading of ML models, encoders, and metadata at application startup,
+and hot reloading of retrained artifacts without a restart.
 """
 
+import asyncio
+import hashlib
 import pickle
 import json
 import os
+import shutil
+import threading
+import time
+from collections import deque
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
 from loguru import logger
 
+from . import native_artifacts
+from .cascade import TYPE_COLUMN, ScoringCascade, load_cascade
+from .config import get_settings
+from .inference_backends import InferenceBackend, XGBoostNativeBackend, create_backend, onnx_model_path
+from .tree_ensemble import CompiledTreeEnsemble, parity_probe, verify_parity
+
+
+class ReloadInProgressError(RuntimeError):
+    """Raised when a reload is requested while another one is running."""
+
+
+class ModelArtifacts:
+    """
+    One fully loaded, immutable set of model artifacts.
+    
+    A request takes a reference to the active set once and uses it for all
+    of its steps, so swapping in a new set never mixes a new encoder with an
+    old model mid-request; the old set stays alive until its last user is done.
+    """
+    
+    def __init__(
+        self,
+        model: Any,
+        encoder: Any,
+        metadata: Dict[str, Any],
+        feature_importance: Dict[str, Any],
+        fingerprints: Dict[str, str],
+        compiled_model: Optional[CompiledTreeEnsemble] = None,
+        source: Optional[Dict[str, str]] = None
+    ):
+        """Initialize from loaded objects; use ModelLoader.load_artifacts() to build one."""
+        self.model = model
+        self.encoder = encoder
+        self.metadata = metadata
+        self.feature_importance = feature_importance
+        self.compiled_model = compiled_model
+        self.cascade: Optional[ScoringCascade] = None
+        self.backend: InferenceBackend = XGBoostNativeBackend(model)
+        self.fingerprints = MappingProxyType(dict(fingerprints))
+        self.source = MappingProxyType(dict(source or {}))
+        self.loaded_at = datetime.utcnow()
+        
+        # Content fingerprint of model + encoder; anything derived from model
+        # outputs (e.g. the prediction cache) is keyed on it
+        self.version = self.fingerprint_version(fingerprints["model"], fingerprints.get("encoder", ""))
+        # Fingerprint of every artifact file, metadata and feature importance
+        # included; a reload swaps in a new set whenever it changes
+        self.content_version = hashlib.sha256(
+            "".join(fingerprints[kind] for kind in sorted(fingerprints)).encode()
+        ).hexdigest()[:16]
+        
+        self._build_type_table()
+        
+        # Feature matrix columns, in order
+        self.feature_names: List[str] = list(
+            model.get_booster().feature_names or metadata.get("features") or []
+        )
+    
+    @staticmethod
+    def fingerprint_version(model_hash: str, encoder_hash: str) -> str:
+        """Version string of a model/encoder pair, from the sha256 of their source files."""
+        return hashlib.sha256((model_hash + encoder_hash).encode()).hexdigest()[:16]
+    
+    def _build_type_table(self) -> None:
+        """
+        Build a frozen type -> code lookup from the encoder.
+        
+        The table is checked against the encoder's own transform so the
+        fast path can never disagree with the pickled LabelEncoder.
+        """
+        classes = [str(name) for name in self.encoder.classes_]
+        encoded = self.encoder.transform(self.encoder.classes_)
+        codes = {name: int(code) for name, code in zip(classes, encoded)}
+        
+        if sorted(codes.values()) != list(range(len(classes))):
+            raise ValueError(f"Encoder produced non-contiguous codes: {codes}")
+        
+        self.type_codes: Mapping[str, int] = MappingProxyType(codes)
+        self._type_classes = np.array(classes)
+        self._type_code_table = np.array([codes[name] for name in classes], dtype=np.float32)
+        self._type_classes.setflags(write=False)
+        self._type_code_table.setflags(write=False)
+    
+    def encode_types(self, types: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized transaction type encoding for batches.
+        
+        Args:
+            types: Transaction type names
+        
+        Returns:
+            Tuple of (float32 codes, boolean mask of recognised types);
+            unrecognised types get code 0 and False in the mask
+        """
+        values = np.asarray(types, dtype=str)
+        positions = np.searchsorted(self._type_classes, values)
+        positions = np.minimum(positions, len(self._type_classes) - 1)
+        valid = self._type_classes[positions] == values
+        codes = self._type_code_table[positions]
+        codes[~valid] = 0
+        return codes, valid
+    
+    # Base feature values of the synthetic warmup rows
+    WARMUP_VALUES = {
+        "step": 1,
+        "amount": 1000.0,
+        "oldbalanceOrg": 5000.0,
+        "newbalanceOrig": 4000.0,
+        "oldbalanceDest": 0.0,
+        "newbalanceDest": 1000.0,
+        "type_encoded": 0
+    }
+    
+    def warmup(self) -> float:
+        """
+        Score one synthetic row per transaction type through every evaluator.
+        
+        Pays first-call costs before the set takes traffic and checks that it
+        produces usable probabilities.
+        
+        Returns:
+            Warmup time in milliseconds
+        
+        Raises:
+            ValueError: If an evaluator returns probabilities outside [0, 1]
+        """
+        start = time.perf_counter()
+        codes, _ = self.encode_types(list(self.type_codes))
+        # Columns without a warmup value (velocity features) are left missing
+        row = np.array(
+            [self.WARMUP_VALUES.get(name, np.nan) for name in self.feature_names or self.WARMUP_VALUES],
+            dtype=np.float32
+        )
+        rows = np.tile(row, (len(codes), 1))
+        rows[:, TYPE_COLUMN] = codes
+        
+        self.backend.warmup(rows)
+        evaluators = [("model", self.model)]
+        if self.compiled_model is not None:
+            evaluators.append(("compiled model", self.compiled_model))
+        for name, evaluator in evaluators:
+            probabilities = np.asarray(evaluator.predict_proba(rows))[:, 1]
+            if not np.all((probabilities >= 0) & (probabilities <= 1)):
+                raise ValueError(f"Warmup of {name} produced invalid probabilities: {probabilities}")
+        if self.cascade is not None and rows.shape[1] == len(self.cascade.feature_names):
+            probabilities, _ = self.cascade.route(rows)
+            answered = probabilities[~np.isnan(probabilities)]
+            if not np.all((answered >= 0) & (answered <= 1)):
+                raise ValueError(f"Warmup of the scoring cascade produced invalid probabilities: {answered}")
+        return (time.perf_counter() - start) * 1000
+    
+    def info(self) -> Dict[str, Any]:
+        """Summary of this artifact set for status endpoints and logs."""
+        return {
+            "version": self.version,
+            "content_version": self.content_version,
+            "loaded_at": self.loaded_at.isoformat(),
+            "model_version": self.metadata.get("model_version"),
+            "compiled": self.compiled_model is not None,
+            "backend": self.backend.name,
+            "cascade": self.cascade.fit_id if self.cascade is not None else None,
+            "format": self.source.get("format"),
+            "source": dict(self.source)
+        }
+
 
 class ModelLoader:
     """
     Singleton class to load and manage ML models and artifacts.
-    Models are loaded once at application startup for efficiency.
+    
+    The active ModelArtifacts set is replaced with a single reference
+    assignment, so readers always see either the old or the new set.
     """
     
+    # Number of previously activated versions remembered for /model/info
+    HISTORY_SIZE = 10
+    
     _instance = None
-    _model = None
-    _encoder = None
-    _metadata = None
-    _feature_importance = None
+    _active: Optional[ModelArtifacts] = None
+    _history: deque = deque(maxlen=HISTORY_SIZE)
+    _reload_lock = threading.Lock()
     
     def __new__(cls):
         """Implement singleton pattern."""
@@ -56,8 +235,13 @@ class ModelLoader:
         
         return file_path
     
-    def load_model(self, model_path: str) -> None:
-        """Load the XGBoost model from pickle file."""
+    def load_model(self, model_path: str) -> Tuple[Any, str]:
+        """
+        Load the XGBoost model from pickle file.
+        
+        Returns:
+            Tuple of (model, sha256 of the file)
+        """
         try:
             resolved_path = self._resolve_path(model_path)
             
@@ -69,10 +253,12 @@ class ModelLoader:
                 raise FileNotFoundError(f"Model file not found: {resolved_path}")
             
             with open(resolved_path, 'rb') as f:
-                self._model = pickle.load(f)
+                data = f.read()
+            model = pickle.loads(data)
             
             logger.info(f"✅ Model loaded successfully from {resolved_path}")
-            logger.info(f"   Model type: {type(self._model).__name__}")
+            logger.info(f"   Model type: {type(model).__name__}")
+            return model, hashlib.sha256(data).hexdigest()
         except FileNotFoundError:
             raise
         except Exception as e:
@@ -80,8 +266,162 @@ class ModelLoader:
             logger.exception("Full traceback:")
             raise RuntimeError(f"Model loading failed: {e}")
     
-    def load_encoder(self, encoder_path: str) -> None:
-        """Load the label encoder from pickle file."""
+    def compile_model(self, model: Any) -> Optional[CompiledTreeEnsemble]:
+        """
+        Compile a loaded booster into a flat-array evaluator.
+        
+        The compiled evaluator is checked against the model's predict_proba
+        and only returned if the two agree; failures are logged, not raised,
+        so serving falls back to the original model.
+        """
+        try:
+            compiled = CompiledTreeEnsemble.from_booster(model)
+            max_diff = verify_parity(compiled, model)
+            logger.info(f"✅ Compiled evaluator verified (max diff {max_diff:.2e})")
+            return compiled
+        except Exception as e:
+            logger.warning(f"⚠️ Tree ensemble compilation skipped: {e}")
+            return None
+    
+    def create_backend(self, artifacts: ModelArtifacts) -> InferenceBackend:
+        """
+        Build the configured inference backend for an artifact set.
+        
+        An ONNX Runtime backend is checked against the model's predict_proba.
+        If it cannot be used (package missing, no export for this model
+        version, parity failure) that is logged and the native XGBoost
+        backend serves instead, so a missing export never blocks a load.
+        """
+        settings = get_settings()
+        threads = settings.xgboost_threads
+        if settings.inference_backend != "onnxruntime":
+            return create_backend(settings.inference_backend, artifacts.model, threads)
+        
+        try:
+            backend = create_backend(
+                "onnxruntime", artifacts.model, threads,
+                onnx_path=onnx_model_path(settings.onnx_models_dir, artifacts.version)
+            )
+            probe = parity_probe(artifacts.compiled_model or CompiledTreeEnsemble.from_booster(artifacts.model))
+            max_diff = float(np.max(np.abs(backend.predict(probe) - artifacts.model.predict_proba(probe)[:, 1])))
+            if max_diff > 1e-5:
+                raise ValueError(f"ONNX model deviates from the XGBoost model by {max_diff:.2e}")
+            logger.info(f"✅ ONNX Runtime backend verified (max diff {max_diff:.2e})")
+            return backend
+        except ImportError as e:
+            logger.warning(f"⚠️ ONNX Runtime backend not used, install onnxruntime ({e}); using xgboost")
+        except FileNotFoundError as e:
+            logger.warning(f"⚠️ {e}, export it with: python -m app.cli convert --onnx; using xgboost")
+        except Exception as e:
+            logger.warning(f"⚠️ ONNX Runtime backend not used: {e}; using xgboost")
+        return create_backend("xgboost", artifacts.model, threads)
+    
+    def load_cascade(self, artifacts: ModelArtifacts, directory: Path) -> Optional[ScoringCascade]:
+        """
+        Load the scoring cascade fitted for an artifact set.
+        
+        A missing cascade, or one fitted for another model version, is logged
+        and skipped so the set is served by the full model alone.
+        
+        Returns:
+            The cascade, or None
+        """
+        directory = Path(directory)
+        try:
+            cascade = load_cascade(
+                directory,
+                artifacts.version,
+                artifacts.feature_names,
+                dict(artifacts.type_codes),
+                get_settings().compiled_ensemble_max_rows
+            )
+        except FileNotFoundError:
+            logger.warning(f"⚠️ No scoring cascade in {directory}, fit one with: python -m app.cli cascade-fit")
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Scoring cascade in {directory} not used: {e}")
+            return None
+        
+        logger.info(
+            f"✅ Scoring cascade {cascade.fit_id} loaded: bounded types {list(cascade.bounded_types)}, "
+            f"shallow cutoffs {cascade.low_cutoff:.4f} / {cascade.high_cutoff:.4f}"
+        )
+        return cascade
+    
+    def _file_sha256(self, path: str, kind: str) -> str:
+        """sha256 of an artifact file, without deserializing it."""
+        resolved_path = self._resolve_path(path)
+        if not resolved_path.exists():
+            logger.error(f"❌ {kind} file not found at: {resolved_path}")
+            raise FileNotFoundError(f"{kind} file not found: {resolved_path}")
+        
+        digest = hashlib.sha256()
+        with open(resolved_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def native_artifact_dir(model_hash: str, encoder_hash: str) -> Path:
+        """Directory of the native conversion of a model/encoder pickle pair."""
+        return get_settings().native_artifacts_dir / ModelArtifacts.fingerprint_version(model_hash, encoder_hash)
+    
+    def load_native(self, model_hash: str, encoder_hash: str) -> Optional[Tuple[Any, Any]]:
+        """
+        Load the cached native conversion of a pickle pair.
+        
+        A stale or corrupt conversion is logged and removed so it gets
+        written again; the caller falls back to the pickles.
+        
+        Returns:
+            Tuple of (model, encoder), or None if there is no usable conversion
+        """
+        directory = self.native_artifact_dir(model_hash, encoder_hash)
+        if not (directory / native_artifacts.MANIFEST_FILE).exists():
+            return None
+        try:
+            model, encoder, manifest = native_artifacts.load(
+                directory, {"model": model_hash, "encoder": encoder_hash}
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Discarding native artifact {directory}: {e}")
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+        
+        logger.info(f"✅ Native model loaded from {directory}")
+        logger.info(f"   Converted {manifest['created_at']} with XGBoost {manifest['xgboost_version']}")
+        logger.info(f"   Classes: {list(encoder.classes_)}")
+        return model, encoder
+    
+    def convert_native(self, model: Any, encoder: Any, model_hash: str, encoder_hash: str) -> Optional[Path]:
+        """
+        Write the native conversion of a loaded pickle pair to the cache.
+        
+        Failures (e.g. a read-only models directory) are logged, not raised.
+        
+        Returns:
+            The artifact directory, or None if the conversion failed
+        """
+        directory = self.native_artifact_dir(model_hash, encoder_hash)
+        try:
+            start = time.perf_counter()
+            native_artifacts.convert(
+                model, encoder, directory, {"model": model_hash, "encoder": encoder_hash}
+            )
+            native_artifacts.prune(directory.parent, keep=self.HISTORY_SIZE)
+        except Exception as e:
+            logger.warning(f"⚠️ Native artifact conversion skipped: {e}")
+            return None
+        logger.info(f"💾 Native artifact written to {directory} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return directory
+    
+    def load_encoder(self, encoder_path: str) -> Tuple[Any, str]:
+        """
+        Load the label encoder from pickle file.
+        
+        Returns:
+            Tuple of (encoder, sha256 of the file)
+        """
         try:
             resolved_path = self._resolve_path(encoder_path)
             
@@ -90,9 +430,12 @@ class ModelLoader:
                 raise FileNotFoundError(f"Encoder file not found: {resolved_path}")
             
             with open(resolved_path, 'rb') as f:
-                self._encoder = pickle.load(f)
+                data = f.read()
+            encoder = pickle.loads(data)
             
             logger.info(f"✅ Encoder loaded successfully from {resolved_path}")
+            logger.info(f"   Classes: {list(encoder.classes_)}")
+            return encoder, hashlib.sha256(data).hexdigest()
         except FileNotFoundError:
             raise
         except Exception as e:
@@ -100,7 +443,7 @@ class ModelLoader:
             logger.exception("Full traceback:")
             raise RuntimeError(f"Encoder loading failed: {e}")
     
-    def load_metadata(self, metadata_path: str) -> None:
+    def load_metadata(self, metadata_path: str) -> Dict[str, Any]:
         """Load model metadata from JSON file."""
         try:
             resolved_path = self._resolve_path(metadata_path)
@@ -110,9 +453,10 @@ class ModelLoader:
                 raise FileNotFoundError(f"Metadata file not found: {resolved_path}")
             
             with open(resolved_path, 'r') as f:
-                self._metadata = json.load(f)
+                metadata = json.load(f)
             
             logger.info(f"✅ Metadata loaded successfully from {resolved_path}")
+            return metadata
         except FileNotFoundError:
             raise
         except Exception as e:
@@ -120,7 +464,7 @@ class ModelLoader:
             logger.exception("Full traceback:")
             raise RuntimeError(f"Metadata loading failed: {e}")
     
-    def load_feature_importance(self, feature_importance_path: str) -> None:
+    def load_feature_importance(self, feature_importance_path: str) -> Dict[str, Any]:
         """Load feature importance from JSON file."""
         try:
             resolved_path = self._resolve_path(feature_importance_path)
@@ -129,10 +473,11 @@ class ModelLoader:
                 logger.error(f"❌ Feature importance file not found at: {resolved_path}")
                 raise FileNotFoundError(f"Feature importance file not found: {resolved_path}")
             
-            with open(feature_importance_path, 'r') as f:
-                self._feature_importance = json.load(f)
+            with open(resolved_path, 'r') as f:
+                feature_importance = json.load(f)
             
             logger.info(f"✅ Feature importance loaded from {resolved_path}")
+            return feature_importance
         except FileNotFoundError:
             raise
         except Exception as e:
@@ -140,58 +485,315 @@ class ModelLoader:
             logger.exception("Full traceback:")
             raise RuntimeError(f"Feature importance loading failed: {e}")
     
+    def load_artifacts(
+        self,
+        model_path: str,
+        encoder_path: str,
+        metadata_path: str,
+        feature_importance_path: str,
+        compile_trees: bool = False,
+        cascade_dir: Optional[Path] = None
+    ) -> ModelArtifacts:
+        """
+        Load a complete artifact set without activating it.
+        
+        The native conversion of the model and encoder pickles is preferred
+        when one exists for their exact contents; otherwise the pickles are
+        loaded and, if enabled, converted for the next start.
+        
+        Args:
+            cascade_dir: Directory of a scoring cascade to attach, None for none
+        
+        Returns:
+            New ModelArtifacts
+        """
+        settings = get_settings()
+        native = None
+        if settings.native_artifacts_enabled:
+            model_hash = self._file_sha256(model_path, "Model")
+            encoder_hash = self._file_sha256(encoder_path, "Encoder")
+            native = self.load_native(model_hash, encoder_hash)
+        
+        if native is not None:
+            model, encoder = native
+            artifact_format = "native"
+        else:
+            model, model_hash = self.load_model(model_path)
+            encoder, encoder_hash = self.load_encoder(encoder_path)
+            artifact_format = "pickle"
+            if settings.native_artifacts_enabled and settings.native_artifacts_auto_convert:
+                self.convert_native(model, encoder, model_hash, encoder_hash)
+        
+        artifacts = ModelArtifacts(
+            model=model,
+            encoder=encoder,
+            metadata=self.load_metadata(metadata_path),
+            feature_importance=self.load_feature_importance(feature_importance_path),
+            fingerprints={
+                "model": model_hash,
+                "encoder": encoder_hash,
+                "metadata": self._file_sha256(metadata_path, "Metadata"),
+                "feature_importance": self._file_sha256(feature_importance_path, "Feature importance")
+            },
+            compiled_model=self.compile_model(model) if compile_trees else None,
+            source={
+                "format": artifact_format,
+                "model_path": str(model_path),
+                "encoder_path": str(encoder_path),
+                "metadata_path": str(metadata_path),
+                "feature_importance_path": str(feature_importance_path)
+            }
+        )
+        logger.info(f"   Type codes: {dict(artifacts.type_codes)}")
+        artifacts.backend = self.create_backend(artifacts)
+        logger.info(f"   Inference backend: {artifacts.backend.info()}")
+        if cascade_dir is not None:
+            artifacts.cascade = self.load_cascade(artifacts, cascade_dir)
+        return artifacts
+    
+    def activate(self, artifacts: ModelArtifacts) -> Optional[ModelArtifacts]:
+        """
+        Atomically make an artifact set the active one.
+        
+        Args:
+            artifacts: Loaded (and ideally warmed up) artifact set
+        
+        Returns:
+            The previously active set, or None
+        """
+        previous = self._active
+        self._active = artifacts
+        self._history.append(artifacts.info())
+        logger.info(
+            f"🔁 Active model version {artifacts.version}"
+            + (f" (was {previous.version})" if previous is not None else "")
+        )
+        return previous
+    
     def load_all(
         self,
         model_path: str,
         encoder_path: str,
         metadata_path: str,
-        feature_importance_path: str
+        feature_importance_path: str,
+        compile_trees: bool = False
     ) -> None:
-        """Load all model artifacts."""
+        """Load, warm up and activate all model artifacts."""
         logger.info("🚀 Loading all model artifacts...")
-        self.load_model(model_path)
-        self.load_encoder(encoder_path)
-        self.load_metadata(metadata_path)
-        self.load_feature_importance(feature_importance_path)
-        logger.info("✅ All artifacts loaded successfully!")
+        start = time.perf_counter()
+        settings = get_settings()
+        artifacts = self.load_artifacts(
+            model_path, encoder_path, metadata_path, feature_importance_path, compile_trees,
+            cascade_dir=settings.cascade_dir if settings.cascade_enabled else None
+        )
+        logger.info(f"🔥 Warmup took {artifacts.warmup():.1f} ms")
+        self.activate(artifacts)
+        logger.info(
+            f"✅ All artifacts loaded successfully in {(time.perf_counter() - start) * 1000:.0f} ms "
+            f"({artifacts.source['format']} format)"
+        )
+    
+    def reload(self, compile_trees: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Load the configured artifacts in the calling thread, warm them up and
+        swap them in. Requests already running keep the set they started with.
+        
+        Nothing changes if loading or warmup fails, or if the artifact files
+        on disk (model, encoder, metadata and feature importance) are
+        identical to the active set's and so is its scoring cascade.
+        
+        Args:
+            compile_trees: Compile the tree ensemble, defaults to settings
+        
+        Returns:
+            Dictionary with previous/active version, whether a swap happened
+            and the reload duration
+        
+        Raises:
+            ReloadInProgressError: If another reload is running
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            raise ReloadInProgressError("A model reload is already in progress")
+        try:
+            settings = get_settings()
+            if compile_trees is None:
+                compile_trees = settings.compile_tree_ensemble
+            start = time.perf_counter()
+            previous = self._active
+            
+            logger.info("🔄 Reloading model artifacts...")
+            artifacts = self.load_artifacts(
+                model_path=settings.model_path,
+                encoder_path=settings.encoder_path,
+                metadata_path=settings.metadata_path,
+                feature_importance_path=settings.feature_importance_path,
+                compile_trees=compile_trees,
+                cascade_dir=settings.cascade_dir if settings.cascade_enabled else None
+            )
+            
+            swapped = (
+                previous is None
+                or artifacts.content_version != previous.content_version
+                or artifacts.info()["cascade"] != previous.info()["cascade"]
+            )
+            if swapped:
+                logger.info(f"🔥 Warmup took {artifacts.warmup():.1f} ms")
+                self.activate(artifacts)
+            else:
+                logger.info(f"Model artifacts unchanged (version {artifacts.version}), keeping active set")
+            
+            return {
+                "previous_version": previous.version if previous is not None else None,
+                "active_version": self._active.version,
+                "reloaded": swapped,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
+        finally:
+            self._reload_lock.release()
+    
+    @property
+    def artifacts(self) -> ModelArtifacts:
+        """Get the active artifact set; hold on to it for the whole request."""
+        artifacts = self._active
+        if artifacts is None:
+            raise RuntimeError("Model not loaded. Call load_all() first.")
+        return artifacts
+    
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        """Info of recently activated versions, oldest first."""
+        return list(self._history)
     
     @property
     def model(self):
-        """Get the loaded model."""
-        if self._model is None:
-            raise RuntimeError("Model not loaded. Call load_model() first.")
-        return self._model
+        """Get the active model."""
+        return self.artifacts.model
+    
+    @property
+    def compiled_model(self) -> Optional[CompiledTreeEnsemble]:
+        """Get the active compiled evaluator, or None if the model was not compiled."""
+        return self._active.compiled_model if self._active is not None else None
+    
+    @property
+    def artifact_version(self) -> str:
+        """Content fingerprint of the active model and encoder."""
+        return self.artifacts.version
     
     @property
     def encoder(self):
-        """Get the loaded encoder."""
-        if self._encoder is None:
-            raise RuntimeError("Encoder not loaded. Call load_encoder() first.")
-        return self._encoder
+        """Get the active encoder."""
+        return self.artifacts.encoder
+    
+    @property
+    def type_codes(self) -> Mapping[str, int]:
+        """Get the frozen transaction type -> code lookup."""
+        return self.artifacts.type_codes
+    
+    def encode_types(self, types: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized transaction type encoding with the active encoder."""
+        return self.artifacts.encode_types(types)
     
     @property
     def metadata(self) -> Dict[str, Any]:
-        """Get the loaded metadata."""
-        if self._metadata is None:
-            raise RuntimeError("Metadata not loaded. Call load_metadata() first.")
-        return self._metadata
+        """Get the active metadata."""
+        return self.artifacts.metadata
     
     @property
     def feature_importance(self) -> Dict[str, Any]:
-        """Get the loaded feature importance."""
-        if self._feature_importance is None:
-            raise RuntimeError("Feature importance not loaded.")
-        return self._feature_importance
+        """Get the active feature importance."""
+        return self.artifacts.feature_importance
     
     def is_loaded(self) -> bool:
-        """Check if all artifacts are loaded."""
-        return all([
-            self._model is not None,
-            self._encoder is not None,
-            self._metadata is not None,
-            self._feature_importance is not None
-        ])
+        """Check if an artifact set is active."""
+        return self._active is not None
+
+
+class ArtifactWatcher:
+    """
+    Polls the configured artifact files and hot reloads when they change.
+    
+    A change is only acted on once the files have looked the same for two
+    consecutive polls, so a reload never starts while a file is still being
+    copied. Each server worker runs its own watcher, which makes this the way
+    to roll a new model out to every worker.
+    """
+    
+    def __init__(self, loader: ModelLoader):
+        """Initialize the watcher; call start() from a running event loop."""
+        self.loader = loader
+        self.interval_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    def _signature() -> Tuple[Optional[Tuple[int, int]], ...]:
+        """(mtime, size) of every configured artifact file, None if missing."""
+        settings = get_settings()
+        signature = []
+        for path in (
+            settings.model_path,
+            settings.encoder_path,
+            settings.metadata_path,
+            settings.feature_importance_path
+        ):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+    
+    def start(self, interval_seconds: Optional[float] = None) -> None:
+        """
+        Start polling on the running event loop.
+        
+        Args:
+            interval_seconds: Poll interval, defaults to settings
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self.interval_seconds = interval_seconds or get_settings().artifact_watch_interval_seconds
+        self._task = asyncio.get_running_loop().create_task(self._watch())
+        logger.info(f"👀 Watching model artifacts every {self.interval_seconds}s")
+    
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _watch(self) -> None:
+        """Polling loop."""
+        loop = asyncio.get_running_loop()
+        current = self._signature()
+        candidate = None
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            signature = self._signature()
+            if signature == current:
+                candidate = None
+                continue
+            if signature != candidate or None in signature:
+                # Changed since the last poll (or a file is missing): wait until it settles
+                candidate = signature
+                continue
+            
+            logger.info("Model artifact files changed on disk")
+            try:
+                await loop.run_in_executor(None, self.loader.reload)
+            except ReloadInProgressError:
+                continue
+            except Exception as e:
+                # Keep serving the active set; retry once the files change again
+                logger.error(f"❌ Hot reload failed, keeping active model: {e}")
+            current = signature
+            candidate = None
 
 
-# Global instance
+# Global instances
 model_loader = ModelLoader()
+artifact_watcher = ArtifactWatcher(model_loader)
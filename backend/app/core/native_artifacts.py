@@ -0,0 +1,233 @@
+"""
+Native model artifact module.
+Converts the pickled XGBClassifier and LabelEncoder into XGBoost's own UBJSON
+model format plus a JSON manifest, and loads them back without unpickling.
+
+A converted artifact lives in a directory named after the hashes of the
+pickles it came from, so it is only ever used for exactly those files.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import xgboost as xgb
+
+from .tree_ensemble import CompiledTreeEnsemble, parity_probe
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+BOOSTER_FILE = "model.ubj"
+
+
+class TypeEncoder:
+    """
+    Transaction type encoder compatible with sklearn's LabelEncoder.
+
+    Codes are positions in the sorted class list, exactly as LabelEncoder
+    assigns them, so a converted artifact encodes the same way as the pickle.
+    """
+
+    def __init__(self, classes: Sequence[str]):
+        """
+        Initialize from the encoder classes.
+
+        Raises:
+            ValueError: If the classes are not sorted and unique
+        """
+        self.classes_ = np.array([str(name) for name in classes])
+        if len(self.classes_) == 0 or not np.all(self.classes_[:-1] < self.classes_[1:]):
+            raise ValueError(f"Encoder classes must be sorted and unique: {list(self.classes_)}")
+
+    def transform(self, values: Sequence[str]) -> np.ndarray:
+        """
+        Encode values.
+
+        Raises:
+            ValueError: If a value is not one of the classes
+        """
+        values = np.asarray(values, dtype=str)
+        positions = np.minimum(np.searchsorted(self.classes_, values), len(self.classes_) - 1)
+        unseen = self.classes_[positions] != values
+        if unseen.any():
+            raise ValueError(f"y contains previously unseen labels: {sorted(set(values[unseen]))}")
+        return positions.astype(np.int64)
+
+    def inverse_transform(self, codes: Sequence[int]) -> np.ndarray:
+        """Decode codes back to class names."""
+        return self.classes_[np.asarray(codes, dtype=np.int64)]
+
+
+class BoosterClassifier:
+    """
+    Binary classifier over a bare xgboost.Booster.
+
+    Exposes the subset of the XGBClassifier interface the service uses:
+    predict_proba(), get_booster() and set_params(n_jobs=...).
+    """
+
+    def __init__(self, booster: xgb.Booster, iteration_range: Tuple[int, int] = (0, 0)):
+        """Wrap a loaded booster; iteration_range (0, 0) uses all trees."""
+        self.booster = booster
+        self.iteration_range = tuple(iteration_range)
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Class probabilities as an (n_rows, 2) array, like XGBClassifier."""
+        positive = self.booster.inplace_predict(features, iteration_range=self.iteration_range)
+        return np.vstack((1 - positive, positive)).transpose()
+
+    def get_booster(self) -> xgb.Booster:
+        """Get the underlying booster."""
+        return self.booster
+
+    def set_params(self, **params: Any) -> "BoosterClassifier":
+        """Set booster parameters; n_jobs maps to nthread as in XGBClassifier."""
+        if "n_jobs" in params:
+            params["nthread"] = params.pop("n_jobs")
+        self.booster.set_param(params)
+        return self
+
+
+def model_iteration_range(model: Any) -> Tuple[int, int]:
+    """Trees XGBClassifier.predict_proba uses: up to best_iteration if early stopping ran."""
+    try:
+        return (0, int(model.best_iteration) + 1)
+    except AttributeError:
+        return (0, 0)
+
+
+def convert(
+    model: Any,
+    encoder: Any,
+    output_dir: Path,
+    source_hashes: Dict[str, str],
+    tolerance: float = 1e-6
+) -> Dict[str, Any]:
+    """
+    Write a model and encoder as a native artifact directory.
+
+    The directory is written next to its final location and renamed into
+    place, so readers never see a partial artifact; an existing directory is
+    left as it is. The converted model is checked against the original's
+    predict_proba before it is published.
+
+    Args:
+        model: Loaded XGBClassifier (or anything exposing get_booster())
+        encoder: Loaded LabelEncoder
+        output_dir: Artifact directory to create
+        source_hashes: sha256 of the source files ({"model": ..., "encoder": ...})
+        tolerance: Maximum allowed probability difference against the original
+
+    Returns:
+        The written manifest
+
+    Raises:
+        ValueError: If the converted model disagrees with the original
+    """
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    iteration_range = model_iteration_range(model)
+    type_encoder = TypeEncoder(encoder.classes_)
+    if not np.array_equal(type_encoder.transform(encoder.classes_), encoder.transform(encoder.classes_)):
+        raise ValueError("Encoder codes are not LabelEncoder positions")
+
+    booster_data = bytes(booster.save_raw(raw_format="ubj"))
+    converted = BoosterClassifier(_load_booster(booster_data), iteration_range)
+    try:
+        probe = parity_probe(CompiledTreeEnsemble.from_booster(booster))
+    except Exception:
+        # Tree layouts the compiler does not handle: compare on random rows
+        probe = np.random.default_rng(0).uniform(0, 1e6, (2048, booster.num_features())).astype(np.float32)
+    max_diff = float(np.max(np.abs(
+        converted.predict_proba(probe)[:, 1] - np.asarray(model.predict_proba(probe))[:, 1]
+    )))
+    if max_diff > tolerance:
+        raise ValueError(f"Converted model differs from the original by {max_diff:.2e}")
+
+    config = json.loads(booster.save_config())
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "xgboost_version": xgb.__version__,
+        "source": {f"{name}_sha256": digest for name, digest in source_hashes.items()},
+        "booster_file": BOOSTER_FILE,
+        "booster_sha256": hashlib.sha256(booster_data).hexdigest(),
+        "objective": config["learner"]["objective"]["name"],
+        "iteration_range": list(iteration_range),
+        "feature_names": list(booster.feature_names or []),
+        "encoder_classes": type_encoder.classes_.tolist(),
+        "parity_max_diff": max_diff
+    }
+
+    output_dir = Path(output_dir)
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".converting-", dir=output_dir.parent))
+    try:
+        (staging / BOOSTER_FILE).write_bytes(booster_data)
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+        try:
+            os.replace(staging, output_dir)
+        except OSError:
+            # Another worker published the same conversion first
+            if not (output_dir / MANIFEST_FILE).exists():
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return manifest
+
+
+def load(
+    directory: Path,
+    source_hashes: Optional[Dict[str, str]] = None
+) -> Tuple[BoosterClassifier, TypeEncoder, Dict[str, Any]]:
+    """
+    Load a native artifact directory.
+
+    Args:
+        directory: Directory written by convert()
+        source_hashes: Expected source file hashes; a manifest made from other files is rejected
+
+    Returns:
+        Tuple of (model, encoder, manifest)
+
+    Raises:
+        FileNotFoundError: If the directory has no manifest
+        ValueError: If the artifact is stale, from another format version or corrupt
+    """
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST_FILE).read_text())
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported native artifact format: {manifest.get('format_version')}")
+    if source_hashes is not None:
+        expected = {f"{name}_sha256": digest for name, digest in source_hashes.items()}
+        if manifest.get("source") != expected:
+            raise ValueError("Native artifact was converted from different source files")
+
+    booster_data = (directory / manifest["booster_file"]).read_bytes()
+    if hashlib.sha256(booster_data).hexdigest() != manifest["booster_sha256"]:
+        raise ValueError(f"Native model file is corrupt: {directory / manifest['booster_file']}")
+
+    model = BoosterClassifier(_load_booster(booster_data), manifest["iteration_range"])
+    return model, TypeEncoder(manifest["encoder_classes"]), manifest
+
+
+def prune(parent: Path, keep: int) -> None:
+    """Remove all but the keep most recently written artifact directories under parent."""
+    directories = sorted(
+        (path for path in Path(parent).iterdir() if (path / MANIFEST_FILE).exists()),
+        key=lambda path: (path / MANIFEST_FILE).stat().st_mtime,
+        reverse=True
+    )
+    for stale in directories[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def _load_booster(data: bytes) -> xgb.Booster:
+    booster = xgb.Booster()
+    booster.load_model(bytearray(data))
+    return booster
@@ -0,0 +1,93 @@
+"""
+Process memory module.
+Reports resident, proportional and unique memory of the server processes,
+to check that pre-forked workers share the model pages copy-on-write.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROC = Path("/proc")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def process_memory(pid: Optional[int] = None) -> Optional[Dict[str, float]]:
+    """
+    Memory of one process from /proc/<pid>/smaps_rollup (Linux only).
+
+    USS (unique set size) is the memory only this process uses, i.e. what
+    killing it would free; PSS charges each shared page to its sharers in
+    equal parts, so PSS summed over processes is their real total.
+
+    Args:
+        pid: Process id, defaults to the current process
+
+    Returns:
+        rss_mb, pss_mb, uss_mb, shared_mb and swap_mb, or None if unavailable
+    """
+    pid = os.getpid() if pid is None else pid
+    try:
+        text = (PROC / str(pid) / "smaps_rollup").read_text()
+    except OSError:
+        return None
+
+    kb: Dict[str, int] = {}
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) >= 2 and fields[0].endswith(":"):
+            kb[fields[0][:-1]] = int(fields[1])
+    uss = kb.get("Private_Clean", 0) + kb.get("Private_Dirty", 0)
+    return {
+        "rss_mb": round(kb.get("Rss", 0) / 1024, 1),
+        "pss_mb": round(kb.get("Pss", 0) / 1024, 1),
+        "uss_mb": round(uss / 1024, 1),
+        "shared_mb": round((kb.get("Rss", 0) - uss) / 1024, 1),
+        "swap_mb": round(kb.get("Swap", 0) / 1024, 1)
+    }
+
+
+def child_pids(pid: int) -> List[int]:
+    """Ids of the direct children of a process."""
+    children = []
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields after it are fixed
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        if parent == pid:
+            children.append(int(entry.name))
+    return sorted(children)
+
+
+def server_memory(master_pid: int) -> List[Dict[str, float]]:
+    """
+    Memory of a pre-fork server: the master followed by each worker.
+
+    Args:
+        master_pid: Process id of the server master (e.g. the gunicorn arbiter)
+
+    Returns:
+        One dictionary per process with pid, role and the process_memory() fields
+    """
+    report = []
+    for role, pid in [("master", master_pid)] + [("worker", child) for child in child_pids(master_pid)]:
+        memory = process_memory(pid)
+        if memory is not None:
+            report.append({"pid": pid, "role": role, **memory})
+    return report
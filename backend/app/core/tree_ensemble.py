@@ -0,0 +1,290 @@
+"""
+Compiled tree ensemble module.
+Flattens a trained XGBoost booster into contiguous NumPy arrays and evaluates
+all trees for a batch without DMatrix construction or sklearn wrapper overhead.
+"""
+
+import json
+from typing import Any, Optional
+import numpy as np
+from loguru import logger
+
+
+class CompiledTreeEnsemble:
+    """
+    Flat-array evaluator for a binary:logistic XGBoost tree ensemble.
+
+    Every tree is padded to a complete binary tree of the ensemble's maximum
+    depth and stored in heap order, so the children of node i are 2i+1 (left)
+    and 2i+2 (right) and need no lookup. Arrays are shaped (n_trees, nodes):
+    - feature, threshold: split feature index and condition (go left if x < threshold)
+    - default_left: direction taken when the feature value is missing (NaN)
+    - leaf_value: (n_trees, 2 ** max_depth) outputs of the bottom level
+    Leaves that sit above the bottom level are replicated into every bottom
+    slot below them, so all rows take exactly max_depth steps per tree.
+    """
+
+    # Dense layout grows as 2 ** depth per tree; deeper models are not compiled
+    MAX_SUPPORTED_DEPTH = 14
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        default_left: np.ndarray,
+        leaf_value: np.ndarray,
+        max_depth: int,
+        base_margin: float,
+        n_features: int
+    ):
+        """Initialize from already flattened arrays; use from_booster() to compile."""
+        self.feature = feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.leaf_value = leaf_value
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+        self.n_features = n_features
+
+        # Flat views used by the evaluator. _left_child maps a flat split slot
+        # to the flat index of its left child (right child is the next one);
+        # on the bottom level it points into the flat leaf array instead.
+        n_trees, n_internal = feature.shape
+        n_leaves = leaf_value.shape[1]
+        self._feature_flat = feature.ravel()
+        self._threshold_flat = threshold.ravel()
+        self._default_right_flat = ~default_left.ravel()
+        self._leaf_flat = leaf_value.ravel()
+        self._roots = np.arange(n_trees, dtype=np.intp) * n_internal
+
+        heap_left = 2 * np.arange(n_internal, dtype=np.intp) + 1
+        tree_idx = np.arange(n_trees, dtype=np.intp)[:, None]
+        self._left_child = np.where(
+            heap_left < n_internal,
+            tree_idx * n_internal + heap_left,
+            tree_idx * n_leaves + heap_left - n_internal
+        ).ravel()
+
+    @property
+    def n_trees(self) -> int:
+        """Number of trees in the ensemble."""
+        return self.feature.shape[0]
+
+    @classmethod
+    def from_booster(cls, booster: Any) -> "CompiledTreeEnsemble":
+        """
+        Compile an xgboost.Booster (or a model exposing get_booster()).
+
+        Args:
+            booster: Trained booster with a binary:logistic objective
+
+        Returns:
+            CompiledTreeEnsemble equivalent to the booster
+
+        Raises:
+            ValueError: If the model uses features this evaluator does not support
+        """
+        if hasattr(booster, "get_booster"):
+            booster = booster.get_booster()
+
+        learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"Unsupported objective: {objective}")
+
+        model_param = learner["learner_model_param"]
+        if int(model_param.get("num_class", 0)) > 1 or int(model_param.get("num_target", 1)) > 1:
+            raise ValueError("Only single-output models are supported")
+
+        base_score = float(model_param["base_score"])
+        base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+        gbtree = learner["gradient_booster"]
+        if gbtree["name"] != "gbtree":
+            raise ValueError(f"Unsupported booster: {gbtree['name']}")
+        trees = gbtree["model"]["trees"]
+        if any(any(tree["split_type"]) for tree in trees):
+            raise ValueError("Categorical splits are not supported")
+
+        max_depth = max(cls._tree_depth(tree["left_children"], tree["right_children"]) for tree in trees)
+        if max_depth > cls.MAX_SUPPORTED_DEPTH:
+            raise ValueError(f"Tree depth {max_depth} exceeds {cls.MAX_SUPPORTED_DEPTH}")
+        max_depth = max(max_depth, 1)
+
+        n_internal = 2 ** max_depth - 1
+        n_leaves = 2 ** max_depth
+        feature = np.zeros((len(trees), n_internal), dtype=np.intp)
+        threshold = np.zeros((len(trees), n_internal), dtype=np.float32)
+        default_left = np.ones((len(trees), n_internal), dtype=bool)
+        leaf_value = np.zeros((len(trees), n_leaves), dtype=np.float64)
+
+        for tree_idx, tree in enumerate(trees):
+            left = tree["left_children"]
+            right = tree["right_children"]
+            # XGBoost stores the leaf output in split_conditions for leaf nodes
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            stack = [(0, 0, 0)]  # (original node id, heap position, depth)
+            while stack:
+                node, position, depth = stack.pop()
+                if left[node] == -1:
+                    span = 2 ** (max_depth - depth)
+                    first = (position + 1) * span - 1 - n_internal
+                    leaf_value[tree_idx, first:first + span] = conditions[node]
+                    continue
+                feature[tree_idx, position] = tree["split_indices"][node]
+                threshold[tree_idx, position] = conditions[node]
+                default_left[tree_idx, position] = bool(tree["default_left"][node])
+                stack.append((left[node], 2 * position + 1, depth + 1))
+                stack.append((right[node], 2 * position + 2, depth + 1))
+
+        compiled = cls(
+            feature=feature,
+            threshold=threshold,
+            default_left=default_left,
+            leaf_value=leaf_value,
+            max_depth=max_depth,
+            base_margin=base_margin,
+            n_features=int(model_param["num_feature"])
+        )
+        logger.info(
+            f"🌲 Compiled tree ensemble: {compiled.n_trees} trees, "
+            f"max depth {compiled.max_depth}, {feature.size} split slots"
+        )
+        return compiled
+
+    @staticmethod
+    def _tree_depth(left: list, right: list) -> int:
+        """Depth of the deepest leaf of one tree (root has depth 0)."""
+        depth, stack = 0, [(0, 0)]
+        while stack:
+            node, node_depth = stack.pop()
+            if left[node] == -1:
+                depth = max(depth, node_depth)
+            else:
+                stack.append((left[node], node_depth + 1))
+                stack.append((right[node], node_depth + 1))
+        return depth
+
+    def predict_margin(self, features: np.ndarray) -> np.ndarray:
+        """
+        Compute raw margins for a batch.
+
+        Args:
+            features: (N, n_features) array in model feature order
+
+        Returns:
+            (N,) array of margins (log-odds)
+        """
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if features.ndim != 2 or features.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected shape (N, {self.n_features}), got {features.shape}"
+            )
+
+        n_rows = features.shape[0]
+        flat_features = features.ravel()
+        # A NaN anywhere makes the sum NaN; this is cheaper than isnan().any()
+        has_missing = bool(np.isnan(flat_features.sum()))
+
+        # Flat split slot of every (row, tree) pair, starting at the roots
+        slot = np.tile(self._roots, (n_rows, 1))
+        feature_idx = np.empty_like(slot)
+        row_offset = None
+        if n_rows > 1:
+            row_offset = (np.arange(n_rows, dtype=np.intp) * self.n_features)[:, None]
+
+        for _ in range(self.max_depth):
+            np.take(self._feature_flat, slot, out=feature_idx)
+            if row_offset is not None:
+                feature_idx += row_offset
+            values = flat_features[feature_idx]
+            # NaN compares False, i.e. goes left, unless the node defaults right
+            go_right = values >= self._threshold_flat[slot]
+            if has_missing:
+                go_right |= np.isnan(values) & self._default_right_flat[slot]
+            slot = self._left_child[slot]
+            slot += go_right
+
+        return self._leaf_flat[slot].sum(axis=1) + self.base_margin
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """
+        Drop-in replacement for XGBClassifier.predict_proba.
+
+        Args:
+            features: (N, n_features) array in model feature order
+
+        Returns:
+            (N, 2) array of [legitimate, fraud] probabilities
+        """
+        fraud = 1.0 / (1.0 + np.exp(-self.predict_margin(features)))
+        return np.column_stack((1.0 - fraud, fraud))
+
+
+def parity_probe(compiled: CompiledTreeEnsemble, n_rows: int = 2048, seed: int = 0) -> np.ndarray:
+    """
+    Build probe rows that exercise both sides of the model's split thresholds.
+
+    Feature values are drawn from the thresholds actually used for each
+    feature, nudged just below, at and above them, plus a few missing values.
+
+    Args:
+        compiled: Compiled ensemble whose thresholds are sampled
+        n_rows: Number of probe rows
+        seed: Random seed
+
+    Returns:
+        (n_rows, n_features) float32 array
+    """
+    rng = np.random.default_rng(seed)
+    probe = np.zeros((n_rows, compiled.n_features), dtype=np.float32)
+
+    for feature_idx in range(compiled.n_features):
+        thresholds = np.unique(compiled.threshold[compiled.feature == feature_idx])
+        if len(thresholds) == 0:
+            probe[:, feature_idx] = rng.uniform(0, 1e6, n_rows)
+            continue
+        picked = rng.choice(thresholds, n_rows)
+        step = rng.choice(np.array([-1, 0, 1], dtype=np.float32), n_rows)
+        probe[:, feature_idx] = np.nextafter(
+            picked, np.where(step < 0, -np.inf, np.inf).astype(np.float32), dtype=np.float32
+        )
+        probe[:, feature_idx] = np.where(step == 0, picked, probe[:, feature_idx])
+
+    missing = rng.random(probe.shape) < 0.01
+    probe[missing] = np.nan
+    return probe
+
+
+def verify_parity(
+    compiled: CompiledTreeEnsemble,
+    model: Any,
+    probe: Optional[np.ndarray] = None,
+    tolerance: float = 1e-5
+) -> float:
+    """
+    Compare the compiled evaluator with the reference model's predict_proba.
+
+    Args:
+        compiled: Compiled ensemble
+        model: Reference model exposing predict_proba
+        probe: Rows to compare on, defaults to parity_probe(compiled)
+        tolerance: Maximum allowed absolute probability difference
+
+    Returns:
+        Maximum absolute difference in fraud probability
+
+    Raises:
+        ValueError: If the difference exceeds the tolerance
+    """
+    if probe is None:
+        probe = parity_probe(compiled)
+    expected = model.predict_proba(probe)[:, 1]
+    actual = compiled.predict_proba(probe)[:, 1]
+    max_diff = float(np.max(np.abs(expected - actual)))
+    if max_diff > tolerance:
+        raise ValueError(
+            f"Compiled ensemble deviates from reference model by {max_diff:.2e} "
+            f"(tolerance {tolerance:.0e})"
+        )
+    return max_diff
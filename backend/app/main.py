@@ -1,5 +1,5 @@
 """Main FastAPI application for fraud detection system."""
-import sys
+import time
 from pathlib import Path
 from contextlib import asynccontextmanager
 
@@ -12,24 +12,22 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
+import app as app_package
 from app.core.config import get_settings
-from app.core.model_loader import model_loader
-from app.api.routes import prediction_router, model_router
-
-# Configure logger
-logger.remove()
-logger.add(
-    sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level="INFO"
-)
-logger.add(
-    "logs/app.log",
-    rotation="100 MB",
-    retention="10 days",
-    compression="zip",
-    level="INFO"
-)
+from app.core.model_loader import artifact_watcher, model_loader
+from app.core.executor import inference_executor
+from app.core.logging_config import configure_logging
+from app.core.metrics import metrics_registry
+from app.core.process_memory import peak_rss_mb, process_memory
+from app.services.micro_batcher import micro_batcher
+from app.services.shadow_scorer import shadow_scorer
+from app.services.explainer import explainer
+from app.services.decision_store import decision_log
+from app.api.routes import prediction_router, model_router, metrics_router
+from app.api.rpc import rpc_server
+
+# Configure logger (queued sinks, see app.core.logging_config)
+configure_logging()
 
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
@@ -52,32 +50,70 @@ async def lifespan(app: FastAPI):
     logger.info(f"Models Directory: {settings.models_dir}")
     
     try:
-        # Load model and associated artifacts
-        logger.info("Loading ML model and artifacts...")
-        logger.info(f"  Model Path: {settings.model_path}")
-        logger.info(f"  Encoder Path: {settings.encoder_path}")
-        logger.info(f"  Metadata Path: {settings.metadata_path}")
-        logger.info(f"  Feature Importance Path: {settings.feature_importance_path}")
-        
-        model_loader.load_all(
-            model_path=settings.model_path,
-            encoder_path=settings.encoder_path,
-            metadata_path=settings.metadata_path,
-            feature_importance_path=settings.feature_importance_path
-        )
-        logger.info("✓ Model artifacts loaded successfully")
+        if model_loader.is_loaded():
+            # Pre-fork server: the master loaded the artifacts (gunicorn.conf.py)
+            logger.info(f"✓ Using preloaded model artifacts (version {model_loader.artifact_version})")
+        else:
+            # Load model and associated artifacts
+            logger.info("Loading ML model and artifacts...")
+            logger.info(f"  Model Path: {settings.model_path}")
+            logger.info(f"  Encoder Path: {settings.encoder_path}")
+            logger.info(f"  Metadata Path: {settings.metadata_path}")
+            logger.info(f"  Feature Importance Path: {settings.feature_importance_path}")
+            
+            model_loader.load_all(
+                model_path=settings.model_path,
+                encoder_path=settings.encoder_path,
+                metadata_path=settings.metadata_path,
+                feature_importance_path=settings.feature_importance_path,
+                compile_trees=settings.compile_tree_ensemble
+            )
+            logger.info("✓ Model artifacts loaded successfully")
         
+        inference_executor.start()
+        metrics_registry.start()
+        if settings.micro_batching_enabled:
+            micro_batcher.start()
+        if settings.artifact_watch_enabled:
+            artifact_watcher.start()
+        if settings.shadow_enabled and shadow_scorer.load():
+            shadow_scorer.start()
+        explainer.start()
+        decision_log.start()
+        if settings.rpc_enabled:
+            await rpc_server.start()
+    
     except Exception as e:
         logger.error(f"✗ Failed to load model artifacts: {str(e)}")
         logger.exception("Full error traceback:")
         raise
     
-    logger.info("✓ Fraud Detection API started successfully")
+    peak_rss = peak_rss_mb()
+    memory = process_memory()
+    details = []
+    if peak_rss is not None:
+        details.append(f"peak RSS {peak_rss:.0f} MB")
+    if memory is not None:
+        details.append(f"unique {memory['uss_mb']:.0f} MB")
+    logger.info(
+        f"✓ Fraud Detection API started successfully in "
+        f"{time.perf_counter() - app_package.started_at:.2f}s"
+        + (f" ({', '.join(details)})" if details else "")
+    )
     
     yield
     
     # Shutdown
     logger.info("Shutting down Fraud Detection API...")
+    await rpc_server.stop()
+    await decision_log.stop()
+    await artifact_watcher.stop()
+    await micro_batcher.stop()
+    await shadow_scorer.stop()
+    explainer.stop()
+    await metrics_registry.stop()
+    await logger.complete()
+    inference_executor.shutdown()
 
 
 # Initialize FastAPI application
@@ -155,6 +191,7 @@ async def general_exception_handler(request: Request, exc: Exception):
 # Include routers
 app.include_router(prediction_router, prefix=settings.api_prefix)
 app.include_router(model_router, prefix=settings.api_prefix)
+app.include_router(metrics_router)
 
 
 # Root endpoints
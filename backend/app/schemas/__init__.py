@@ -3,7 +3,10 @@ from .transaction import TransactionInput, BatchTransactionInput
 from .response import (
     PredictionResponse,
     BatchPredictionResponse,
+    ColumnarPredictions,
+    ColumnarBatchPredictionResponse,
     ModelInfoResponse,
+    ModelReloadResponse,
     FeatureImportanceResponse,
     HealthCheckResponse,
     ErrorResponse
@@ -14,7 +17,10 @@ __all__ = [
     "BatchTransactionInput",
     "PredictionResponse",
     "BatchPredictionResponse",
+    "ColumnarPredictions",
+    "ColumnarBatchPredictionResponse",
     "ModelInfoResponse",
+    "ModelReloadResponse",
     "FeatureImportanceResponse",
     "HealthCheckResponse",
     "ErrorResponse"
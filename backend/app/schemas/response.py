@@ -49,6 +49,38 @@ class PredictionResponse(BaseModel):
         description="Prediction timestamp (UTC)"
     )
     
+    decision_source: Literal["model", "rules"] = Field(
+        "model",
+        description="'rules' when overload or the request deadline forced a rules-only fallback decision"
+    )
+    
+    degraded_reason: Optional[str] = Field(
+        None,
+        description="Why the model was not used (in_flight, deadline, queue_full, timeout)"
+    )
+    
+    contributions: Optional[Dict[str, float]] = Field(
+        None,
+        description=(
+            "Per-feature contributions to the fraud log-odds (TreeSHAP), largest first, "
+            "with the expected value as 'bias'; present with explain=true (or for MEDIUM/HIGH "
+            "risk with contributions_mode=risky)"
+        )
+    )
+    
+    transaction_id: Optional[str] = Field(
+        None,
+        description="The request's transaction_id, when it carried one"
+    )
+    
+    duplicate: bool = Field(
+        False,
+        description=(
+            "True when transaction_id was already decided: the stored decision is returned, "
+            "with its original timestamp, instead of scoring the transaction again"
+        )
+    )
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -87,6 +119,67 @@ class BatchPredictionResponse(BaseModel):
     )
 
 
+class ColumnarPredictions(BaseModel):
+    """Batch predictions as parallel arrays, one element per input transaction."""
+    
+    fraud_probability: List[float] = Field(..., description="Fraud probabilities")
+    is_fraud: List[bool] = Field(..., description="Fraud classifications")
+    risk_level: List[str] = Field(..., description="Risk levels (UNKNOWN for failed rows)")
+    recommended_action: List[str] = Field(..., description="Recommended actions (MANUAL_REVIEW for failed rows)")
+    confidence: List[float] = Field(..., description="Model confidence scores")
+    explanation: List[str] = Field(..., description="Human-readable explanations")
+    contributions: Optional[List[Optional[Dict[str, float]]]] = Field(
+        None,
+        description="Per-feature log-odds contributions, null for rows without them"
+    )
+    duplicate: Optional[List[bool]] = Field(
+        None,
+        description="Rows answered with the stored decision of an already decided transaction_id"
+    )
+    errors: List[Dict[str, Any]] = Field(
+        ...,
+        description="Rows that could not be scored, as {index, message}"
+    )
+
+
+class ColumnarBatchPredictionResponse(BaseModel):
+    """Response schema for batch predictions requested with ?format=columnar."""
+    
+    predictions: ColumnarPredictions = Field(
+        ...,
+        description="Predictions as parallel arrays"
+    )
+    
+    total_transactions: int = Field(
+        ...,
+        description="Total number of transactions processed"
+    )
+    
+    fraud_detected: int = Field(
+        ...,
+        description="Number of fraudulent transactions detected"
+    )
+    
+    high_risk_count: int = Field(
+        ...,
+        description="Number of high-risk transactions"
+    )
+
+
+class StoredDecisionResponse(BaseModel):
+    """Response schema for a decision looked up by transaction_id."""
+    
+    model_config = {"protected_namespaces": ()}  # Allow model_ prefix
+    
+    transaction_id: str = Field(..., description="Transaction identifier")
+    decided_at: datetime = Field(..., description="When the decision was made (UTC)")
+    model_version: str = Field(..., description="Artifact version of the model that decided")
+    status: Literal["decided", "approved"] = Field(..., description="'approved' once /approve was called")
+    approved_at: Optional[datetime] = Field(None, description="When the decision was approved (UTC)")
+    transaction: Dict[str, Any] = Field(..., description="The transaction as it was scored")
+    decision: Dict[str, Any] = Field(..., description="The prediction returned for it")
+
+
 class ModelInfoResponse(BaseModel):
     """Response schema for model information."""
     
@@ -113,7 +206,10 @@ class ModelInfoResponse(BaseModel):
                     "max_depth": 10,
                     "learning_rate": 0.1
                 },
-                "training_data_size": 5090096
+                "training_data_size": 5090096,
+                "artifact_version": "455638f403ecce99",
+                "loaded_at": "2026-01-14T09:30:00",
+                "type_codes": {"CASH_IN": 0, "CASH_OUT": 1, "DEBIT": 2, "PAYMENT": 3, "TRANSFER": 4}
             }
         }
     }
@@ -141,6 +237,45 @@ class ModelInfoResponse(BaseModel):
         ...,
         description="Number of training samples"
     )
+    
+    artifact_version: Optional[str] = Field(
+        None,
+        description="Content fingerprint of the active model and encoder"
+    )
+    
+    loaded_at: Optional[datetime] = Field(
+        None,
+        description="When the active artifacts were swapped in (UTC)"
+    )
+    
+    type_codes: Optional[Dict[str, int]] = Field(
+        None,
+        description="Transaction type -> encoder code, as used by the binary batch endpoints"
+    )
+
+
+class ModelReloadResponse(BaseModel):
+    """Response schema for a model hot reload."""
+    
+    previous_version: Optional[str] = Field(
+        None,
+        description="Artifact version active before the reload"
+    )
+    
+    active_version: str = Field(
+        ...,
+        description="Artifact version active after the reload"
+    )
+    
+    reloaded: bool = Field(
+        ...,
+        description="Whether new artifacts were swapped in (False if unchanged on disk)"
+    )
+    
+    duration_ms: float = Field(
+        ...,
+        description="Time spent loading and warming up the artifacts"
+    )
 
 
 class FeatureImportanceResponse(BaseModel):
@@ -2,8 +2,8 @@
 Pydantic schemas for transaction input validation.
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Literal
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+from typing import Any, Literal, Optional
 
 
 class TransactionInput(BaseModel):
@@ -64,6 +64,36 @@ class TransactionInput(BaseModel):
         example=250000.0
     )
     
+    nameOrig: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=64,
+        description="Sender account identifier (optional, enables per-account velocity features)",
+        example="C1231006815"
+    )
+    
+    nameDest: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=64,
+        description="Recipient account identifier (optional, enables per-account velocity features)",
+        example="C1666544295"
+    )
+    
+    transaction_id: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=128,
+        description=(
+            "Caller's unique transaction identifier (optional). With the decision store enabled, "
+            "a repeated id is answered with the stored decision instead of being scored again"
+        ),
+        example="TX-20260113-000123"
+    )
+    
+    # Velocity features, computed once per transaction by the feature store
+    _velocity: Any = PrivateAttr(default=None)
+    
     class Config:
         populate_by_name = True
         json_schema_extra = {
@@ -74,7 +104,10 @@ class TransactionInput(BaseModel):
                 "oldbalanceOrg": 300000.0,
                 "newbalanceOrig": 50000.0,
                 "oldbalanceDest": 0.0,
-                "newbalanceDest": 250000.0
+                "newbalanceDest": 250000.0,
+                "nameOrig": "C1231006815",
+                "nameDest": "C1666544295",
+                "transaction_id": "TX-20260113-000123"
             }
         }
     
@@ -1,4 +1,35 @@
 """Services package initialization."""
+from .prediction_cache import PredictionCache, SharedMemoryPredictionCache
+from .feature_store import VELOCITY_FEATURES, VelocityFeatureStore
 from .prediction_service import PredictionService, prediction_service
+from .micro_batcher import MicroBatcher, micro_batcher
+from .shadow_scorer import ShadowModel, ShadowScorer, shadow_scorer
+from .explainer import ContributionExplainer, explainer
+from .decision_store import (
+    DecisionLog,
+    DecisionStore,
+    InMemoryDecisionStore,
+    SQLiteDecisionStore,
+    decision_log
+)
 
-__all__ = ["PredictionService", "prediction_service"]
+__all__ = [
+    "PredictionCache",
+    "SharedMemoryPredictionCache",
+    "VELOCITY_FEATURES",
+    "VelocityFeatureStore",
+    "PredictionService",
+    "prediction_service",
+    "MicroBatcher",
+    "micro_batcher",
+    "ShadowModel",
+    "ShadowScorer",
+    "shadow_scorer",
+    "ContributionExplainer",
+    "explainer",
+    "DecisionStore",
+    "SQLiteDecisionStore",
+    "InMemoryDecisionStore",
+    "DecisionLog",
+    "decision_log"
+]
@@ -0,0 +1,227 @@
+"""
+Binary batch module.
+Decodes columnar batch payloads (Arrow IPC streams and packed float32
+buffers) straight into NumPy arrays and encodes the scores back in the same
+format, so no per-transaction Python objects are created.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from ..core.config import get_settings
+from ..core.metrics import stage_duration
+from ..core.model_loader import ModelArtifacts, model_loader
+from .prediction_service import PredictionService, prediction_service
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+RAW_MEDIA_TYPE = "application/octet-stream"
+
+# Raw layout: all numeric values row-major, then all type codes
+RAW_REQUEST_LAYOUT = (
+    "float32le[rows,6](step,amount,oldbalanceOrg,newbalanceOrig,oldbalanceDest,newbalanceDest)"
+    "+uint8[rows](type_code)"
+)
+RAW_RESPONSE_LAYOUT = "float32le[rows](fraud_probability)+uint8[rows](risk_code)"
+RAW_ROW_BYTES = 6 * 4 + 1
+
+# Risk code of rows that were not scored, after the RISK_LEVELS codes
+UNKNOWN_RISK_CODE = len(PredictionService.RISK_LEVELS)
+
+
+class BinaryBatchError(ValueError):
+    """Raised when a binary batch payload is malformed."""
+
+
+class BatchTooLargeError(BinaryBatchError):
+    """Raised when a binary batch has more rows than binary_batch_max_rows."""
+
+
+def _check_rows(rows: int) -> None:
+    max_rows = get_settings().binary_batch_max_rows
+    if rows > max_rows:
+        raise BatchTooLargeError(f"Batch has {rows} rows, the limit is {max_rows}")
+
+
+def _risk_code_header() -> str:
+    """Risk code mapping of the binary responses ("LOW=0,MEDIUM=1,HIGH=2,UNKNOWN=3")."""
+    levels = PredictionService.RISK_LEVELS + ("UNKNOWN",)
+    return ",".join(f"{level}={code}" for code, level in enumerate(levels))
+
+
+def type_code_header(artifacts: ModelArtifacts) -> str:
+    """Type code mapping of an artifact set as a header value ("CASH_IN=0,CASH_OUT=1,...")."""
+    return ",".join(f"{name}={code}" for name, code in sorted(artifacts.type_codes.items(), key=lambda item: item[1]))
+
+
+# Packed float32 buffers
+
+def decode_raw(body: bytes, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    View a raw request body as arrays, without copying.
+
+    Args:
+        body: Request body in RAW_REQUEST_LAYOUT
+        rows: Declared number of rows
+
+    Returns:
+        Tuple of ((rows, 6) float32 numeric columns, (rows,) uint8 type codes)
+
+    Raises:
+        BinaryBatchError: If the body size does not match the declared rows
+    """
+    _check_rows(rows)
+    if rows < 0 or len(body) != rows * RAW_ROW_BYTES:
+        raise BinaryBatchError(
+            f"Body is {len(body)} bytes, expected {RAW_ROW_BYTES} per row for {rows} rows ({RAW_REQUEST_LAYOUT})"
+        )
+    numeric = np.frombuffer(body, dtype="<f4", count=rows * 6).reshape(rows, 6)
+    type_codes = np.frombuffer(body, dtype=np.uint8, count=rows, offset=rows * 6 * 4)
+    return numeric, type_codes
+
+
+def encode_raw(probabilities: np.ndarray, risk_codes: np.ndarray) -> bytes:
+    """Encode scores in RAW_RESPONSE_LAYOUT."""
+    return probabilities.astype("<f4", copy=False).tobytes() + risk_codes.astype(np.uint8, copy=False).tobytes()
+
+
+def score_raw(body: bytes, rows: int) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Score a raw batch.
+
+    Returns:
+        Tuple of (response body, response headers)
+    """
+    artifacts = model_loader.artifacts
+    numeric, type_codes = decode_raw(body, rows)
+    probabilities, risk_codes = prediction_service.predict_arrays(numeric, type_codes, artifacts)
+    headers = {
+        "X-Row-Count": str(rows),
+        "X-Layout": RAW_RESPONSE_LAYOUT,
+        "X-Risk-Codes": _risk_code_header(),
+        "X-Type-Codes": type_code_header(artifacts),
+        "X-Artifact-Version": artifacts.version
+    }
+    with stage_duration.time("render"):
+        return encode_raw(probabilities, risk_codes), headers
+
+
+# Arrow IPC streams
+
+def decode_arrow(body: bytes, artifacts: ModelArtifacts) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode an Arrow IPC stream into model input arrays.
+
+    The stream needs the NUMERIC_FEATURES columns (any numeric type) and
+    either a "type" string column (plain or dictionary encoded) or a
+    "type_code" integer column. Types are encoded once per dictionary entry
+    rather than once per row. Nulls make a row invalid.
+
+    Args:
+        body: Arrow IPC stream bytes
+        artifacts: Artifact snapshot whose encoder maps the type names
+
+    Returns:
+        Tuple of ((N, 6) float32 numeric columns, (N,) int64 type codes, -1 for unknown types)
+
+    Raises:
+        ImportError: If pyarrow is not installed
+        BinaryBatchError: If the stream or its columns are invalid
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        raise BinaryBatchError(f"Invalid Arrow IPC stream: {e}")
+    _check_rows(table.num_rows)
+
+    names = set(table.column_names)
+    missing = [name for name in PredictionService.NUMERIC_FEATURES if name not in names]
+    if "type" not in names and "type_code" not in names:
+        missing.append("type")
+    if missing:
+        raise BinaryBatchError(f"Missing columns: {missing}")
+
+    numeric = np.empty((table.num_rows, 6), dtype=np.float32)
+    for position, name in enumerate(PredictionService.NUMERIC_FEATURES):
+        try:
+            column = pc.cast(table.column(name), pa.float32())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise BinaryBatchError(f"Column '{name}' is not numeric: {e}")
+        numeric[:, position] = pc.fill_null(column, float("nan")).to_numpy()
+
+    if "type_code" in names:
+        try:
+            codes = pc.cast(table.column("type_code"), pa.int64())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise BinaryBatchError(f"Column 'type_code' is not an integer column: {e}")
+        return numeric, pc.fill_null(codes, -1).to_numpy()
+
+    type_codes = np.empty(table.num_rows, dtype=np.int64)
+    offset = 0
+    for chunk in table.column("type").chunks:
+        if not pa.types.is_dictionary(chunk.type):
+            if not (pa.types.is_string(chunk.type) or pa.types.is_large_string(chunk.type)):
+                raise BinaryBatchError(f"Column 'type' must hold strings, got {chunk.type}")
+            chunk = chunk.dictionary_encode()
+        dictionary = chunk.dictionary.to_pylist()
+        chunk_codes = np.full(len(chunk), -1, dtype=np.int64)
+        if dictionary:
+            encoded, known = artifacts.encode_types([str(value) for value in dictionary])
+            lookup = np.where(known, encoded, -1).astype(np.int64)
+            chunk_codes = lookup[pc.fill_null(chunk.indices, 0).to_numpy()]
+            if chunk.null_count:
+                chunk_codes[chunk.is_null().to_numpy(zero_copy_only=False)] = -1
+        type_codes[offset:offset + len(chunk)] = chunk_codes
+        offset += len(chunk)
+    return numeric, type_codes
+
+
+def encode_arrow(probabilities: np.ndarray, risk_codes: np.ndarray, artifacts: ModelArtifacts) -> bytes:
+    """
+    Encode scores as an Arrow IPC stream with one record batch.
+
+    Columns: fraud_probability (float32), is_fraud (bool), risk_level and
+    recommended_action (dictionary encoded), confidence (float32). The
+    artifact version is in the schema metadata.
+    """
+    import pyarrow as pa
+
+    scored = risk_codes < UNKNOWN_RISK_CODE
+    indices = pa.array(risk_codes.astype(np.int8))
+    confidence = np.where(scored, np.abs(probabilities - 0.5) * 2, 0).astype(np.float32)
+    batch = pa.RecordBatch.from_arrays(
+        [
+            pa.array(probabilities.astype(np.float32, copy=False)),
+            pa.array(scored & (probabilities >= 0.5)),
+            pa.DictionaryArray.from_arrays(indices, pa.array(PredictionService.RISK_LEVELS + ("UNKNOWN",))),
+            pa.DictionaryArray.from_arrays(indices, pa.array(PredictionService.RISK_ACTIONS + ("MANUAL_REVIEW",))),
+            pa.array(confidence)
+        ],
+        names=["fraud_probability", "is_fraud", "risk_level", "recommended_action", "confidence"]
+    )
+    batch = batch.replace_schema_metadata({"artifact_version": artifacts.version})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def score_arrow(body: bytes) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Score an Arrow IPC batch.
+
+    Returns:
+        Tuple of (response body, response headers)
+    """
+    artifacts = model_loader.artifacts
+    numeric, type_codes = decode_arrow(body, artifacts)
+    probabilities, risk_codes = prediction_service.predict_arrays(numeric, type_codes, artifacts)
+    headers = {
+        "X-Row-Count": str(len(probabilities)),
+        "X-Artifact-Version": artifacts.version
+    }
+    with stage_duration.time("render"):
+        return encode_arrow(probabilities, risk_codes, artifacts), headers
@@ -0,0 +1,655 @@
+"""
+Decision store module.
+Persists the decisions of transactions that carry a transaction_id, so a
+retried id gets its original decision back and later calls can refer to it.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+import orjson
+from loguru import logger
+
+from ..core.config import Settings, get_settings
+from ..core.metrics import decision_store_records_total, stage_duration
+from ..core.model_loader import model_loader
+from ..schemas.transaction import TransactionInput
+
+# Stored row: transaction_id, decided_at, model_version, status, approved_at,
+# transaction JSON, decision JSON
+DecisionRow = Tuple[str, str, str, str, Optional[str], bytes, bytes]
+
+
+def _to_record(row: Sequence[Any]) -> Dict[str, Any]:
+    """Turn a stored row into the decision record returned by lookups."""
+    transaction_id, decided_at, model_version, status, approved_at, transaction, decision = row
+    return {
+        "transaction_id": transaction_id,
+        "decided_at": decided_at,
+        "model_version": model_version,
+        "status": status,
+        "approved_at": approved_at,
+        "transaction": orjson.loads(transaction),
+        "decision": orjson.loads(decision)
+    }
+
+
+def stored_prediction(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Prediction answer for a transaction_id that was already decided.
+
+    Args:
+        record: Decision record from a lookup
+
+    Returns:
+        The stored decision with its transaction_id, original timestamp and
+        duplicate set
+    """
+    return {
+        **record["decision"],
+        "transaction_id": record["transaction_id"],
+        "timestamp": record["decided_at"],
+        "duplicate": True
+    }
+
+
+def merge_decided(
+    n_rows: int,
+    fresh_rows: List[int],
+    predictions: Union[List[dict], Dict[str, Any]],
+    stored: Dict[int, Dict[str, Any]],
+    repeated: Dict[int, int]
+) -> Union[List[dict], Dict[str, Any]]:
+    """
+    Put the scored rows and the already decided rows back in input order.
+
+    Args:
+        n_rows: Batch size
+        fresh_rows: Input row of each scored prediction
+        predictions: Records (list of dicts) or columnar (dict of lists) predictions of the scored rows
+        stored: Stored prediction per row answered from the decision store
+        repeated: Earlier row per row repeating its transaction_id
+
+    Returns:
+        Predictions of every row, in the layout of predictions; columnar
+        predictions gain a "duplicate" column
+    """
+    if isinstance(predictions, list):
+        merged: List[Optional[dict]] = [None] * n_rows
+        for row, result in zip(fresh_rows, predictions):
+            merged[row] = result
+        for row, result in stored.items():
+            merged[row] = result
+        for row, first_row in repeated.items():
+            merged[row] = {**merged[first_row], "duplicate": True}
+        return merged
+
+    keys = [key for key in predictions if key != "errors"]
+    if "contributions" not in predictions and any("contributions" in result for result in stored.values()):
+        keys.append("contributions")
+    columns: Dict[str, Any] = {}
+    for key in keys:
+        column: List[Any] = [None] * n_rows
+        for row, value in zip(fresh_rows, predictions.get(key, ())):
+            column[row] = value
+        for row, result in stored.items():
+            column[row] = result.get(key)
+        for row, first_row in repeated.items():
+            column[row] = column[first_row]
+        columns[key] = column
+    columns["errors"] = [{**error, "index": fresh_rows[error["index"]]} for error in predictions["errors"]]
+    columns["duplicate"] = [row in stored or row in repeated for row in range(n_rows)]
+    return columns
+
+
+class DecisionStore(ABC):
+    """Storage backend of decisions, keyed by transaction_id."""
+
+    backend = ""
+
+    @abstractmethod
+    def get_many(self, transaction_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up stored decisions.
+
+        Args:
+            transaction_ids: Transaction ids to look up
+
+        Returns:
+            Decision record per id found
+        """
+
+    @abstractmethod
+    def write(self, rows: Sequence[DecisionRow], approvals: Sequence[Tuple[str, str]]) -> None:
+        """
+        Store decisions and approvals in one transaction.
+
+        A decision for an id that is already stored is ignored, so the first
+        decision of an id stays the decision of record.
+
+        Args:
+            rows: New decision rows
+            approvals: (transaction_id, approved_at) pairs, applied after rows
+        """
+
+    def close(self) -> None:
+        """Release the backend's resources."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics."""
+        return {"backend": self.backend}
+
+
+class SQLiteDecisionStore(DecisionStore):
+    """
+    Decisions in a SQLite database in WAL mode.
+
+    The table is keyed (WITHOUT ROWID) on transaction_id, so a lookup is a
+    single B-tree search. WAL lets lookups read while a commit is being
+    written, and lets several server workers share the file: writes from
+    different processes are serialized by SQLite's lock, waiting up to
+    busy_timeout_ms. With synchronous=NORMAL a commit survives a crash of
+    the process, but not necessarily of the machine.
+
+    Writes go through one connection, used by one writer thread at a time;
+    every thread doing lookups gets its own read connection.
+    """
+
+    backend = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS decisions (
+            transaction_id TEXT PRIMARY KEY,
+            decided_at TEXT NOT NULL,
+            model_version TEXT NOT NULL,
+            status TEXT NOT NULL,
+            approved_at TEXT,
+            transaction_json BLOB NOT NULL,
+            decision_json BLOB NOT NULL
+        ) WITHOUT ROWID
+    """
+
+    def __init__(self, path: Union[str, Path], synchronous: str = "NORMAL", busy_timeout_ms: int = 5000):
+        """
+        Open (or create) the database.
+
+        Args:
+            path: Database file path; its directory is created if missing
+            synchronous: SQLite synchronous level (OFF, NORMAL or FULL)
+            busy_timeout_ms: Longest wait for another process's write lock
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.synchronous = synchronous
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute(self.SCHEMA)
+        self._writer.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the store's pragmas."""
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        connection.execute(f"PRAGMA synchronous={self.synchronous}")
+        connection.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """Read connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def get_many(self, transaction_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up stored decisions by primary key."""
+        if not transaction_ids:
+            return {}
+        placeholders = ",".join("?" * len(transaction_ids))
+        rows = self._reader().execute(
+            "SELECT transaction_id, decided_at, model_version, status, approved_at, "
+            f"transaction_json, decision_json FROM decisions WHERE transaction_id IN ({placeholders})",
+            list(transaction_ids)
+        ).fetchall()
+        return {row[0]: _to_record(row) for row in rows}
+
+    def write(self, rows: Sequence[DecisionRow], approvals: Sequence[Tuple[str, str]]) -> None:
+        """Store decisions and approvals in one transaction."""
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                self._writer.executemany("INSERT OR IGNORE INTO decisions VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._writer.executemany(
+                    "UPDATE decisions SET status = 'approved', approved_at = ? "
+                    "WHERE transaction_id = ? AND status != 'approved'",
+                    [(approved_at, transaction_id) for transaction_id, approved_at in approvals]
+                )
+                self._writer.execute("COMMIT")
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        """Close the write connection and the calling thread's read connection."""
+        with self._write_lock:
+            self._writer.close()
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the database path and size."""
+        wal_path = self.path.with_name(self.path.name + "-wal")
+        return {
+            "backend": self.backend,
+            "path": str(self.path),
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "wal_bytes": wal_path.stat().st_size if wal_path.exists() else 0
+        }
+
+
+class InMemoryDecisionStore(DecisionStore):
+    """Decisions in a dictionary of the process, for tests and single-process runs."""
+
+    backend = "memory"
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._rows: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, transaction_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up stored decisions."""
+        with self._lock:
+            rows = [self._rows[key] for key in transaction_ids if key in self._rows]
+        return {row[0]: _to_record(row) for row in rows}
+
+    def write(self, rows: Sequence[DecisionRow], approvals: Sequence[Tuple[str, str]]) -> None:
+        """Store decisions and approvals."""
+        with self._lock:
+            for row in rows:
+                self._rows.setdefault(row[0], list(row))
+            for transaction_id, approved_at in approvals:
+                row = self._rows.get(transaction_id)
+                if row is not None and row[3] != "approved":
+                    row[3], row[4] = "approved", approved_at
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of stored decisions."""
+        with self._lock:
+            return {"backend": self.backend, "decisions": len(self._rows)}
+
+
+def create_decision_store(settings: Optional[Settings] = None) -> Optional[DecisionStore]:
+    """
+    Build the decision store configured in settings.
+
+    Args:
+        settings: Application settings, defaults to get_settings()
+
+    Returns:
+        A store instance, or None when the decision store is disabled
+    """
+    settings = settings or get_settings()
+    if not settings.decision_store_enabled:
+        return None
+    if settings.decision_store_backend == "memory":
+        return InMemoryDecisionStore()
+    return SQLiteDecisionStore(settings.decision_store_path, settings.decision_store_synchronous)
+
+
+class DecisionLog:
+    """
+    Asynchronous, group-committing front of a DecisionStore.
+
+    record() and approve() never touch the disk: they queue the write and
+    keep the new state in a pending map, which lookups check before the
+    store, so a decision can be found as soon as it is answered. A writer
+    task takes the queued writes, after lingering up to linger_ms for more,
+    and commits up to batch_size of them in one transaction on a dedicated
+    thread; they leave the pending map once committed. Store lookups run on
+    the event loop's default executor, so the request path does no
+    synchronous disk I/O.
+
+    The first decision of a transaction_id is kept. Concurrent requests
+    with the same new id (or requests on different server workers within
+    one commit) may each be scored; only the first decision is stored and
+    returned for that id from then on. Decisions that could not be scored
+    (risk level UNKNOWN) and rules-only overload decisions (decision_source
+    "rules") are not stored, so a retry is scored by the model.
+    Must be used from the event loop it was started on.
+    """
+
+    def __init__(self):
+        """Initialize a disabled log; call start() from the lifespan hook."""
+        self.store: Optional[DecisionStore] = None
+        self.batch_size = 0
+        self.linger = 0.0
+        self.queue_depth = 0
+        self._pending: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._queue: Deque[Tuple[int, Optional[DecisionRow], Optional[Tuple[str, str]]]] = deque()
+        self._sequence = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stored = 0
+        self._approved = 0
+        self._dropped = 0
+        self._duplicates = 0
+        self._commits = 0
+        self._failed_commits = 0
+        self._warned_full = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether decisions are being stored."""
+        return self.store is not None
+
+    def start(self, store: Optional[DecisionStore] = None) -> None:
+        """
+        Open the store and start the writer task on the running event loop.
+
+        Args:
+            store: Store to use, defaults to the one configured in settings
+        """
+        settings = get_settings()
+        self.store = store or create_decision_store(settings)
+        if self.store is None:
+            return
+        self.batch_size = settings.decision_store_batch_size
+        self.linger = settings.decision_store_linger_ms / 1000
+        self.queue_depth = settings.decision_store_queue_depth
+        self._wake = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="decision-writer")
+        self._writer_task = asyncio.get_running_loop().create_task(self._write_loop())
+        logger.info(
+            f"Decision store started: backend={self.store.backend}, batch_size={self.batch_size}, "
+            f"linger_ms={self.linger * 1000:.1f}"
+        )
+
+    async def stop(self) -> None:
+        """Commit the queued writes, then stop the writer and close the store."""
+        if self.store is None:
+            return
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        while self._queue:
+            if not await self._commit():
+                break
+        self._executor.shutdown(wait=True)
+        self.store.close()
+        self.store = None
+        if self._queue:
+            logger.error(f"Decision store stopped with {len(self._queue)} writes not committed")
+
+    def _enqueue(
+        self,
+        row: Optional[DecisionRow],
+        approval: Optional[Tuple[str, str]],
+        record: Dict[str, Any]
+    ) -> bool:
+        """Queue one write and make its state visible to lookups."""
+        if len(self._queue) >= self.queue_depth:
+            self._dropped += 1
+            decision_store_records_total.inc("dropped")
+            if not self._warned_full:
+                self._warned_full = True
+                logger.warning(f"Decision store queue full ({self.queue_depth} writes), dropping decisions")
+            return False
+        self._sequence += 1
+        self._pending[record["transaction_id"]] = (self._sequence, record)
+        self._queue.append((self._sequence, row, approval))
+        self._wake.set()
+        return True
+
+    def record(self, transactions: Sequence[TransactionInput], results: Sequence[Dict[str, Any]]) -> None:
+        """
+        Queue the decisions of transactions that carry a transaction_id.
+
+        Args:
+            transactions: Answered transactions
+            results: Prediction dictionaries returned for them, aligned with transactions
+        """
+        if self.store is None:
+            return
+        decided_at = None
+        model_version = model_loader.artifact_version if model_loader.is_loaded() else "unknown"
+        for transaction, result in zip(transactions, results):
+            transaction_id = transaction.transaction_id
+            if (
+                transaction_id is None
+                or transaction_id in self._pending
+                or result["risk_level"] == "UNKNOWN"
+                or result.get("decision_source") == "rules"
+            ):
+                continue
+            if decided_at is None:
+                decided_at = datetime.utcnow().isoformat()
+            payload = transaction.model_dump(exclude={"transaction_id"}, exclude_none=True)
+            decision = {key: value for key, value in result.items() if key not in ("timestamp", "transaction_id")}
+            row = (
+                transaction_id, decided_at, model_version, "decided", None,
+                orjson.dumps(payload), orjson.dumps(decision)
+            )
+            record = {
+                "transaction_id": transaction_id,
+                "decided_at": decided_at,
+                "model_version": model_version,
+                "status": "decided",
+                "approved_at": None,
+                "transaction": payload,
+                "decision": decision
+            }
+            if self._enqueue(row, None, record):
+                self._stored += 1
+
+    async def find_many(self, transaction_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up decisions, pending ones first.
+
+        A failing store lookup is logged and treated as not found, so the
+        transactions are scored instead of failing the request.
+
+        Args:
+            transaction_ids: Transaction ids to look up
+
+        Returns:
+            Decision record per id found
+        """
+        if self.store is None or not transaction_ids:
+            return {}
+        found = {}
+        missing = []
+        for transaction_id in dict.fromkeys(transaction_ids):
+            pending = self._pending.get(transaction_id)
+            if pending is not None:
+                found[transaction_id] = pending[1]
+            else:
+                missing.append(transaction_id)
+        if missing:
+            store = self.store
+            try:
+                stored = await asyncio.get_running_loop().run_in_executor(None, store.get_many, missing)
+            except Exception as e:
+                logger.warning(f"Decision store lookup failed: {e}")
+                stored = {}
+            # A write that committed meanwhile is in both; keep the newest state
+            for transaction_id, record in stored.items():
+                pending = self._pending.get(transaction_id)
+                found[transaction_id] = pending[1] if pending is not None else record
+        return found
+
+    async def find(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """Look up one decision."""
+        return (await self.find_many([transaction_id])).get(transaction_id)
+
+    async def split_decided(
+        self, transactions: Sequence[TransactionInput]
+    ) -> Tuple[List[int], Dict[int, Dict[str, Any]], Dict[int, int]]:
+        """
+        Find the batch rows whose transaction_id was already decided.
+
+        Args:
+            transactions: Batch transactions
+
+        Returns:
+            Tuple of (rows to score, stored prediction per row answered from
+            the decision store, earlier row per row repeating the
+            transaction_id of an earlier row to score)
+        """
+        rows = list(range(len(transactions)))
+        if not self.enabled:
+            return rows, {}, {}
+        ids = [transaction.transaction_id for transaction in transactions if transaction.transaction_id is not None]
+        if not ids:
+            return rows, {}, {}
+
+        decided = await self.find_many(ids)
+        fresh_rows: List[int] = []
+        stored: Dict[int, Dict[str, Any]] = {}
+        repeated: Dict[int, int] = {}
+        first_rows: Dict[str, int] = {}
+        for row, transaction in enumerate(transactions):
+            transaction_id = transaction.transaction_id
+            if transaction_id in decided:
+                stored[row] = stored_prediction(decided[transaction_id])
+            elif transaction_id is not None and transaction_id in first_rows:
+                repeated[row] = first_rows[transaction_id]
+            else:
+                if transaction_id is not None:
+                    first_rows[transaction_id] = row
+                fresh_rows.append(row)
+        self.count_duplicates(len(stored) + len(repeated))
+        return fresh_rows, stored, repeated
+
+    def record_predictions(
+        self,
+        transactions: Sequence[TransactionInput],
+        predictions: Union[List[dict], Dict[str, Any]]
+    ) -> None:
+        """Queue the decisions of a records (list of dicts) or columnar (dict of lists) batch result."""
+        if not self.enabled:
+            return
+        rows = [row for row, transaction in enumerate(transactions) if transaction.transaction_id is not None]
+        if not rows:
+            return
+        if isinstance(predictions, dict):
+            keys = [key for key in predictions if key != "errors"]
+            results = [
+                {key: predictions[key][row] for key in keys if predictions[key][row] is not None}
+                for row in rows
+            ]
+        else:
+            results = [predictions[row] for row in rows]
+        self.record([transactions[row] for row in rows], results)
+
+    def count_duplicates(self, count: int) -> None:
+        """Count requests answered with a stored decision."""
+        if count:
+            self._duplicates += count
+            decision_store_records_total.inc("duplicate", amount=count)
+
+    async def approve(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Mark a stored decision as approved.
+
+        Args:
+            transaction_id: Transaction id of the decision
+
+        Returns:
+            The updated decision record (unchanged if already approved), or
+            None when no decision is stored for the id
+
+        Raises:
+            RuntimeError: If the approval cannot be queued (queue full)
+        """
+        record = await self.find(transaction_id)
+        if record is None or record["status"] == "approved":
+            return record
+        approved_at = datetime.utcnow().isoformat()
+        record = {**record, "status": "approved", "approved_at": approved_at}
+        if not self._enqueue(None, (transaction_id, approved_at), record):
+            raise RuntimeError("Decision store queue is full")
+        self._approved += 1
+        return record
+
+    async def _write_loop(self) -> None:
+        """Commit queued writes in groups until cancelled."""
+        while True:
+            await self._wake.wait()
+            if self.linger > 0 and len(self._queue) < self.batch_size:
+                await asyncio.sleep(self.linger)
+            self._wake.clear()
+            while self._queue:
+                if not await self._commit():
+                    # Keep the writes queued and retry after a pause
+                    await asyncio.sleep(1.0)
+                    break
+            if self._queue:
+                self._wake.set()
+
+    async def _commit(self) -> bool:
+        """Commit up to batch_size queued writes; returns whether it succeeded."""
+        batch = [self._queue[index] for index in range(min(self.batch_size, len(self._queue)))]
+        rows = [row for _, row, _ in batch if row is not None]
+        approvals = [approval for _, _, approval in batch if approval is not None]
+        start = time.perf_counter()
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.store.write, rows, approvals)
+        except Exception as e:
+            self._failed_commits += 1
+            logger.error(f"Decision store commit of {len(batch)} writes failed: {e}")
+            return False
+        stage_duration.observe(time.perf_counter() - start, "decision_commit")
+
+        for _ in batch:
+            self._queue.popleft()
+        last_sequence = batch[-1][0]
+        for _, row, approval in batch:
+            transaction_id = row[0] if row is not None else approval[0]
+            pending = self._pending.get(transaction_id)
+            if pending is not None and pending[0] <= last_sequence:
+                del self._pending[transaction_id]
+        self._commits += 1
+        self._warned_full = False
+        decision_store_records_total.inc("stored", amount=len(rows))
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Get write, duplicate and queue counters."""
+        if self.store is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            **self.store.stats(),
+            "decisions_queued": self._stored,
+            "approvals_queued": self._approved,
+            "dropped": self._dropped,
+            "duplicates_answered": self._duplicates,
+            "pending_writes": len(self._queue),
+            "commits": self._commits,
+            "failed_commits": self._failed_commits
+        }
+
+
+# Global decision log instance
+decision_log = DecisionLog()
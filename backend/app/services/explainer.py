@@ -0,0 +1,221 @@
+"""
+Feature contribution module.
+Computes per-prediction feature attributions with XGBoost's TreeSHAP
+(pred_contribs) on a dedicated worker pool, for the rows that need them.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import xgboost as xgb
+from loguru import logger
+
+from ..core.admission import Deadline
+from ..core.config import get_settings
+from ..core.executor import InferenceExecutor, InferenceRejected, InferenceTimeout
+from ..core.metrics import batch_rows, stage_duration
+from ..core.model_loader import ModelArtifacts, model_loader
+from ..core.native_artifacts import BoosterClassifier, model_iteration_range
+from ..schemas.transaction import TransactionInput
+from .prediction_service import PredictionService, prediction_service
+
+# Name of the expected-value (bias) term in a contributions dictionary
+BIAS_NAME = "bias"
+
+
+class ContributionExplainer:
+    """
+    Per-prediction feature contributions from the model's trees.
+
+    Contributions are SHAP values of the full model in log-odds space: for
+    each row they sum, with the bias term, to the full model's margin. That
+    is the logit of the returned fraud_probability only when the full model
+    scored the row; with the scoring cascade enabled, rows answered by an
+    earlier stage report that stage's probability, so their contributions
+    explain the full model's score instead. Rules-only (overload) decisions
+    never carry contributions. A batch is explained with one vectorized
+    booster.predict(pred_contribs=True) call. Exact TreeSHAP costs a few
+    milliseconds per row on the production model, so it runs on its own
+    bounded executor and only for rows that ask for it: requests passing
+    explain=true, plus MEDIUM/HIGH risk rows with contributions_mode "risky".
+    When the pool is full or a request's deadline leaves no room, the
+    prediction is returned without contributions instead of failing.
+    contributions_approximate switches to the much cheaper Saabas
+    approximation (approx_contribs), which keeps the additivity property.
+    """
+
+    def __init__(self, service: PredictionService = prediction_service):
+        """Initialize an explainer; call start() from the lifespan hook."""
+        self.service = service
+        self.executor = InferenceExecutor(name="explain")
+        self._lock = threading.Lock()
+        self._explained_rows = 0
+        self._skipped_rows = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether contributions can be computed at all."""
+        return get_settings().contributions_mode != "off"
+
+    def start(self) -> None:
+        """Start the explain executor."""
+        settings = get_settings()
+        if not self.enabled:
+            return
+        self.executor.start(
+            max_workers=settings.contributions_workers,
+            queue_depth=settings.contributions_queue_depth,
+            timeout_seconds=settings.inference_timeout_seconds
+        )
+
+    def stop(self) -> None:
+        """Stop the explain executor."""
+        self.executor.shutdown()
+
+    def wanted(self, risk_level: str, requested: bool = False) -> bool:
+        """
+        Whether a prediction should carry contributions.
+
+        Args:
+            risk_level: Risk level of the prediction
+            requested: Whether the request passed explain=true
+
+        Returns:
+            True for requested or (in "risky" mode) MEDIUM/HIGH predictions
+        """
+        mode = get_settings().contributions_mode
+        if mode == "off" or risk_level == "UNKNOWN":
+            return False
+        return requested or (mode == "risky" and risk_level in ("MEDIUM", "HIGH"))
+
+    def contributions(self, features: np.ndarray, artifacts: ModelArtifacts) -> np.ndarray:
+        """
+        Feature contributions of a preprocessed feature matrix, in one call.
+
+        Args:
+            features: (N, F) float32 feature matrix
+            artifacts: Artifact snapshot that scored the rows
+
+        Returns:
+            (N, F + 1) float32 array of log-odds contributions, bias last
+        """
+        model = artifacts.model
+        booster = model.get_booster()
+        if isinstance(model, BoosterClassifier):
+            iteration_range = model.iteration_range
+        else:
+            iteration_range = model_iteration_range(model)
+
+        batch_rows.observe(len(features), "explain")
+        with stage_duration.time("contributions"):
+            dmatrix = xgb.DMatrix(features, feature_names=booster.feature_names, missing=np.nan)
+            return booster.predict(
+                dmatrix,
+                pred_contribs=True,
+                approx_contribs=get_settings().contributions_approximate,
+                iteration_range=iteration_range
+            )
+
+    def explain_rows(
+        self,
+        transactions: Sequence[TransactionInput],
+        artifacts: Optional[ModelArtifacts] = None
+    ) -> List[Optional[Dict[str, float]]]:
+        """
+        Contribution dictionaries of a batch of transactions.
+
+        Velocity features are memoized on the transactions, so explaining
+        rows that were already scored does not record them again.
+
+        Args:
+            transactions: Transactions to explain
+            artifacts: Artifact snapshot, defaults to the active one
+
+        Returns:
+            One {feature: contribution} dictionary per transaction, sorted by
+            absolute contribution with the bias term last; None for rows that
+            fail preprocessing
+        """
+        artifacts = artifacts or model_loader.artifacts
+        features, valid_rows, _ = self.service.preprocess_batch(transactions, artifacts)
+        results: List[Optional[Dict[str, float]]] = [None] * len(transactions)
+        if not valid_rows:
+            return results
+
+        names = artifacts.feature_names
+        if not names:
+            raise ValueError("Model has neither booster feature names nor metadata features")
+        values = np.round(self.contributions(features, artifacts).astype(np.float64), 4)
+        order = np.argsort(-np.abs(values[:, :-1]), axis=1, kind="stable")
+        for row, row_values, row_order in zip(valid_rows, values.tolist(), order.tolist()):
+            contributions = {names[column]: row_values[column] for column in row_order}
+            contributions[BIAS_NAME] = row_values[-1]
+            results[row] = contributions
+        return results
+
+    async def explain(
+        self,
+        transactions: Sequence[TransactionInput],
+        deadline: Optional[Deadline] = None
+    ) -> List[Optional[Dict[str, float]]]:
+        """
+        Explain transactions on the explain executor, never failing the caller.
+
+        Args:
+            transactions: Transactions to explain
+            deadline: Request deadline; contributions are skipped when the
+                executor's latency estimate does not fit in what is left
+
+        Returns:
+            One contributions dictionary (or None if skipped) per transaction
+        """
+        if not transactions:
+            return []
+        skipped: List[Optional[Dict[str, float]]] = [None] * len(transactions)
+        if not self.enabled:
+            return skipped
+
+        timeout = None
+        if deadline is not None:
+            remaining = deadline.remaining()
+            if remaining is not None and self.executor.estimate_latency() > remaining:
+                self._skip(len(transactions))
+                return skipped
+            timeout = deadline.timeout(get_settings().inference_timeout_seconds)
+
+        try:
+            results = await self.executor.run(self.explain_rows, list(transactions), timeout=timeout)
+        except (InferenceRejected, InferenceTimeout) as e:
+            logger.warning(f"Skipping contributions for {len(transactions)} rows: {e}")
+            self._skip(len(transactions))
+            return skipped
+        except Exception as e:
+            logger.error(f"Contribution computation failed: {e}")
+            self._skip(len(transactions))
+            return skipped
+
+        with self._lock:
+            self._explained_rows += len(transactions)
+        return results
+
+    def _skip(self, rows: int) -> None:
+        """Count rows returned without contributions."""
+        with self._lock:
+            self._skipped_rows += rows
+
+    def stats(self) -> Dict[str, Any]:
+        """Get configuration, counters and executor statistics."""
+        settings = get_settings()
+        with self._lock:
+            counters = {"explained_rows": self._explained_rows, "skipped_rows": self._skipped_rows}
+        return {
+            "mode": settings.contributions_mode,
+            "method": "saabas" if settings.contributions_approximate else "treeshap",
+            **counters,
+            "executor": self.executor.stats()
+        }
+
+
+# Global explainer instance
+explainer = ContributionExplainer()
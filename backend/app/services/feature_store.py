@@ -0,0 +1,285 @@
+"""
+Velocity feature store module.
+Keeps sliding-window activity aggregates per account (nameOrig / nameDest)
+and turns them into per-transaction velocity features.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from ..core.config import Settings, get_settings
+from ..schemas.transaction import TransactionInput
+
+# Velocity features, in the order of VelocityFeatureStore.features() values.
+# A model trained with any of them lists them after the base features in its
+# metadata "features"; NaN means missing (no account identifier).
+VELOCITY_FEATURES = (
+    "orig_out_count",                   # transactions sent by nameOrig in the window
+    "orig_out_amount",                  # amount sent by nameOrig in the window
+    "orig_in_amount",                   # amount received by nameOrig in the window
+    "orig_steps_since_last_transfer",   # steps since nameOrig's last TRANSFER/CASH_OUT
+    "dest_in_count",                    # transactions received by nameDest in the window
+    "dest_in_amount"                    # amount received by nameDest in the window
+)
+
+# Aggregate channels per account
+OUT_COUNT, OUT_AMOUNT, IN_COUNT, IN_AMOUNT = range(4)
+
+# Features of a transaction without account identifiers
+_MISSING = np.full(len(VELOCITY_FEATURES), np.nan, dtype=np.float32)
+_MISSING.setflags(write=False)
+
+
+class VelocityFeatureStore:
+    """
+    In-process, array-backed store of per-account sliding-window aggregates.
+
+    Each account owns one slot of flat typed arrays: a ring of one-step
+    buckets per channel (sent/received count and amount) covering the last
+    window_steps steps, running totals over the ring, the newest step seen
+    and the step of its last outgoing TRANSFER/CASH_OUT. Moving an account's
+    window forward clears the buckets that fall out of it, so lookup and
+    update cost O(1) amortized per transaction. At most max_accounts slots
+    exist (about 8 bytes per channel and window step each); the least
+    recently seen account's slot is reused once they are all taken.
+
+    Features describe the account state before the transaction, which is
+    recorded afterwards. Transactions arriving out of step order are added
+    to the window they fall in, but their lookup sees the account's newest
+    window. The state is per process: with several server workers each one
+    sees only the transactions it serves.
+    """
+
+    TRANSFER_TYPES = ("TRANSFER", "CASH_OUT")
+
+    def __init__(self, max_accounts: int, window_steps: int):
+        """Initialize an empty store; slots are allocated as accounts arrive."""
+        if max_accounts < 1 or not 1 <= window_steps <= 64:
+            raise ValueError("max_accounts must be positive and window_steps between 1 and 64")
+        self.max_accounts = max_accounts
+        self.window_steps = window_steps
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Flat typed arrays, slot-major: buckets[(slot * 4 + channel) * window_steps + step % window_steps]
+        self._buckets = array("d")
+        self._totals = array("d")
+        self._occupied = array("Q")  # bit b set: bucket b of the slot holds data
+        self._head = array("q")
+        self._last_transfer = array("q")
+        self._full_mask = (1 << window_steps) - 1
+        self._empty_buckets = array("d", [0.0]) * (4 * window_steps)
+        self._observed = 0
+        self._evictions = 0
+
+    def _slot(self, account: str, step: int) -> int:
+        """Slot of an account, claiming (and resetting) one if it is new. Caller holds the lock."""
+        slot = self._slots.get(account)
+        if slot is not None:
+            self._slots.move_to_end(account)
+            return slot
+
+        if len(self._slots) < self.max_accounts:
+            slot = len(self._slots)
+            self._buckets.extend(self._empty_buckets)
+            self._totals.extend((0.0, 0.0, 0.0, 0.0))
+            self._occupied.append(0)
+            self._head.append(step)
+            self._last_transfer.append(-1)
+        else:
+            _, slot = self._slots.popitem(last=False)
+            self._evictions += 1
+            start = slot * 4 * self.window_steps
+            self._buckets[start:start + 4 * self.window_steps] = self._empty_buckets
+            self._totals[slot * 4:slot * 4 + 4] = array("d", (0.0, 0.0, 0.0, 0.0))
+            self._occupied[slot] = 0
+            self._head[slot] = step
+            self._last_transfer[slot] = -1
+        self._slots[account] = slot
+        return slot
+
+    def _advance(self, slot: int, step: int) -> None:
+        """
+        Move a slot's window forward to end at step. Caller holds the lock.
+
+        Only buckets that hold data are cleared, found through the slot's
+        occupancy bits, so each recorded bucket is cleared at most once.
+        """
+        head = self._head[slot]
+        if step <= head:
+            return
+        self._head[slot] = step
+        occupied = self._occupied[slot]
+        if not occupied:
+            return
+        window = self.window_steps
+        buckets, totals = self._buckets, self._totals
+        if step - head >= window:
+            start = slot * 4 * window
+            buckets[start:start + 4 * window] = self._empty_buckets
+            totals[slot * 4:slot * 4 + 4] = array("d", (0.0, 0.0, 0.0, 0.0))
+            self._occupied[slot] = 0
+            return
+
+        # Buckets of steps head + 1 .. step, as a bit range wrapping around the ring
+        expiring = ((1 << (step - head)) - 1) << ((head + 1) % window)
+        expiring = (expiring | (expiring >> window)) & self._full_mask & occupied
+        self._occupied[slot] = occupied & ~expiring
+        while expiring:
+            lowest = expiring & -expiring
+            bucket = lowest.bit_length() - 1
+            expiring ^= lowest
+            for channel in range(4):
+                index = (slot * 4 + channel) * window + bucket
+                totals[slot * 4 + channel] -= buckets[index]
+                buckets[index] = 0.0
+
+    def _add(self, slot: int, step: int, count_channel: int, amount: float) -> None:
+        """Record one transaction on a channel pair if it falls in the window. Caller holds the lock."""
+        window = self.window_steps
+        if step <= self._head[slot] - window:
+            return
+        bucket = step % window
+        index = (slot * 4 + count_channel) * window + bucket
+        self._occupied[slot] |= 1 << bucket
+        self._buckets[index] += 1.0
+        self._buckets[index + window] += amount
+        self._totals[slot * 4 + count_channel] += 1.0
+        self._totals[slot * 4 + count_channel + 1] += amount
+
+    def observe(
+        self,
+        name_orig: Optional[str],
+        name_dest: Optional[str],
+        step: int,
+        amount: float,
+        transaction_type: str
+    ) -> np.ndarray:
+        """
+        Look up the velocity features of a transaction, then record it.
+
+        Args:
+            name_orig: Sender account, None if unknown
+            name_dest: Recipient account, None if unknown
+            step: Transaction step (hour)
+            amount: Transaction amount
+            transaction_type: Transaction type name
+
+        Returns:
+            (len(VELOCITY_FEATURES),) float32 array, NaN where an account is unknown
+        """
+        nan = float("nan")
+        values = [nan] * len(VELOCITY_FEATURES)
+        if name_orig or name_dest:
+            with self._lock:
+                self._observed += 1
+                totals = self._totals
+
+                orig_slot = dest_slot = None
+                if name_orig:
+                    orig_slot = self._slot(name_orig, step)
+                    self._advance(orig_slot, step)
+                    base = orig_slot * 4
+                    values[0] = totals[base + OUT_COUNT]
+                    values[1] = totals[base + OUT_AMOUNT]
+                    values[2] = totals[base + IN_AMOUNT]
+                    last_transfer = self._last_transfer[orig_slot]
+                    if last_transfer >= 0:
+                        values[3] = max(step - last_transfer, 0)
+                if name_dest:
+                    dest_slot = self._slot(name_dest, step)
+                    self._advance(dest_slot, step)
+                    values[4] = totals[dest_slot * 4 + IN_COUNT]
+                    values[5] = totals[dest_slot * 4 + IN_AMOUNT]
+
+                # Record after all lookups, so a self-transfer does not see itself
+                if orig_slot is not None:
+                    self._add(orig_slot, step, OUT_COUNT, amount)
+                    if transaction_type in self.TRANSFER_TYPES:
+                        self._last_transfer[orig_slot] = max(self._last_transfer[orig_slot], step)
+                if dest_slot is not None:
+                    self._add(dest_slot, step, IN_COUNT, amount)
+        return np.array(values, dtype=np.float32)
+
+    def features(self, transaction: TransactionInput) -> np.ndarray:
+        """
+        Velocity features of a transaction, recording it on first use.
+
+        The result is kept on the transaction, so every model that scores it
+        (primary, shadow, retries) sees the same values and the account
+        aggregates count it once.
+
+        Args:
+            transaction: Input transaction
+
+        Returns:
+            (len(VELOCITY_FEATURES),) float32 array, all NaN without account identifiers
+        """
+        if not transaction.nameOrig and not transaction.nameDest:
+            return _MISSING
+        velocity = transaction._velocity
+        if velocity is None:
+            velocity = self.observe(
+                transaction.nameOrig,
+                transaction.nameDest,
+                transaction.step,
+                transaction.amount,
+                transaction.type
+            )
+            transaction._velocity = velocity
+        return velocity
+
+    def features_batch(self, transactions: Sequence[TransactionInput]) -> Optional[np.ndarray]:
+        """
+        Velocity features of a batch, recorded in order.
+
+        Args:
+            transactions: Input transactions
+
+        Returns:
+            (N, len(VELOCITY_FEATURES)) float32 array, or None if no
+            transaction carries an account identifier
+        """
+        velocity = None
+        for row, transaction in enumerate(transactions):
+            if transaction.nameOrig or transaction.nameDest:
+                if velocity is None:
+                    velocity = np.full((len(transactions), len(VELOCITY_FEATURES)), np.nan, dtype=np.float32)
+                velocity[row] = self.features(transaction)
+        return velocity
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store occupancy and counters."""
+        with self._lock:
+            memory = sum(
+                len(values) * values.itemsize
+                for values in (self._buckets, self._totals, self._occupied, self._head, self._last_transfer)
+            )
+            return {
+                "enabled": True,
+                "accounts": len(self._slots),
+                "max_accounts": self.max_accounts,
+                "window_steps": self.window_steps,
+                "observed": self._observed,
+                "evictions": self._evictions,
+                "array_mb": round(memory / (1024 * 1024), 1)
+            }
+
+
+def create_velocity_store(settings: Optional[Settings] = None) -> Optional[VelocityFeatureStore]:
+    """
+    Build the velocity feature store configured in settings.
+
+    Args:
+        settings: Application settings, defaults to get_settings()
+
+    Returns:
+        A store instance, or None when velocity features are disabled
+    """
+    settings = settings or get_settings()
+    if not settings.velocity_features_enabled:
+        return None
+    return VelocityFeatureStore(settings.velocity_max_accounts, settings.velocity_window_steps)
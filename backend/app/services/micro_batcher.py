@@ -0,0 +1,224 @@
+"""
+Micro-batching module.
+Coalesces concurrent single-transaction requests into one model call.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from loguru import logger
+
+from ..core.config import get_settings
+from ..core.executor import InferenceExecutor, InferenceRejected, InferenceTimeout, inference_executor
+from ..schemas.transaction import TransactionInput
+from .prediction_service import PredictionService, prediction_service
+
+
+class MicroBatcher:
+    """
+    Dynamic batcher in front of PredictionService.
+
+    Requests are queued and collected until either max_batch_size rows are
+    waiting or max_wait_us microseconds have passed since the first one
+    arrived. The batch is then scored with a single predict_batch call on the
+    inference executor and each caller's future is resolved with its own row;
+    the call gets the tightest remaining timeout of the batch's callers.
+    At most max_queue_depth requests wait to be batched; further ones are
+    rejected instead of queueing without bound.
+    """
+
+    # Upper bounds of the batch size histogram buckets
+    BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+    def __init__(
+        self,
+        service: PredictionService = prediction_service,
+        executor: InferenceExecutor = inference_executor
+    ):
+        """Initialize the batcher; call start() from a running event loop."""
+        self.service = service
+        self.executor = executor
+        self.max_batch_size = 0
+        self.max_wait_us = 0
+        self.max_queue_depth = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._in_flight = set()
+        self._batches = 0
+        self._rows = 0
+        self._max_observed = 0
+        self._size_counts = [0] * (len(self.BATCH_SIZE_BUCKETS) + 1)
+
+    @property
+    def running(self) -> bool:
+        """Whether the collector task is active."""
+        return self._collector is not None and not self._collector.done()
+
+    def start(
+        self,
+        max_batch_size: Optional[int] = None,
+        max_wait_us: Optional[int] = None,
+        max_queue_depth: Optional[int] = None
+    ) -> None:
+        """
+        Start the collector task on the running event loop.
+
+        Args:
+            max_batch_size: Maximum rows scored per model call
+            max_wait_us: Maximum time the first queued row waits for company
+            max_queue_depth: Maximum requests waiting to be batched
+        """
+        if self.running:
+            return
+        settings = get_settings()
+        self.max_batch_size = max_batch_size or settings.micro_batch_max_size
+        self.max_wait_us = settings.micro_batch_max_wait_us if max_wait_us is None else max_wait_us
+        self.max_queue_depth = max_queue_depth or settings.micro_batch_queue_depth
+        self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+        self._collector = asyncio.get_running_loop().create_task(self._collect())
+        logger.info(
+            f"Micro-batcher started: max_batch_size={self.max_batch_size}, "
+            f"max_wait_us={self.max_wait_us}, max_queue_depth={self.max_queue_depth}"
+        )
+
+    async def stop(self) -> None:
+        """Stop collecting and fail any requests still waiting in the queue."""
+        if self._collector is None:
+            return
+        self._collector.cancel()
+        try:
+            await self._collector
+        except asyncio.CancelledError:
+            pass
+        self._collector = None
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+        logger.info("Micro-batcher stopped")
+
+    async def submit(self, transaction: TransactionInput, timeout: Optional[float] = None) -> dict:
+        """
+        Queue a transaction and wait for its prediction.
+
+        Args:
+            transaction: Transaction to score
+            timeout: Seconds to wait for the prediction, None to wait for the batch
+
+        Returns:
+            Prediction dictionary, as returned by predict_with_explanation
+
+        Raises:
+            InferenceRejected: If max_queue_depth requests are already waiting
+            InferenceTimeout: If the prediction is not ready within timeout
+            ValueError: If the transaction fails preprocessing
+        """
+        if not self.running:
+            self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        expires = None if timeout is None else loop.time() + timeout
+        try:
+            self._queue.put_nowait((transaction, future, expires))
+        except asyncio.QueueFull:
+            raise InferenceRejected(
+                f"Micro-batch queue is full ({self.max_queue_depth} requests waiting)"
+            )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            if not future.cancelled():
+                # The batch's own model call timed out
+                raise
+            # The batch still completes; its result for this caller is dropped
+            raise InferenceTimeout(f"Micro-batched prediction did not finish within {timeout}s")
+
+    async def _collect(self) -> None:
+        """Collector loop: form batches and hand them off for scoring."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_us / 1_000_000
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Score in the background so the next batch can start forming
+            task = loop.create_task(self._score(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _score(self, batch: List[Tuple[TransactionInput, asyncio.Future, Optional[float]]]) -> None:
+        """Score one batch and resolve every caller's future."""
+        self._record(len(batch))
+        transactions = [transaction for transaction, _, _ in batch]
+        # Callers that already gave up no longer bound the call
+        expiries = [expires for _, future, expires in batch if expires is not None and not future.done()]
+        timeout = max(min(expiries) - asyncio.get_running_loop().time(), 0.0) if expiries else None
+        try:
+            results = await self.executor.run(self.service.predict_batch, transactions, timeout=timeout)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if result["risk_level"] == "UNKNOWN":
+                # Rows the model failed on stay 500s; preprocessing failures
+                # are answered 400, like the unbatched path
+                if result["explanation"].startswith("Processing failed: Prediction failed"):
+                    future.set_exception(RuntimeError(result["explanation"]))
+                else:
+                    future.set_exception(ValueError(result["explanation"]))
+            else:
+                future.set_result(result)
+
+    def _record(self, batch_size: int) -> None:
+        """Record an achieved batch size."""
+        self._batches += 1
+        self._rows += batch_size
+        self._max_observed = max(self._max_observed, batch_size)
+        for idx, bound in enumerate(self.BATCH_SIZE_BUCKETS):
+            if batch_size <= bound:
+                self._size_counts[idx] += 1
+                break
+        else:
+            self._size_counts[-1] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get achieved batch size statistics."""
+        labels = [f"<={bound}" for bound in self.BATCH_SIZE_BUCKETS]
+        labels.append(f">{self.BATCH_SIZE_BUCKETS[-1]}")
+        return {
+            "enabled": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_us": self.max_wait_us,
+            "max_queue_depth": self.max_queue_depth,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self._batches,
+            "rows": self._rows,
+            "mean_batch_size": round(self._rows / self._batches, 2) if self._batches else 0.0,
+            "max_batch_size_observed": self._max_observed,
+            "batch_size_histogram": dict(zip(labels, self._size_counts))
+        }
+
+
+# Global batcher instance
+micro_batcher = MicroBatcher()
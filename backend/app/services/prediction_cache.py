@@ -0,0 +1,312 @@
+"""
+Prediction cache module.
+Caches fraud probabilities keyed on the model feature vector and artifact version.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from ..core.config import Settings, get_settings
+
+
+class PredictionCache:
+    """
+    In-process LRU cache of fraud probabilities.
+
+    Keys are the raw bytes of a preprocessed float32 feature row (the base
+    features plus any velocity features the model uses), so
+    byte-identical transactions (gateway retries, duplicate submissions,
+    replayed batches) hit regardless of which route they came through.
+    Entries expire after ttl_seconds and the least recently used entry is
+    evicted once max_entries is reached. The whole cache is flushed when the
+    artifact version it was filled with changes.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._flushes = 0
+
+    def _check_version(self, version: str) -> None:
+        """Flush all entries if the artifacts changed. Caller holds the lock."""
+        if version != self._version:
+            if self._version is not None:
+                self._entries.clear()
+                self._flushes += 1
+                logger.info(f"Prediction cache flushed for artifact version {version}")
+            self._version = version
+
+    def get_many(self, keys: Sequence[bytes], version: str) -> List[Optional[float]]:
+        """
+        Look up cached probabilities.
+
+        Args:
+            keys: Feature row keys
+            version: Artifact version the caller is scoring with
+
+        Returns:
+            Cached probability per key, or None on a miss
+        """
+        now = time.monotonic()
+        results: List[Optional[float]] = []
+        with self._lock:
+            self._check_version(version)
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._misses += 1
+                    results.append(None)
+                elif entry[1] <= now:
+                    del self._entries[key]
+                    self._expirations += 1
+                    self._misses += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    results.append(entry[0])
+        return results
+
+    def put_many(self, keys: Sequence[bytes], probabilities: Sequence[float], version: str) -> None:
+        """
+        Store probabilities for freshly scored rows.
+
+        Args:
+            keys: Feature row keys
+            probabilities: Fraud probability per key
+            version: Artifact version the rows were scored with
+        """
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._check_version(version)
+            for key, probability in zip(keys, probabilities):
+                self._entries[key] = (float(probability), expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._flushes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "flushes": self._flushes,
+                "version": self._version
+            }
+
+
+class SharedMemoryPredictionCache(PredictionCache):
+    """
+    Prediction cache stored in a named shared memory block.
+
+    All uvicorn workers on the host that use the same block name share
+    entries. The block is a fixed-size open-addressing hash table; a key
+    probes PROBE_LENGTH consecutive slots and, when all are taken, replaces
+    the one closest to expiry. Slots hold a fixed-width 256-bit digest of
+    the key, whatever the length of the feature row, and are 64 bytes each.
+    Slots are written without cross-process locks and carry a sequence
+    number (odd while being written) that readers check before and after
+    copying, so a torn slot reads as a miss. Counters are per process.
+    """
+
+    PROBE_LENGTH = 4
+    DIGEST_SIZE = 32
+    SLOT_DTYPE = np.dtype([
+        ("sequence", np.uint64),
+        ("version", np.uint64),
+        ("key", np.uint8, (DIGEST_SIZE,)),
+        ("probability", np.float64),
+        ("expires_at", np.float64),
+    ])
+
+    def __init__(self, max_entries: int, ttl_seconds: float, name: str):
+        """Initialize; the shared block is created or attached on first use."""
+        super().__init__(max_entries, ttl_seconds)
+        self.name = name
+        # Round up to a power of two so slots can be picked with a bit mask
+        self.n_slots = 1 << max(int(max_entries) - 1, 1).bit_length()
+        self._shm = None
+        self._slots: Optional[np.ndarray] = None
+
+    def _table(self) -> np.ndarray:
+        """Create or attach the shared slot table."""
+        if self._slots is None:
+            from multiprocessing import shared_memory
+
+            size = self.n_slots * self.SLOT_DTYPE.itemsize
+            try:
+                self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+                self._shm.buf[:size] = bytes(size)
+                logger.info(f"Created shared prediction cache '{self.name}' ({self.n_slots} slots)")
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=self.name)
+                if self._shm.size < size:
+                    self._shm.close()
+                    self._shm = None
+                    raise RuntimeError(
+                        f"Shared prediction cache '{self.name}' is smaller than {size} bytes; it was "
+                        "created with another size or slot layout, unlink it or configure another name"
+                    )
+                logger.info(f"Attached shared prediction cache '{self.name}'")
+            self._slots = np.ndarray((self.n_slots,), dtype=self.SLOT_DTYPE, buffer=self._shm.buf)
+        return self._slots
+
+    @classmethod
+    def _digest(cls, key: bytes) -> bytes:
+        """Stable fixed-width digest of a key (Python's hash() differs between processes)."""
+        return hashlib.blake2b(key, digest_size=cls.DIGEST_SIZE).digest()
+
+    @staticmethod
+    def _version_tag(version: str) -> int:
+        """64-bit tag of an artifact version; 0 marks an empty slot."""
+        return int(version[:16], 16) | 1
+
+    def _probe(self, digest: bytes) -> range:
+        """Slot indices a key may occupy, from its digest."""
+        start = int.from_bytes(digest[:8], "little") & (self.n_slots - 1)
+        return range(start, start + self.PROBE_LENGTH)
+
+    def get_many(self, keys: Sequence[bytes], version: str) -> List[Optional[float]]:
+        """Look up cached probabilities in the shared table."""
+        slots = self._table()
+        tag = self._version_tag(version)
+        now = time.time()
+        results: List[Optional[float]] = []
+        hits = misses = expirations = 0
+
+        for key in keys:
+            digest = self._digest(key)
+            found = None
+            for index in self._probe(digest):
+                slot = slots[index % self.n_slots]
+                sequence = int(slot["sequence"])
+                if sequence & 1 or int(slot["version"]) != tag or slot["key"].tobytes() != digest:
+                    continue
+                probability = float(slot["probability"])
+                expires_at = float(slot["expires_at"])
+                if int(slot["sequence"]) != sequence:
+                    continue
+                if expires_at <= now:
+                    expirations += 1
+                    break
+                found = probability
+                break
+            if found is None:
+                misses += 1
+            else:
+                hits += 1
+            results.append(found)
+
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._expirations += expirations
+        return results
+
+    def put_many(self, keys: Sequence[bytes], probabilities: Sequence[float], version: str) -> None:
+        """Store probabilities in the shared table."""
+        slots = self._table()
+        tag = self._version_tag(version)
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        evictions = 0
+
+        for key, probability in zip(keys, probabilities):
+            digest = self._digest(key)
+            candidates = [index % self.n_slots for index in self._probe(digest)]
+            target = None
+            for index in candidates:
+                slot = slots[index]
+                if int(slot["version"]) == tag and slot["key"].tobytes() == digest:
+                    target = index
+                    break
+                if target is None and (int(slot["version"]) != tag or slot["expires_at"] <= now):
+                    target = index
+            if target is None:
+                target = min(candidates, key=lambda index: slots[index]["expires_at"])
+                evictions += 1
+
+            # Odd sequence marks the slot as being written
+            slots["sequence"][target] = int(slots["sequence"][target]) | 1
+            slots["version"][target] = tag
+            slots["key"][target] = np.frombuffer(digest, dtype=np.uint8)
+            slots["probability"][target] = probability
+            slots["expires_at"][target] = expires_at
+            slots["sequence"][target] = int(slots["sequence"][target]) + 1
+
+        with self._lock:
+            self._evictions += evictions
+
+    def clear(self) -> None:
+        """Invalidate every slot of the shared table."""
+        slots = self._table()
+        slots["version"] = 0
+        with self._lock:
+            self._flushes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-process counters and shared table occupancy."""
+        stats = super().stats()
+        slots = self._table()
+        stats.update({
+            "backend": "shared",
+            "name": self.name,
+            "entries": int(np.count_nonzero((slots["version"] != 0) & (slots["expires_at"] > time.time()))),
+            "max_entries": self.n_slots
+        })
+        return stats
+
+
+def create_prediction_cache(settings: Optional[Settings] = None) -> Optional[PredictionCache]:
+    """
+    Build the prediction cache configured in settings.
+
+    Args:
+        settings: Application settings, defaults to get_settings()
+
+    Returns:
+        A cache instance, or None when caching is disabled
+    """
+    settings = settings or get_settings()
+    if not settings.prediction_cache_enabled:
+        return None
+    if settings.prediction_cache_backend == "shared":
+        return SharedMemoryPredictionCache(
+            settings.prediction_cache_max_entries,
+            settings.prediction_cache_ttl_seconds,
+            settings.prediction_cache_shm_name
+        )
+    return PredictionCache(
+        settings.prediction_cache_max_entries,
+        settings.prediction_cache_ttl_seconds
+    )
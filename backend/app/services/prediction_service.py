@@ -4,55 +4,166 @@ Contains business logic for fraud detection predictions.
 """
 
 import numpy as np
-from typing import Tuple, Literal
+from typing import Any, Dict, Tuple, Literal, List, Optional, Sequence
 from loguru import logger
 
-from ..core.model_loader import model_loader
+from ..core.cascade import FULL, STAGES as CASCADE_STAGES
+from ..core.model_loader import ModelArtifacts, model_loader
 from ..core.config import get_settings
+from ..core.metrics import batch_rows, cascade_rows_total, predictions_total, stage_duration
 from ..schemas.transaction import TransactionInput
+from .prediction_cache import create_prediction_cache
+from .feature_store import VELOCITY_FEATURES, create_velocity_store
 
 
 class PredictionService:
     """
     Service class for fraud detection predictions.
     Handles preprocessing, prediction, and risk classification.
+    
+    predict() and predict_batch() take one snapshot of the active model
+    artifacts and use it for every step, so a hot reload in the middle of a
+    request cannot mix artifact versions.
     """
     
+    # Risk levels and actions indexed by the codes produced by classify_risk_batch
+    RISK_LEVELS = ("LOW", "MEDIUM", "HIGH")
+    RISK_ACTIONS = ("ALLOW", "REVIEW", "BLOCK")
+    
+    # Heuristic thresholds used to describe high-risk transactions
+    DRAIN_RATIO_THRESHOLD = 0.8
+    HIGH_AMOUNT_THRESHOLD = 100000
+    
+    # Transaction types that carry fraud in the training data (rules-only fallback)
+    FALLBACK_RISKY_TYPES = ("TRANSFER", "CASH_OUT")
+    
     def __init__(self):
         """Initialize prediction service with settings."""
         self.settings = get_settings()
-        self._model = None
-        self._encoder = None
+        self.cache = create_prediction_cache(self.settings)
+        self.velocity_store = create_velocity_store(self.settings)
+        self._velocity_columns: Dict[str, List[int]] = {}
     
     @property
     def model(self):
-        """Lazy load model."""
-        if self._model is None:
-            self._model = model_loader.model
-        return self._model
+        """Currently active model."""
+        return model_loader.model
     
     @property
     def encoder(self):
-        """Lazy load encoder."""
-        if self._encoder is None:
-            self._encoder = model_loader.encoder
-        return self._encoder
+        """Currently active encoder."""
+        return model_loader.encoder
+    
+    def predict_proba(
+        self,
+        features: np.ndarray,
+        artifacts: Optional[ModelArtifacts] = None
+    ) -> np.ndarray:
+        """
+        Fraud probabilities for a preprocessed feature matrix.
+        
+        With a scoring cascade attached to the artifacts, rows its cheap
+        stages can decide are answered there and only the rest reach the
+        full model.
+        
+        Args:
+            features: (N, 7) float32 feature matrix
+            artifacts: Artifact snapshot to score with, defaults to the active one
+        
+        Returns:
+            (N,) array of fraud probabilities
+        """
+        artifacts = artifacts or model_loader.artifacts
+        cascade = artifacts.cascade
+        if cascade is None or len(features) == 0:
+            return self._model_proba(features, artifacts)
+        
+        with stage_duration.time("cascade"):
+            probabilities, stages = cascade.route(features)
+        for stage, count in zip(CASCADE_STAGES, np.bincount(stages, minlength=len(CASCADE_STAGES)).tolist()):
+            if count:
+                cascade_rows_total.inc(stage, amount=count)
+        remaining = np.flatnonzero(stages == FULL)
+        if len(remaining):
+            probabilities[remaining] = self._model_proba(features[remaining], artifacts)
+        return probabilities
+    
+    def _model_proba(self, features: np.ndarray, artifacts: ModelArtifacts) -> np.ndarray:
+        """
+        Fraud probabilities from the full model.
+        
+        Small batches go through the compiled flat-array evaluator when one is
+        available, which avoids the per-call overhead of the XGBoost wrapper;
+        everything else goes to the configured inference backend.
+        """
+        batch_rows.observe(len(features), "model")
+        with stage_duration.time("predict_proba"):
+            compiled = artifacts.compiled_model
+            if compiled is not None and len(features) <= self.settings.compiled_ensemble_max_rows:
+                return compiled.predict_proba(features)[:, 1]
+            return artifacts.backend.predict(features)
+    
+    def score_features(
+        self,
+        features: np.ndarray,
+        artifacts: Optional[ModelArtifacts] = None
+    ) -> np.ndarray:
+        """
+        Fraud probabilities for a feature matrix, served from the cache when possible.
+        
+        Only rows missing from the cache are sent to the model, in one call.
+        Requests still running on a replaced artifact set bypass the cache.
+        
+        Args:
+            features: (N, 7) float32 feature matrix
+            artifacts: Artifact snapshot to score with, defaults to the active one
+        
+        Returns:
+            (N,) float64 array of fraud probabilities
+        """
+        artifacts = artifacts or model_loader.artifacts
+        version = artifacts.version
+        if self.cache is None or len(features) == 0 or version != model_loader.artifact_version:
+            return self.predict_proba(features, artifacts).astype(np.float64)
+        
+        keys = [row.tobytes() for row in features]
+        cached = self.cache.get_many(keys, version)
+        missing = [idx for idx, probability in enumerate(cached) if probability is None]
         
-    def preprocess_transaction(self, transaction: TransactionInput) -> np.ndarray:
+        probabilities = np.array(
+            [np.nan if probability is None else probability for probability in cached],
+            dtype=np.float64
+        )
+        if missing:
+            scored = self.predict_proba(features[missing], artifacts)
+            probabilities[missing] = scored
+            self.cache.put_many([keys[idx] for idx in missing], scored.tolist(), version)
+        return probabilities
+    
+    def preprocess_transaction(
+        self,
+        transaction: TransactionInput,
+        artifacts: Optional[ModelArtifacts] = None
+    ) -> np.ndarray:
         """
         Preprocess transaction data for model prediction.
         
         Args:
             transaction: TransactionInput object with transaction details
-            
+            artifacts: Artifact snapshot to encode with, defaults to the active one
+        
         Returns:
             numpy array with preprocessed features in correct order
         """
-        # Encode transaction type
-        try:
-            type_encoded = self.encoder.transform([transaction.type])[0]
-        except Exception as e:
-            logger.error(f"Encoding error for type '{transaction.type}': {e}")
+        artifacts = artifacts or model_loader.artifacts
+        velocity = None
+        if self.velocity_store is not None and self.velocity_columns(artifacts):
+            velocity = self.velocity_store.features(transaction)
+        
+        # Encode transaction type with the precomputed lookup table
+        type_encoded = artifacts.type_codes.get(transaction.type)
+        if type_encoded is None:
+            logger.error(f"Encoding error for type '{transaction.type}'")
             raise ValueError(f"Invalid transaction type: {transaction.type}")
         
         # Create feature vector in exact order expected by model
@@ -67,7 +178,175 @@ class PredictionService:
             type_encoded
         ]], dtype=np.float32)
         
-        return features
+        return self.append_velocity(features, None if velocity is None else velocity[None, :], artifacts)
+    
+    # Numeric model inputs, in model feature order (type_encoded is appended last)
+    NUMERIC_FEATURES = (
+        "step",
+        "amount",
+        "oldbalanceOrg",
+        "newbalanceOrig",
+        "oldbalanceDest",
+        "newbalanceDest"
+    )
+    
+    def velocity_columns(self, artifacts: ModelArtifacts) -> List[int]:
+        """
+        Velocity features the model was trained with.
+        
+        A model using velocity features lists them after the seven base
+        features in its metadata "features", which the current model does not.
+        
+        Args:
+            artifacts: Artifact snapshot whose metadata is checked
+        
+        Returns:
+            Indices into VELOCITY_FEATURES, in model column order
+        
+        Raises:
+            ValueError: If the metadata lists an unknown extra feature
+        """
+        columns = self._velocity_columns.get(artifacts.content_version)
+        if columns is None:
+            extra = list(artifacts.metadata.get("features", []))[7:]
+            unknown = [name for name in extra if name not in VELOCITY_FEATURES]
+            if unknown:
+                raise ValueError(f"Model metadata lists unsupported features: {unknown}")
+            columns = [VELOCITY_FEATURES.index(name) for name in extra]
+            if len(self._velocity_columns) >= 16:
+                self._velocity_columns.clear()
+            self._velocity_columns[artifacts.content_version] = columns
+        return columns
+    
+    def append_velocity(
+        self,
+        features: np.ndarray,
+        velocity: Optional[np.ndarray],
+        artifacts: ModelArtifacts
+    ) -> np.ndarray:
+        """
+        Append the velocity columns a model expects to a base feature matrix.
+        
+        Args:
+            features: (N, 7) float32 base feature matrix
+            velocity: (N, len(VELOCITY_FEATURES)) velocity features, None if
+                unavailable (the columns are then NaN, i.e. missing)
+            artifacts: Artifact snapshot the features are for
+        
+        Returns:
+            The matrix unchanged for models without velocity features,
+            otherwise an (N, 7 + K) matrix
+        """
+        columns = self.velocity_columns(artifacts)
+        if not columns:
+            return features
+        if velocity is None:
+            extra = np.full((len(features), len(columns)), np.nan, dtype=np.float32)
+        else:
+            extra = velocity[:, columns]
+        return np.hstack([features, extra])
+    
+    def build_features(
+        self,
+        numeric: np.ndarray,
+        types: Sequence[str],
+        artifacts: Optional[ModelArtifacts] = None,
+        velocity: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the model feature matrix from column data.
+        
+        Shared by the API batch path and offline scoring so both apply
+        exactly the same preprocessing.
+        
+        Args:
+            numeric: (N, 6) array of NUMERIC_FEATURES columns
+            types: N transaction type names
+            artifacts: Artifact snapshot to encode with, defaults to the active one
+            velocity: (N, len(VELOCITY_FEATURES)) velocity features, if available
+        
+        Returns:
+            Tuple of (features: (N, 7) float32 array plus the model's velocity
+            columns, if any; mask of rows with a known transaction type; mask of
+            rows whose base features are all finite)
+        """
+        artifacts = artifacts or model_loader.artifacts
+        n_rows = len(types)
+        features = np.empty((n_rows, 7), dtype=np.float32)
+        if n_rows == 0:
+            return (
+                self.append_velocity(features, velocity, artifacts),
+                np.ones(0, dtype=bool),
+                np.ones(0, dtype=bool)
+            )
+        
+        # Order: step, amount, oldbalanceOrg, newbalanceOrig, oldbalanceDest, newbalanceDest, type_encoded
+        features[:, :6] = numeric
+        features[:, 6], known_types = artifacts.encode_types(types)
+        finite = np.isfinite(features).all(axis=1)
+        return self.append_velocity(features, velocity, artifacts), known_types, finite
+    
+    def preprocess_batch(
+        self,
+        transactions: Sequence[TransactionInput],
+        artifacts: Optional[ModelArtifacts] = None
+    ) -> Tuple[np.ndarray, List[int], List[Tuple[int, str]]]:
+        """
+        Preprocess a batch of transactions into a single feature matrix.
+        
+        Rows that cannot be encoded or contain non-finite values are left out
+        of the matrix and reported separately so they can fail in isolation.
+        
+        Args:
+            transactions: Sequence of TransactionInput objects
+            artifacts: Artifact snapshot to encode with, defaults to the active one
+        
+        Returns:
+            Tuple of (features: (M, 7) float32 array plus the model's velocity
+            columns, if any; row indices of the M valid transactions; list of
+            (row index, error message) for failed rows)
+        """
+        if not transactions:
+            return np.empty((0, 7), dtype=np.float32), [], []
+        artifacts = artifacts or model_loader.artifacts
+        velocity = None
+        if self.velocity_store is not None and self.velocity_columns(artifacts):
+            velocity = self.velocity_store.features_batch(transactions)
+        
+        numeric = np.array(
+            [
+                (
+                    t.step,
+                    t.amount,
+                    t.oldbalanceOrg,
+                    t.newbalanceOrig,
+                    t.oldbalanceDest,
+                    t.newbalanceDest
+                )
+                for t in transactions
+            ],
+            dtype=np.float32
+        )
+        features, known_types, finite = self.build_features(
+            numeric, [transaction.type for transaction in transactions], artifacts, velocity
+        )
+        
+        failed = []
+        unknown_rows = np.flatnonzero(~known_types)
+        for row in unknown_rows:
+            failed.append((int(row), f"Invalid transaction type: {transactions[row].type}"))
+        if len(unknown_rows):
+            # One line per batch rather than one per row
+            logger.error(
+                f"Encoding error for {len(unknown_rows)} of {len(transactions)} rows, "
+                f"types: {sorted({transactions[row].type for row in unknown_rows})}"
+            )
+        for row in np.flatnonzero(known_types & ~finite):
+            failed.append((int(row), "Transaction contains non-finite values"))
+        
+        valid_rows = np.flatnonzero(known_types & finite)
+        failed.sort()
+        return features[valid_rows], valid_rows.tolist(), failed
     
     def predict(self, transaction: TransactionInput) -> Tuple[bool, float]:
         """
@@ -75,27 +354,25 @@ class PredictionService:
         
         Args:
             transaction: TransactionInput object
-            
+        
         Returns:
             Tuple of (is_fraud: bool, fraud_probability: float)
         """
         try:
+            artifacts = model_loader.artifacts
+            
             # Preprocess
-            features = self.preprocess_transaction(transaction)
+            with stage_duration.time("preprocess"):
+                features = self.preprocess_transaction(transaction, artifacts)
             
             # Predict probability
-            fraud_probability = float(self.model.predict_proba(features)[0, 1])
+            fraud_probability = float(self.score_features(features, artifacts)[0])
             
             # Classification (using default threshold of 0.5)
             is_fraud = fraud_probability >= 0.5
             
-            logger.info(
-                f"Prediction: type={transaction.type}, amount=${transaction.amount:,.2f}, "
-                f"prob={fraud_probability:.4f}, fraud={is_fraud}"
-            )
-            
             return is_fraud, fraud_probability
-            
+        
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             raise RuntimeError(f"Prediction failed: {e}")
@@ -114,7 +391,7 @@ class PredictionService:
         
         Args:
             fraud_probability: Probability of fraud (0.0 to 1.0)
-            
+        
         Returns:
             Tuple of (risk_level, recommended_action)
         """
@@ -128,6 +405,23 @@ class PredictionService:
         else:
             return "LOW", "ALLOW"
     
+    def classify_risk_batch(self, fraud_probabilities: np.ndarray) -> np.ndarray:
+        """
+        Vectorized risk classification.
+        
+        Args:
+            fraud_probabilities: Array of fraud probabilities
+        
+        Returns:
+            Integer array of risk codes indexing RISK_LEVELS / RISK_ACTIONS
+            (0 = LOW/ALLOW, 1 = MEDIUM/REVIEW, 2 = HIGH/BLOCK)
+        """
+        thresholds = np.array(
+            [self.settings.medium_risk_threshold, self.settings.high_risk_threshold],
+            dtype=np.float64
+        )
+        return np.searchsorted(thresholds, fraud_probabilities, side="right")
+    
     def calculate_confidence(self, fraud_probability: float) -> float:
         """
         Calculate model confidence based on distance from decision boundary.
@@ -137,7 +431,7 @@ class PredictionService:
         
         Args:
             fraud_probability: Probability of fraud
-            
+        
         Returns:
             Confidence score (0.0 to 1.0)
         """
@@ -158,7 +452,7 @@ class PredictionService:
             transaction: Input transaction
             is_fraud: Fraud prediction
             risk_level: Risk classification
-            
+        
         Returns:
             Explanation string
         """
@@ -168,9 +462,9 @@ class PredictionService:
                 transaction.oldbalanceOrg - transaction.newbalanceOrig
             ) / max(transaction.oldbalanceOrg, 1)
             
-            if balance_change_ratio > 0.8:
+            if balance_change_ratio > self.DRAIN_RATIO_THRESHOLD:
                 pattern = "with account draining pattern"
-            elif transaction.amount > 100000:
+            elif transaction.amount > self.HIGH_AMOUNT_THRESHOLD:
                 pattern = "with high transaction amount"
             else:
                 pattern = "with suspicious characteristics"
@@ -183,13 +477,301 @@ class PredictionService:
         else:
             return f"Low-risk {transaction.type} transaction appears legitimate"
     
+    def generate_explanation_batch(
+        self,
+        transactions: Sequence[TransactionInput],
+        risk_codes: np.ndarray
+    ) -> List[str]:
+        """
+        Vectorized counterpart of generate_explanation.
+        
+        Pattern thresholds are compared on the transactions' own float64
+        values, not the float32 feature matrix, so the result is identical to
+        generate_explanation's for every row.
+        
+        Args:
+            transactions: Input transactions, aligned with risk_codes
+            risk_codes: Risk codes from classify_risk_batch
+        
+        Returns:
+            List of explanation strings
+        """
+        n_rows = len(transactions)
+        amount = np.fromiter((transaction.amount for transaction in transactions), np.float64, n_rows)
+        old_balance = np.fromiter((transaction.oldbalanceOrg for transaction in transactions), np.float64, n_rows)
+        new_balance = np.fromiter((transaction.newbalanceOrig for transaction in transactions), np.float64, n_rows)
+        balance_change_ratio = np.abs(old_balance - new_balance) / np.maximum(old_balance, 1)
+        
+        pattern_codes = np.select(
+            [
+                risk_codes == 0,
+                risk_codes == 1,
+                balance_change_ratio > self.DRAIN_RATIO_THRESHOLD,
+                amount > self.HIGH_AMOUNT_THRESHOLD
+            ],
+            [0, 1, 2, 3],
+            default=4
+        )
+        templates = (
+            "Low-risk {} transaction appears legitimate",
+            "Medium-risk {} transaction requires manual review",
+            "High-risk {} transaction detected with account draining pattern",
+            "High-risk {} transaction detected with high transaction amount",
+            "High-risk {} transaction detected with suspicious characteristics"
+        )
+        return [
+            templates[code].format(transaction.type)
+            for code, transaction in zip(pattern_codes.tolist(), transactions)
+        ]
+    
+    def failed_result(self, transaction: TransactionInput, message: str) -> dict:
+        """
+        Build the result entry for a transaction that could not be scored.
+        
+        Args:
+            transaction: Input transaction
+            message: Failure reason
+        
+        Returns:
+            Dictionary flagging the transaction for manual review
+        """
+        return {
+            "is_fraud": False,
+            "fraud_probability": 0.0,
+            "risk_level": "UNKNOWN",
+            "recommended_action": "MANUAL_REVIEW",
+            "confidence": 0.0,
+            "explanation": f"Processing failed: {message}",
+            "transaction_id": getattr(transaction, "transaction_id", None)
+        }
+    
+    def rules_decision(self, transaction: TransactionInput, reason: str) -> dict:
+        """
+        Score a transaction with cheap heuristics instead of the model.
+        
+        Used when the model cannot answer within the request's deadline. The
+        score adds up the patterns generate_explanation describes (account
+        draining, high amount) plus an empty destination account, for the
+        transaction types fraud occurs in; the result is flagged with
+        decision_source "rules" and zero confidence.
+        
+        Args:
+            transaction: Input transaction
+            reason: Why the model was not used (e.g. "deadline", "queue_full")
+        
+        Returns:
+            Dictionary with the prediction result fields plus decision_source
+            and degraded_reason
+        """
+        fraud_probability = 0.01
+        if transaction.type in self.FALLBACK_RISKY_TYPES:
+            balance_change_ratio = abs(
+                transaction.oldbalanceOrg - transaction.newbalanceOrig
+            ) / max(transaction.oldbalanceOrg, 1)
+            
+            fraud_probability = 0.1
+            if balance_change_ratio > self.DRAIN_RATIO_THRESHOLD:
+                fraud_probability += 0.5
+            if transaction.amount > self.HIGH_AMOUNT_THRESHOLD:
+                fraud_probability += 0.2
+            if transaction.oldbalanceDest == 0 and transaction.newbalanceDest == 0:
+                fraud_probability += 0.15
+            fraud_probability = round(min(fraud_probability, 0.95), 4)
+        
+        is_fraud = fraud_probability >= 0.5
+        risk_level, recommended_action = self.classify_risk(fraud_probability)
+        explanation = self.generate_explanation(transaction, is_fraud, risk_level)
+        return {
+            "is_fraud": is_fraud,
+            "fraud_probability": fraud_probability,
+            "risk_level": risk_level,
+            "recommended_action": recommended_action,
+            "confidence": 0.0,
+            "explanation": f"Rules-only decision ({reason}): {explanation}",
+            "decision_source": "rules",
+            "degraded_reason": reason
+        }
+    
+    def predict_batch_columnar(self, transactions: Sequence[TransactionInput]) -> Dict[str, Any]:
+        """
+        Score a batch of transactions with a single model call, column-wise.
+        
+        Builds one (N, 7) feature matrix, calls predict_proba once and derives
+        risk level, confidence and explanation with NumPy masks. Rows that fail
+        preprocessing or scoring get the failed_result values without
+        affecting the rest of the batch.
+        
+        Args:
+            transactions: Sequence of TransactionInput objects
+        
+        Returns:
+            Dictionary of parallel lists in input order (fraud_probability,
+            is_fraud, risk_level, recommended_action, confidence, explanation)
+            and "errors", a list of {"index", "message"} for rows that could
+            not be scored
+        """
+        n_rows = len(transactions)
+        batch_rows.observe(n_rows, "request")
+        artifacts = model_loader.artifacts
+        with stage_duration.time("preprocess"):
+            features, valid_rows, failed = self.preprocess_batch(transactions, artifacts)
+        
+        # Rows that are not scored keep probability 0 and the UNKNOWN risk code
+        probabilities = np.zeros(n_rows, dtype=np.float64)
+        risk_codes = np.full(n_rows, len(self.RISK_LEVELS), dtype=np.intp)
+        explanations: List[str] = [""] * n_rows
+        
+        if valid_rows:
+            try:
+                fraud_probabilities = self.score_features(features, artifacts)
+            except Exception as e:
+                # Fall back to row-by-row scoring so one bad row cannot fail the batch
+                logger.warning(f"Batch scoring failed, retrying row by row: {e}")
+                fraud_probabilities = np.full(len(valid_rows), np.nan)
+                for pos in range(len(valid_rows)):
+                    try:
+                        fraud_probabilities[pos] = self.predict_proba(features[pos:pos + 1], artifacts)[0]
+                    except Exception as row_error:
+                        failed.append((valid_rows[pos], f"Prediction failed: {row_error}"))
+                scored = ~np.isnan(fraud_probabilities)
+                features = features[scored]
+                fraud_probabilities = fraud_probabilities[scored]
+                valid_rows = [row for row, ok in zip(valid_rows, scored.tolist()) if ok]
+            
+            with stage_duration.time("classify_risk"):
+                valid_codes = self.classify_risk_batch(fraud_probabilities)
+            with stage_duration.time("explain"):
+                for row, explanation in zip(valid_rows, self.generate_explanation_batch(
+                    [transactions[row] for row in valid_rows], valid_codes
+                )):
+                    explanations[row] = explanation
+            probabilities[valid_rows] = fraud_probabilities
+            risk_codes[valid_rows] = valid_codes
+            for risk_code, count in enumerate(np.bincount(valid_codes, minlength=len(self.RISK_LEVELS)).tolist()):
+                if count:
+                    predictions_total.inc(self.RISK_LEVELS[risk_code], amount=count)
+        
+        failed.sort()
+        for row, message in failed:
+            explanations[row] = f"Processing failed: {message}"
+        if failed:
+            predictions_total.inc("UNKNOWN", amount=len(failed))
+        
+        scored = risk_codes < len(self.RISK_LEVELS)
+        confidences = np.where(scored, np.round(np.abs(probabilities - 0.5) * 2, 4), 0.0)
+        risk_levels = np.array(self.RISK_LEVELS + ("UNKNOWN",), dtype=object)
+        actions = np.array(self.RISK_ACTIONS + ("MANUAL_REVIEW",), dtype=object)
+        return {
+            "fraud_probability": np.round(probabilities, 4).tolist(),
+            "is_fraud": (scored & (probabilities >= 0.5)).tolist(),
+            "risk_level": risk_levels[risk_codes].tolist(),
+            "recommended_action": actions[risk_codes].tolist(),
+            "confidence": confidences.tolist(),
+            "explanation": explanations,
+            "errors": [{"index": row, "message": message} for row, message in failed]
+        }
+    
+    def predict_arrays(
+        self,
+        numeric: np.ndarray,
+        type_codes: np.ndarray,
+        artifacts: Optional[ModelArtifacts] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score column arrays without building per-row Python objects.
+        
+        The TransactionInput field rules are applied as vectorized checks;
+        rows that break them are not scored and get the UNKNOWN risk code.
+        The prediction cache is bypassed, since its keys cost one Python
+        object per row.
+        
+        Args:
+            numeric: (N, 6) float32 array of NUMERIC_FEATURES columns
+            type_codes: (N,) integer encoder codes; out-of-range codes mark unknown types
+            artifacts: Artifact snapshot to score with, defaults to the active one
+        
+        Returns:
+            Tuple of (float32 fraud probabilities, 0 for unscored rows; uint8
+            risk codes indexing RISK_LEVELS, len(RISK_LEVELS) for unscored rows)
+        """
+        artifacts = artifacts or model_loader.artifacts
+        n_rows = len(numeric)
+        batch_rows.observe(n_rows, "request")
+        
+        with stage_duration.time("preprocess"):
+            codes = np.asarray(type_codes)
+            step = numeric[:, 0]
+            valid = (
+                np.isfinite(numeric).all(axis=1)
+                & (step >= 1) & (step == np.floor(step))
+                & (numeric[:, 1] > 0)
+                & (numeric[:, 2:] >= 0).all(axis=1)
+                & (codes >= 0) & (codes < len(artifacts.type_codes))
+            )
+            features = np.empty((n_rows, 7), dtype=np.float32)
+            features[:, :6] = numeric
+            features[:, 6] = codes
+            # Binary batches carry no account identifiers
+            features = self.append_velocity(features, None, artifacts)
+        
+        probabilities = np.zeros(n_rows, dtype=np.float32)
+        risk_codes = np.full(n_rows, len(self.RISK_LEVELS), dtype=np.uint8)
+        n_valid = int(np.count_nonzero(valid))
+        if n_valid:
+            scored = self.predict_proba(features if n_valid == n_rows else features[valid], artifacts)
+            with stage_duration.time("classify_risk"):
+                valid_codes = self.classify_risk_batch(scored)
+            probabilities[valid] = scored
+            risk_codes[valid] = valid_codes
+            for risk_code, count in enumerate(np.bincount(valid_codes, minlength=len(self.RISK_LEVELS)).tolist()):
+                if count:
+                    predictions_total.inc(self.RISK_LEVELS[risk_code], amount=count)
+        if n_valid < n_rows:
+            predictions_total.inc("UNKNOWN", amount=n_rows - n_valid)
+        return probabilities, risk_codes
+    
+    def predict_batch(self, transactions: Sequence[TransactionInput]) -> List[dict]:
+        """
+        Score a batch of transactions with a single model call.
+        
+        Record-wise view of predict_batch_columnar.
+        
+        Args:
+            transactions: Sequence of TransactionInput objects
+        
+        Returns:
+            List of prediction dictionaries, in input order
+        """
+        columns = self.predict_batch_columnar(transactions)
+        results = [
+            {
+                "is_fraud": is_fraud,
+                "fraud_probability": probability,
+                "risk_level": risk_level,
+                "recommended_action": action,
+                "confidence": confidence,
+                "explanation": explanation
+            }
+            for probability, is_fraud, risk_level, action, confidence, explanation in zip(
+                columns["fraud_probability"],
+                columns["is_fraud"],
+                columns["risk_level"],
+                columns["recommended_action"],
+                columns["confidence"],
+                columns["explanation"]
+            )
+        ]
+        for error in columns["errors"]:
+            results[error["index"]] = self.failed_result(transactions[error["index"]], error["message"])
+        return results
+    
     def predict_with_explanation(self, transaction: TransactionInput) -> dict:
         """
         Complete prediction with risk classification and explanation.
         
         Args:
             transaction: TransactionInput object
-            
+        
         Returns:
             Dictionary with prediction results
         """
@@ -197,13 +779,16 @@ class PredictionService:
         is_fraud, fraud_probability = self.predict(transaction)
         
         # Classify risk
-        risk_level, recommended_action = self.classify_risk(fraud_probability)
-        
-        # Calculate confidence
-        confidence = self.calculate_confidence(fraud_probability)
+        with stage_duration.time("classify_risk"):
+            risk_level, recommended_action = self.classify_risk(fraud_probability)
+            
+            # Calculate confidence
+            confidence = self.calculate_confidence(fraud_probability)
         
         # Generate explanation
-        explanation = self.generate_explanation(transaction, is_fraud, risk_level)
+        with stage_duration.time("explain"):
+            explanation = self.generate_explanation(transaction, is_fraud, risk_level)
+        predictions_total.inc(risk_level)
         
         return {
             "is_fraud": is_fraud,
@@ -0,0 +1,325 @@
+"""
+Shadow scoring module.
+Scores live traffic with challenger models off the request critical path
+and records how often they disagree with the primary model.
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from ..core.config import get_settings
+from ..core.executor import InferenceExecutor, InferenceRejected
+from ..core.model_loader import ModelArtifacts, ModelLoader, model_loader
+from ..schemas.transaction import TransactionInput
+from .prediction_service import PredictionService, prediction_service
+
+
+class ShadowModel:
+    """A challenger artifact set and its agreement counters against the primary."""
+
+    def __init__(self, name: str, artifacts: ModelArtifacts):
+        """Initialize counters for a loaded shadow model."""
+        self.name = name
+        self.artifacts = artifacts
+        self._lock = threading.Lock()
+        self._rows = 0
+        self._failed_rows = 0
+        self._compared_rows = 0
+        self._decision_disagreements = 0
+        self._risk_disagreements = 0
+        self._abs_diff_sum = 0.0
+        self._max_abs_diff = 0.0
+
+    def record(
+        self,
+        rows: int,
+        failed_rows: int,
+        primary_probabilities: np.ndarray,
+        shadow_probabilities: np.ndarray,
+        primary_risk: Sequence[str],
+        shadow_risk: Sequence[str]
+    ) -> None:
+        """Add one scored batch to the counters."""
+        abs_diff = np.abs(shadow_probabilities - primary_probabilities)
+        decision_disagreements = int(np.count_nonzero(
+            (shadow_probabilities >= 0.5) != (primary_probabilities >= 0.5)
+        ))
+        risk_disagreements = sum(p != s for p, s in zip(primary_risk, shadow_risk))
+        with self._lock:
+            self._rows += rows
+            self._failed_rows += failed_rows
+            self._compared_rows += len(abs_diff)
+            self._decision_disagreements += decision_disagreements
+            self._risk_disagreements += risk_disagreements
+            self._abs_diff_sum += float(abs_diff.sum())
+            if len(abs_diff):
+                self._max_abs_diff = max(self._max_abs_diff, float(abs_diff.max()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get agreement statistics."""
+        with self._lock:
+            compared = self._compared_rows
+            return {
+                "version": self.artifacts.version,
+                "model_version": self.artifacts.metadata.get("model_version"),
+                "loaded_at": self.artifacts.loaded_at.isoformat(),
+                "rows_scored": self._rows,
+                "failed_rows": self._failed_rows,
+                "compared_rows": compared,
+                "decision_disagreements": self._decision_disagreements,
+                "decision_disagreement_rate": round(self._decision_disagreements / compared, 6) if compared else 0.0,
+                "risk_level_disagreements": self._risk_disagreements,
+                "risk_level_disagreement_rate": round(self._risk_disagreements / compared, 6) if compared else 0.0,
+                "mean_abs_probability_diff": round(self._abs_diff_sum / compared, 6) if compared else 0.0,
+                "max_abs_probability_diff": round(self._max_abs_diff, 6)
+            }
+
+
+class ShadowScorer:
+    """
+    Scores traffic already answered by the primary model with shadow models.
+
+    Shadow models live in models_dir/shadow/<name>/ with the same file names
+    as the primary artifacts; the encoder and feature importance files fall
+    back to the primary ones when absent. Scoring runs on a dedicated,
+    bounded executor: when it is saturated, batches are dropped and counted
+    instead of queueing, so the primary path never waits on a shadow.
+    """
+
+    def __init__(self, service: PredictionService = prediction_service):
+        """Initialize an empty scorer; call load() and start() from the lifespan hook."""
+        self.service = service
+        self.executor = InferenceExecutor(name="shadow")
+        self.models: List[ShadowModel] = []
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self._output = None
+        self._output_path: Optional[Path] = None
+        self._submitted_batches = 0
+        self._shed_batches = 0
+        self._shed_rows = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether there is at least one shadow model to score with."""
+        return bool(self.models)
+
+    def load(self, directory: Optional[Path] = None, loader: ModelLoader = model_loader) -> int:
+        """
+        Load every shadow model directory.
+
+        A directory that fails to load is logged and skipped.
+
+        Args:
+            directory: Parent directory of the shadow models, defaults to settings
+            loader: Loader used to read the artifact files
+
+        Returns:
+            Number of shadow models loaded
+        """
+        settings = get_settings()
+        directory = Path(directory or settings.shadow_models_dir)
+        if not directory.is_dir():
+            logger.warning(f"Shadow model directory not found: {directory}")
+            return 0
+
+        primary_paths = {
+            "model_path": settings.model_path,
+            "encoder_path": settings.encoder_path,
+            "metadata_path": settings.metadata_path,
+            "feature_importance_path": settings.feature_importance_path
+        }
+        models = []
+        for model_dir in sorted(path for path in directory.iterdir() if path.is_dir()):
+            paths = {key: model_dir / Path(path).name for key, path in primary_paths.items()}
+            for key in ("encoder_path", "feature_importance_path"):
+                if not paths[key].exists():
+                    paths[key] = Path(primary_paths[key])
+            try:
+                artifacts = loader.load_artifacts(**{key: str(path) for key, path in paths.items()})
+                # Keep shadow scoring to one core per worker thread
+                artifacts.backend.configure_threads(1)
+                artifacts.warmup()
+            except Exception as e:
+                logger.error(f"❌ Failed to load shadow model '{model_dir.name}': {e}")
+                continue
+            models.append(ShadowModel(model_dir.name, artifacts))
+            logger.info(f"👥 Shadow model '{model_dir.name}' loaded (version {artifacts.version})")
+
+        self.models = models
+        return len(models)
+
+    def start(self) -> None:
+        """Start the shadow executor and open the output file."""
+        settings = get_settings()
+        self.executor.start(
+            max_workers=settings.shadow_workers,
+            queue_depth=settings.shadow_queue_depth,
+            timeout_seconds=0
+        )
+        if settings.shadow_output_path:
+            self._output_path = Path(settings.shadow_output_path)
+            self._output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._output = open(self._output_path, "a", encoding="utf-8")
+
+    async def stop(self) -> None:
+        """Let scheduled batches finish, then stop the executor and close the output."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown()
+        with self._lock:
+            if self._output is not None:
+                self._output.close()
+                self._output = None
+
+    async def submit(
+        self,
+        transactions: Sequence[TransactionInput],
+        primary_results: Sequence[dict]
+    ) -> None:
+        """
+        Schedule shadow scoring of requests the primary model has answered.
+
+        Returns immediately; meant to run as a response background task.
+
+        Args:
+            transactions: Scored transactions
+            primary_results: Primary prediction dictionaries, aligned with transactions
+        """
+        if not self.models or not transactions:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._run(list(transactions), list(primary_results), model_loader.artifact_version)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        transactions: List[TransactionInput],
+        primary_results: List[dict],
+        primary_version: str
+    ) -> None:
+        """Run one shadow batch on the shadow executor, shedding it if the pool is full."""
+        with self._lock:
+            self._submitted_batches += 1
+        try:
+            await self.executor.run(self.score, transactions, primary_results, primary_version)
+        except InferenceRejected:
+            with self._lock:
+                self._shed_batches += 1
+                self._shed_rows += len(transactions)
+        except Exception as e:
+            logger.warning(f"Shadow scoring failed: {e}")
+
+    def score(
+        self,
+        transactions: Sequence[TransactionInput],
+        primary_results: Sequence[dict],
+        primary_version: str
+    ) -> None:
+        """
+        Score a batch with every shadow model and record the comparison.
+
+        Args:
+            transactions: Scored transactions
+            primary_results: Primary prediction dictionaries, aligned with transactions
+            primary_version: Artifact version of the primary model that answered
+        """
+        timestamp = datetime.utcnow().isoformat()
+        for shadow in self.models:
+            features, valid_rows, failed = self.service.preprocess_batch(transactions, shadow.artifacts)
+            # Only rows the primary model actually scored can be compared
+            rows = [row for row in valid_rows if primary_results[row]["risk_level"] != "UNKNOWN"]
+            if len(rows) != len(valid_rows):
+                keep = set(rows)
+                features = features[[pos for pos, row in enumerate(valid_rows) if row in keep]]
+
+            if rows:
+                probabilities = self.service.predict_proba(features, shadow.artifacts).astype(np.float64)
+            else:
+                probabilities = np.empty(0)
+            risk_codes = self.service.classify_risk_batch(probabilities)
+            shadow_risk = [self.service.RISK_LEVELS[code] for code in risk_codes.tolist()]
+            primary_probabilities = np.array(
+                [primary_results[row]["fraud_probability"] for row in rows], dtype=np.float64
+            )
+            primary_risk = [primary_results[row]["risk_level"] for row in rows]
+
+            shadow.record(
+                len(transactions), len(failed),
+                primary_probabilities, probabilities, primary_risk, shadow_risk
+            )
+            self._write(
+                timestamp, shadow, primary_version,
+                [transactions[row] for row in rows],
+                primary_probabilities, primary_risk, probabilities, shadow_risk
+            )
+
+    def _write(
+        self,
+        timestamp: str,
+        shadow: ShadowModel,
+        primary_version: str,
+        transactions: Sequence[TransactionInput],
+        primary_probabilities: np.ndarray,
+        primary_risk: Sequence[str],
+        shadow_probabilities: np.ndarray,
+        shadow_risk: Sequence[str]
+    ) -> None:
+        """Append per-transaction shadow outputs to the JSONL output file."""
+        if self._output is None or not transactions:
+            return
+        lines = [
+            json.dumps({
+                "timestamp": timestamp,
+                "shadow": shadow.name,
+                "shadow_version": shadow.artifacts.version,
+                "primary_version": primary_version,
+                "transaction_id": getattr(transaction, "transaction_id", None),
+                "type": transaction.type,
+                "amount": transaction.amount,
+                "primary_probability": primary_probability,
+                "primary_risk_level": primary,
+                "shadow_probability": round(shadow_probability, 4),
+                "shadow_risk_level": risk
+            })
+            for transaction, primary_probability, primary, shadow_probability, risk in zip(
+                transactions,
+                primary_probabilities.tolist(),
+                primary_risk,
+                shadow_probabilities.tolist(),
+                shadow_risk
+            )
+        ]
+        with self._lock:
+            if self._output is not None:
+                self._output.write("\n".join(lines) + "\n")
+                self._output.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get load shedding counters and per-model agreement statistics."""
+        with self._lock:
+            counters = {
+                "submitted_batches": self._submitted_batches,
+                "shed_batches": self._shed_batches,
+                "shed_rows": self._shed_rows
+            }
+        return {
+            "enabled": self.active,
+            "output_path": str(self._output_path) if self._output_path else None,
+            "executor": self.executor.stats(),
+            **counters,
+            "models": {shadow.name: shadow.stats() for shadow in self.models}
+        }
+
+
+# Global scorer instance
+shadow_scorer = ShadowScorer()
@@ -0,0 +1,382 @@
+"""
+Stream consumer module.
+Continuously scores transactions read from a source in micro-batches and
+writes the decisions to a sink, with at-least-once offset commits.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from loguru import logger
+from pydantic import ValidationError
+
+from ..core.config import get_settings
+from ..core.metrics import (
+    consumer_committed_offset,
+    consumer_lag,
+    consumer_records_total,
+    metrics_registry,
+    stage_duration
+)
+from ..schemas.transaction import TransactionInput
+from .decision_store import decision_log, merge_decided
+from .prediction_service import PredictionService, prediction_service
+from .stream_sources import DecisionSink, OffsetCheckpoint, SourceRecord, TransactionSource
+
+# Marks the end of the source in the read-ahead buffer
+_END = object()
+
+
+class StreamConsumer:
+    """
+    Worker that scores a transaction stream through PredictionService.
+
+    A reader thread polls the source into a bounded read-ahead buffer; when
+    it is full the reader blocks and stops reading the source, which pushes
+    back on the producer (a file is simply read later, a socket producer's
+    writes block). The scoring loop takes up to batch_size records, waiting
+    at most linger_ms after the first one, scores them with one
+    predict_batch call and writes one decision per record, in source order,
+    to the sink.
+
+    Every commit_interval_seconds the sink is flushed and the offset of the
+    last written record is committed (to the checkpoint file, or to the
+    source for broker queues). After a crash the worker resumes from the
+    last commit, so decisions written after it are produced again:
+    delivery is at-least-once, and each decision carries its source offset
+    so consumers can deduplicate.
+
+    With the decision store enabled, records whose transaction_id was
+    already decided (by this worker, an earlier run or the API) get the
+    stored decision back instead of being scored again, and new decisions
+    are stored. The decision log runs on an event loop thread owned by the
+    consumer.
+    """
+
+    def __init__(
+        self,
+        source: TransactionSource,
+        sink: DecisionSink,
+        service: PredictionService = prediction_service,
+        checkpoint: Optional[OffsetCheckpoint] = None,
+        batch_size: Optional[int] = None,
+        linger_ms: Optional[float] = None,
+        buffer_records: Optional[int] = None,
+        commit_interval_seconds: Optional[float] = None,
+        metrics_path: Optional[str] = None,
+        store_decisions: Optional[bool] = None
+    ):
+        """
+        Initialize a consumer; parameters default to the consumer_* settings.
+
+        Args:
+            source: Transaction source
+            sink: Decision sink
+            service: Prediction service to score with (its active model)
+            checkpoint: Offset store for sources that do not manage offsets
+            batch_size: Most records per model call
+            linger_ms: Longest wait for a batch to fill after its first record
+            buffer_records: Most records read ahead of scoring
+            commit_interval_seconds: Time between offset commits
+            metrics_path: Prometheus textfile written at every commit, "" for none
+            store_decisions: Deduplicate and store decisions in the decision
+                store, defaults to decision_store_enabled
+        """
+        settings = get_settings()
+        self.source = source
+        self.sink = sink
+        self.service = service
+        self.checkpoint = checkpoint or OffsetCheckpoint(settings.consumer_checkpoint_path)
+        self.batch_size = batch_size or settings.consumer_batch_size
+        self.linger = (settings.consumer_linger_ms if linger_ms is None else linger_ms) / 1000
+        self.commit_interval = (
+            settings.consumer_commit_interval_seconds
+            if commit_interval_seconds is None else commit_interval_seconds
+        )
+        self.metrics_path = settings.consumer_metrics_path if metrics_path is None else metrics_path
+        self.store_decisions = settings.decision_store_enabled if store_decisions is None else store_decisions
+        self._decision_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._decision_thread: Optional[threading.Thread] = None
+        self._buffer: "queue.Queue[Any]" = queue.Queue(maxsize=buffer_records or settings.consumer_buffer_records)
+        self._stopping = threading.Event()
+        self._reader: Optional[threading.Thread] = None
+        self._reader_error: Optional[Exception] = None
+
+        self.started_offset = 0
+        self.written_offset = 0
+        self.committed_offset = 0
+        self.scored = 0
+        self.invalid = 0
+        self._started_at = 0.0
+        self._last_commit = 0.0
+        self._last_report = 0.0
+
+    def stop(self) -> None:
+        """Ask the consumer to finish its current batch, commit and return."""
+        self._stopping.set()
+
+    def _read_loop(self) -> None:
+        """Poll the source into the read-ahead buffer until it ends or the consumer stops."""
+        try:
+            while not self._stopping.is_set():
+                records = self.source.poll(timeout=0.1)
+                if records is None:
+                    break
+                for record in records:
+                    while not self._stopping.is_set():
+                        try:
+                            self._buffer.put(record, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+        except Exception as e:
+            self._reader_error = e
+            logger.error(f"Stream source {self.source.name} failed: {e}")
+        finally:
+            self._buffer_end()
+
+    def _buffer_end(self) -> None:
+        """Mark the end of the stream, unless the consumer is already stopping."""
+        while not self._stopping.is_set():
+            try:
+                self._buffer.put(_END, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _next_batch(self) -> Optional[List[SourceRecord]]:
+        """
+        Collect the next micro-batch.
+
+        Returns:
+            Up to batch_size records, or None at the end of the stream or
+            when the consumer is stopping
+        """
+        first = None
+        while first is None:
+            if self._stopping.is_set():
+                return None
+            try:
+                first = self._buffer.get(timeout=0.1)
+            except queue.Empty:
+                self._maybe_commit()
+        if first is _END:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            try:
+                record = self._buffer.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self._buffer.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if record is _END:
+                # Deliver what was collected, end on the next call
+                self._buffer.put(_END)
+                break
+            batch.append(record)
+        return batch
+
+    @staticmethod
+    def _parse(payload: bytes) -> Union[TransactionInput, str]:
+        """Parse one record into a transaction, or an error message."""
+        try:
+            return TransactionInput.model_validate_json(payload)
+        except ValidationError as e:
+            return "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc']) or 'body'}: {error['msg']}"
+                for error in e.errors()
+            )
+
+    def _start_decisions(self) -> None:
+        """Start the decision log on a new event loop thread."""
+        self._decision_loop = asyncio.new_event_loop()
+        self._decision_thread = threading.Thread(
+            target=self._decision_loop.run_forever, name="consumer-decisions", daemon=True
+        )
+        self._decision_thread.start()
+        self._on_decision_loop(decision_log.start)
+
+    def _stop_decisions(self) -> None:
+        """Commit the queued decisions, then stop the event loop thread."""
+        try:
+            self._on_decision_loop(decision_log.stop)
+        finally:
+            self._decision_loop.call_soon_threadsafe(self._decision_loop.stop)
+            self._decision_thread.join()
+            self._decision_loop.close()
+            self._decision_loop = None
+
+    def _on_decision_loop(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Call function(*args) on the decision log's event loop and wait for its result."""
+        async def call() -> Any:
+            result = function(*args)
+            return await result if asyncio.iscoroutine(result) else result
+        return asyncio.run_coroutine_threadsafe(call(), self._decision_loop).result()
+
+    def score(self, records: List[SourceRecord]) -> List[Dict[str, Any]]:
+        """
+        Score a batch of records with one model call.
+
+        Args:
+            records: Source records
+
+        Returns:
+            One decision per record, in order: its offset plus the prediction,
+            or an "error" message for records that are not valid transactions
+        """
+        parsed = [self._parse(record.payload) for record in records]
+        transactions = [item for item in parsed if isinstance(item, TransactionInput)]
+        if self._decision_loop is not None and transactions:
+            fresh_rows, stored, repeated = self._on_decision_loop(decision_log.split_decided, transactions)
+        else:
+            fresh_rows, stored, repeated = list(range(len(transactions))), {}, {}
+        fresh = [transactions[row] for row in fresh_rows] if stored or repeated else transactions
+        scored = self.service.predict_batch(fresh) if fresh else []
+        scored = [
+            {**result, "transaction_id": transaction.transaction_id}
+            if transaction.transaction_id is not None else result
+            for transaction, result in zip(fresh, scored)
+        ]
+        if self._decision_loop is not None and fresh:
+            self._on_decision_loop(decision_log.record_predictions, fresh, scored)
+        if stored or repeated:
+            scored = merge_decided(len(transactions), fresh_rows, scored, stored, repeated)
+        predictions = iter(scored)
+
+        decisions = []
+        for record, item in zip(records, parsed):
+            if isinstance(item, TransactionInput):
+                decisions.append({"offset": record.offset, **next(predictions)})
+            else:
+                decisions.append({"offset": record.offset, "error": item})
+        self.scored += len(transactions)
+        self.invalid += len(records) - len(transactions)
+        consumer_records_total.inc("scored", amount=len(transactions))
+        if len(records) > len(transactions):
+            consumer_records_total.inc("invalid", amount=len(records) - len(transactions))
+        return decisions
+
+    def _maybe_commit(self, force: bool = False) -> None:
+        """Commit the written offset if the commit interval elapsed."""
+        now = time.monotonic()
+        if not force and now - self._last_commit < self.commit_interval:
+            return
+        self._last_commit = now
+
+        if self.written_offset != self.committed_offset:
+            self.sink.flush()
+            if not self.source.manages_offsets and self.source.replayable:
+                self.checkpoint.save(self.source.name, self.written_offset)
+            self.source.commit(self.written_offset)
+            self.committed_offset = self.written_offset
+            consumer_committed_offset.set(self.committed_offset)
+
+        lag = self.source.lag(self.committed_offset)
+        if lag is not None:
+            consumer_lag.set(lag, self.source.lag_unit)
+        self._write_metrics()
+
+        if now - self._last_report >= 10.0:
+            self._last_report = now
+            stats = self.stats()
+            logger.info(
+                f"Consumer: {stats['scored']} scored, {stats['invalid']} invalid, "
+                f"{stats['records_per_second']:,.0f} records/s, committed offset {self.committed_offset}, "
+                f"lag {stats['lag']} {stats['lag_unit']}, {stats['buffered']} buffered"
+            )
+
+    def _write_metrics(self) -> None:
+        """Write the metrics textfile for a node exporter to pick up."""
+        if not self.metrics_path:
+            return
+        path = Path(self.metrics_path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(metrics_registry.render())
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to write consumer metrics to {path}: {e}")
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Consume until the source ends or stop() is called.
+
+        Returns:
+            Final statistics
+
+        Raises:
+            Exception: The source's error, if reading it failed
+        """
+        if self.source.manages_offsets:
+            offset = self.source.committed()
+        elif self.source.replayable:
+            offset = self.checkpoint.load(self.source.name)
+        else:
+            offset = 0
+        self.source.start(offset)
+        self.started_offset = self.written_offset = self.committed_offset = offset
+        self._started_at = time.monotonic()
+        self._last_commit = self._last_report = self._started_at
+        logger.info(
+            f"Consuming {self.source.name} from offset {offset} "
+            f"(batch {self.batch_size}, linger {self.linger * 1000:.1f} ms)"
+        )
+
+        if self.store_decisions:
+            self._start_decisions()
+        self._reader = threading.Thread(target=self._read_loop, name="consumer-reader", daemon=True)
+        self._reader.start()
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    break
+                with stage_duration.time("consumer_batch"):
+                    self.sink.write(self.score(batch))
+                self.written_offset = batch[-1].offset
+                self._maybe_commit()
+        finally:
+            self._stopping.set()
+            self._maybe_commit(force=True)
+            self.sink.close()
+            self.source.close()
+            self._reader.join(timeout=1.0)
+            if self._decision_loop is not None:
+                self._stop_decisions()
+
+        stats = self.stats()
+        logger.info(
+            f"Consumer finished: {stats['scored']} scored, {stats['invalid']} invalid, "
+            f"{stats['records_per_second']:,.0f} records/s, committed offset {self.committed_offset}"
+        )
+        if self._reader_error is not None:
+            raise self._reader_error
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Get throughput, offsets and lag."""
+        elapsed = max(time.monotonic() - self._started_at, 1e-9) if self._started_at else 0.0
+        handled = self.scored + self.invalid
+        return {
+            "source": self.source.name,
+            "scored": self.scored,
+            "invalid": self.invalid,
+            "records_per_second": handled / elapsed if elapsed else 0.0,
+            "started_offset": self.started_offset,
+            "committed_offset": self.committed_offset,
+            "lag": self.source.lag(self.committed_offset),
+            "lag_unit": self.source.lag_unit,
+            "buffered": self._buffer.qsize()
+        }
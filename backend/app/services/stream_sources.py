@@ -0,0 +1,539 @@
+"""
+Stream consumer I/O module.
+Transaction sources, decision sinks and offset checkpoints for the stream
+consumer worker (app.services.stream_consumer).
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional, Union
+
+import orjson
+from loguru import logger
+
+
+class SourceRecord(NamedTuple):
+    """One raw transaction record and the source offset just after it."""
+
+    offset: int
+    payload: bytes
+
+
+class TransactionSource(ABC):
+    """
+    Source of newline-delimited JSON transaction records.
+
+    poll() is called from a single reader thread. Offsets are positions
+    after a record, so committing a record's offset means every record up to
+    and including it is done, and restarting from it resumes with the next.
+
+    Attributes:
+        name: Stable identifier, used as the checkpoint key
+        replayable: Whether reading can resume from a committed offset
+        manages_offsets: Whether commit() stores the offset at the source
+            (a broker consumer group), instead of the worker's checkpoint file
+        lag_unit: Unit of offsets and lag(), "bytes" or "records"
+    """
+
+    name = "source"
+    replayable = True
+    manages_offsets = False
+    lag_unit = "records"
+
+    def start(self, offset: int) -> None:
+        """Open the source, positioned at a committed offset."""
+
+    @abstractmethod
+    def poll(self, timeout: float) -> Optional[List[SourceRecord]]:
+        """
+        Read the records that are available.
+
+        Args:
+            timeout: Longest time to wait for a record
+
+        Returns:
+            Records in source order (empty if none arrived in time), or None
+            once the source is exhausted
+        """
+
+    def committed(self) -> int:
+        """Offset committed at the source (manages_offsets sources only)."""
+        return 0
+
+    def commit(self, offset: int) -> None:
+        """Acknowledge every record up to offset."""
+
+    def lag(self, offset: int) -> Optional[float]:
+        """Backlog after offset in lag_unit, or None if unknown."""
+        return None
+
+    def close(self) -> None:
+        """Release the source."""
+
+
+class FileSource(TransactionSource):
+    """
+    Tail of an NDJSON file or named pipe, like `tail -F`.
+
+    Offsets are byte positions. A regular file resumes at the committed
+    offset, is followed as it grows, and is reopened from the start when it
+    is replaced (rotation) or truncated. A named pipe is read as it arrives
+    and reopened when its writers close; pipes cannot seek, so their offsets
+    count bytes since the worker started and are not resumed.
+    """
+
+    lag_unit = "bytes"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        follow: bool = True,
+        poll_interval: float = 0.05,
+        max_line_bytes: int = 65536
+    ):
+        """
+        Initialize a file source.
+
+        Args:
+            path: File or named pipe
+            follow: Wait for more data at the end of a regular file or when a
+                pipe's writers close, instead of ending the stream
+            poll_interval: Sleep between end-of-file checks
+            max_line_bytes: Longest accepted record; longer ones are passed on
+                truncated, so they fail to parse and are reported as invalid
+        """
+        self.path = Path(path)
+        self.name = f"file:{self.path.resolve()}"
+        self.follow = follow
+        self.poll_interval = poll_interval
+        self.max_line_bytes = max_line_bytes
+        self.is_pipe = self.path.exists() and stat.S_ISFIFO(self.path.stat().st_mode)
+        self.replayable = not self.is_pipe
+        self._file: Optional[BinaryIO] = None
+        self._offset = 0
+
+    def _open(self, offset: int) -> None:
+        """(Re)open the file at offset."""
+        if self._file is not None:
+            self._file.close()
+        # Opening a pipe blocks until a writer connects
+        self._file = open(self.path, "rb")
+        self._offset = 0
+        if self.is_pipe:
+            return
+        size = os.fstat(self._file.fileno()).st_size
+        if offset > size:
+            logger.warning(f"{self.path} is shorter than the committed offset {offset}, reading from the start")
+            offset = 0
+        self._file.seek(offset)
+        self._offset = offset
+
+    def start(self, offset: int) -> None:
+        """Open the file at the committed offset."""
+        self._open(offset)
+
+    def _replaced(self) -> bool:
+        """Whether the path now names another file, or the file shrank below the read position."""
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(self._file.fileno())
+        return (current.st_ino, current.st_dev) != (opened.st_ino, opened.st_dev) or current.st_size < self._offset
+
+    def _skip_line(self) -> int:
+        """Discard the rest of an oversized line; returns the bytes skipped."""
+        skipped = 0
+        while True:
+            piece = self._file.readline(self.max_line_bytes)
+            skipped += len(piece)
+            if not piece or piece.endswith(b"\n"):
+                return skipped
+
+    def poll(self, timeout: float) -> Optional[List[SourceRecord]]:
+        """Read complete lines available now, waiting up to timeout at end of file."""
+        records: List[SourceRecord] = []
+        while len(records) < 1024:
+            line = self._file.readline(self.max_line_bytes + 1)
+            if len(line) > self.max_line_bytes and not line.endswith(b"\n"):
+                self._offset += len(line) + self._skip_line()
+                records.append(SourceRecord(self._offset, line))
+                continue
+            if line.endswith(b"\n") or (line and (self.is_pipe or not self.follow)):
+                # Pipes (writer closed) and files read once may end without a newline
+                self._offset += len(line)
+                if line.strip():
+                    records.append(SourceRecord(self._offset, line))
+                continue
+            if line:
+                # A writer is mid-line; read it again once it is complete
+                self._file.seek(self._offset)
+            if records:
+                return records
+
+            # End of data
+            if self.is_pipe:
+                if not self.follow:
+                    return None
+                self._open(0)
+                return records
+            if self._replaced():
+                logger.info(f"{self.path} was replaced or truncated, reading it from the start")
+                self._open(0)
+                return records
+            if not self.follow:
+                return None
+            time.sleep(min(self.poll_interval, timeout))
+            return records
+        return records
+
+    def lag(self, offset: int) -> Optional[float]:
+        """Bytes written to the file after offset."""
+        if self.is_pipe:
+            return None
+        try:
+            return max(os.stat(self.path).st_size - offset, 0)
+        except FileNotFoundError:
+            return None
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class UnixSocketSource(TransactionSource):
+    """
+    NDJSON records written by a producer to a Unix socket.
+
+    One producer connection is served at a time. A socket cannot replay, so
+    at-least-once delivery is left to the producer: on every commit the
+    worker writes back one line with the number of records of the current
+    connection that are done, and a producer that reconnects resends what
+    was not acknowledged. Offsets count records since the worker started.
+    """
+
+    replayable = False
+
+    def __init__(self, path: Union[str, Path], max_line_bytes: int = 65536):
+        """
+        Initialize a socket source.
+
+        Args:
+            path: Socket path to listen on
+            max_line_bytes: Longest accepted record; longer ones are passed on
+                truncated, so they fail to parse and are reported as invalid
+        """
+        self.path = str(path)
+        self.name = f"unix:{self.path}"
+        self.max_line_bytes = max_line_bytes
+        self._listener: Optional[socket.socket] = None
+        self._connection: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._skipping = False
+        self._sequence = 0
+        self._connection_start = 0
+
+    def start(self, offset: int) -> None:
+        """Listen on the socket path."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.path)
+        self._listener.listen(1)
+        self._sequence = offset
+        logger.info(f"Listening for transactions on {self.path}")
+
+    def poll(self, timeout: float) -> Optional[List[SourceRecord]]:
+        """Accept a producer if none is connected, then read the complete lines it sent."""
+        if self._connection is None:
+            self._listener.settimeout(timeout)
+            try:
+                connection, _ = self._listener.accept()
+            except socket.timeout:
+                return []
+            with self._lock:
+                self._connection = connection
+                self._connection_start = self._sequence
+            self._buffer = b""
+            self._skipping = False
+
+        self._connection.settimeout(timeout)
+        try:
+            data = self._connection.recv(1 << 16)
+        except socket.timeout:
+            return []
+        except OSError:
+            data = b""
+        if not data:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+            return []
+
+        records: List[SourceRecord] = []
+        *lines, self._buffer = (self._buffer + data).split(b"\n")
+        for line in lines:
+            if self._skipping:
+                self._skipping = False
+                continue
+            if line.strip():
+                self._sequence += 1
+                records.append(SourceRecord(self._sequence, line[:self.max_line_bytes + 1]))
+        if len(self._buffer) > self.max_line_bytes:
+            self._sequence += 1
+            records.append(SourceRecord(self._sequence, self._buffer[:self.max_line_bytes + 1]))
+            self._buffer = b""
+            self._skipping = True
+        return records
+
+    def commit(self, offset: int) -> None:
+        """Acknowledge the current connection's records up to offset."""
+        with self._lock:
+            if self._connection is None or offset <= self._connection_start:
+                return
+            try:
+                self._connection.sendall(b"%d\n" % (offset - self._connection_start))
+            except OSError as e:
+                logger.warning(f"Could not acknowledge records to the producer: {e}")
+
+    def close(self) -> None:
+        """Close the connection and the listener."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+class QueueAdapter(TransactionSource):
+    """
+    Base for message queue sources (a broker topic partition).
+
+    The broker owns the committed offset (a consumer group), so the worker
+    calls commit() instead of writing its checkpoint file. Offsets are
+    record positions: a record's offset is its index plus one.
+    """
+
+    manages_offsets = True
+
+
+class InMemoryQueue(QueueAdapter):
+    """
+    In-process stand-in for a broker queue, for tests and local runs.
+
+    Published records are kept in an append-only log, and records after the
+    committed offset are redelivered when a consumer starts, as a broker
+    would after a crash. close_topic() ends the stream once it is read.
+    """
+
+    def __init__(self, name: str = "memory"):
+        """Initialize an empty queue."""
+        self.name = f"memory:{name}"
+        self._log: List[bytes] = []
+        self._position = 0
+        self._committed = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def publish(self, record: Union[bytes, Dict[str, Any]]) -> int:
+        """
+        Append a record.
+
+        Args:
+            record: Raw JSON bytes, or a transaction dictionary
+
+        Returns:
+            Offset of the record
+        """
+        payload = record if isinstance(record, bytes) else orjson.dumps(record)
+        with self._condition:
+            self._log.append(payload)
+            self._condition.notify_all()
+            return len(self._log)
+
+    def close_topic(self) -> None:
+        """End the stream after the published records."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def start(self, offset: int) -> None:
+        """Redeliver from the committed offset."""
+        with self._condition:
+            self._position = offset
+
+    def poll(self, timeout: float) -> Optional[List[SourceRecord]]:
+        """Take the records published since the last poll."""
+        with self._condition:
+            if self._position >= len(self._log) and not self._closed:
+                self._condition.wait(timeout)
+            if self._position >= len(self._log):
+                return None if self._closed else []
+            start, self._position = self._position, len(self._log)
+            return [
+                SourceRecord(offset, payload)
+                for offset, payload in enumerate(self._log[start:], start=start + 1)
+            ]
+
+    def committed(self) -> int:
+        """Committed offset of the consumer."""
+        with self._condition:
+            return self._committed
+
+    def commit(self, offset: int) -> None:
+        """Store the committed offset."""
+        with self._condition:
+            self._committed = max(self._committed, offset)
+
+    def lag(self, offset: int) -> Optional[float]:
+        """Records published after offset."""
+        with self._condition:
+            return len(self._log) - offset
+
+
+class DecisionSink(ABC):
+    """Destination of scored decisions, written in source order."""
+
+    @abstractmethod
+    def write(self, decisions: List[Dict[str, Any]]) -> None:
+        """Write a batch of decisions."""
+
+    def flush(self) -> None:
+        """Make written decisions durable; called before every commit."""
+
+    def close(self) -> None:
+        """Flush and release the sink."""
+        self.flush()
+
+
+class FileSink(DecisionSink):
+    """NDJSON decisions appended to a file, or written to stdout for "-"."""
+
+    def __init__(self, path: Union[str, Path], fsync: bool = False):
+        """
+        Initialize a file sink.
+
+        Args:
+            path: Output file, "-" for stdout
+            fsync: fsync the file on every flush (not for stdout)
+        """
+        self.path = str(path)
+        self.fsync = fsync and self.path != "-"
+        if self.path == "-":
+            self._file = sys.stdout.buffer
+        else:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+
+    def write(self, decisions: List[Dict[str, Any]]) -> None:
+        """Append one JSON line per decision."""
+        self._file.write(b"".join(orjson.dumps(decision) + b"\n" for decision in decisions))
+
+    def flush(self) -> None:
+        """Flush (and optionally fsync) the file."""
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self.flush()
+        if self.path != "-":
+            self._file.close()
+
+
+class InMemorySink(DecisionSink):
+    """Decisions kept in a list, for tests and local runs."""
+
+    def __init__(self):
+        """Initialize an empty sink."""
+        self.decisions: List[Dict[str, Any]] = []
+
+    def write(self, decisions: List[Dict[str, Any]]) -> None:
+        """Keep the decisions."""
+        self.decisions.extend(decisions)
+
+
+class OffsetCheckpoint:
+    """
+    Committed offsets per source, in one atomically replaced JSON file.
+
+    Used for sources that do not store offsets themselves.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize a checkpoint file."""
+        self.path = Path(path)
+
+    def load(self, source: str) -> int:
+        """Committed offset of a source, 0 if none."""
+        try:
+            return int(json.loads(self.path.read_text())[source]["offset"])
+        except (FileNotFoundError, KeyError, ValueError, TypeError):
+            return 0
+
+    def save(self, source: str, offset: int) -> None:
+        """Durably record a source's committed offset."""
+        try:
+            checkpoints = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            checkpoints = {}
+        checkpoints[source] = {"offset": offset, "committed_at": time.time()}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoints, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def open_source(uri: str, follow: bool = True, max_line_bytes: int = 65536) -> TransactionSource:
+    """
+    Build a source from a command-line URI.
+
+    Args:
+        uri: "unix:<socket path>", or "file:<path>" / a plain path for a file
+            or named pipe
+        follow: Keep reading a file as it grows
+        max_line_bytes: Longest accepted record
+
+    Returns:
+        The source
+    """
+    if uri.startswith("unix:"):
+        return UnixSocketSource(uri[len("unix:"):], max_line_bytes)
+    if uri.startswith("file:"):
+        uri = uri[len("file:"):]
+    return FileSource(uri, follow=follow, max_line_bytes=max_line_bytes)
+
+
+def open_sink(uri: str, fsync: bool = False) -> DecisionSink:
+    """
+    Build a sink from a command-line URI.
+
+    Args:
+        uri: "-" for stdout, "file:<path>" or a plain path
+        fsync: fsync the file before every commit
+
+    Returns:
+        The sink
+    """
+    if uri.startswith("file:"):
+        uri = uri[len("file:"):]
+    return FileSink(uri, fsync=fsync)
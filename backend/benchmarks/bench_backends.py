@@ -0,0 +1,113 @@
+"""
+Inference backend comparison benchmark.
+
+Scores the same synthetic batches with every available inference backend
+(native XGBoost inplace_predict, the pickled XGBClassifier's sklearn
+predict_proba, ONNX Runtime) and reports numerical parity against the
+sklearn wrapper, then per-row latency and throughput for batch sizes from
+1 to 10k. The ONNX model is the build-time export for the configured
+artifact version if one exists, otherwise a temporary export.
+
+Usage (from backend/):
+    python -m benchmarks.bench_backends [--threads 1] [--repeat-rows 20000]
+"""
+
+import argparse
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.inference_backends import (
+    InferenceBackend,
+    OnnxRuntimeBackend,
+    SklearnBackend,
+    XGBoostNativeBackend,
+    export_onnx,
+    onnx_model_path
+)
+from app.core.model_loader import ModelArtifacts, model_loader
+from app.schemas.transaction import TransactionInput
+from app.services.prediction_service import prediction_service
+from benchmarks.bench_tree_ensemble import time_per_row
+from benchmarks.synthetic import generate_transactions
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+
+def synthetic_features(artifacts: ModelArtifacts, n: int, seed: int) -> np.ndarray:
+    """Feature matrix of n synthetic transactions, built by the service's preprocessing."""
+    transactions = [TransactionInput(**payload) for payload in generate_transactions(n, seed=seed)]
+    features, _, _ = prediction_service.preprocess_batch(transactions, artifacts)
+    return features
+
+
+def onnx_backend(artifacts: ModelArtifacts, threads: int, workdir: Path) -> InferenceBackend:
+    """ONNX Runtime backend on the build-time export, or on a temporary one."""
+    path = onnx_model_path(get_settings().onnx_models_dir, artifacts.version)
+    if not path.exists():
+        path = export_onnx(artifacts.model, len(artifacts.feature_names), workdir / path.name)
+        print(f"No ONNX export for version {artifacts.version}, using a temporary one")
+    return OnnxRuntimeBackend(path, threads)
+
+
+def risk_levels(probabilities: np.ndarray) -> np.ndarray:
+    """Risk level index (0 LOW, 1 MEDIUM, 2 HIGH) of each probability."""
+    settings = get_settings()
+    return np.digitize(probabilities, [settings.medium_risk_threshold, settings.high_risk_threshold])
+
+
+def main() -> None:
+    """Run the parity check and latency/throughput comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=1, help="Threads per call for every backend, 0 for defaults")
+    parser.add_argument("--repeat-rows", type=int, default=20000, help="Rows scored per measurement")
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic data seed")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    settings = get_settings()
+    artifacts = model_loader.load_artifacts(
+        settings.model_path, settings.encoder_path, settings.metadata_path, settings.feature_importance_path
+    )
+    pickled, _ = model_loader.load_model(settings.model_path)
+    features = synthetic_features(artifacts, max(BATCH_SIZES), args.seed)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        backends: Dict[str, InferenceBackend] = {
+            "sklearn": SklearnBackend(pickled, args.threads),
+            "xgboost": XGBoostNativeBackend(artifacts.model, args.threads)
+        }
+        try:
+            backends["onnxruntime"] = onnx_backend(artifacts, args.threads, Path(workdir))
+        except ImportError as e:
+            print(f"Skipping onnxruntime: {e} (pip install onnxruntime onnxmltools onnx)")
+
+        reference = backends["sklearn"].predict(features)
+        reference_levels = risk_levels(reference)
+        print(f"Artifact version {artifacts.version}, {len(features):,} synthetic rows, threads={args.threads}")
+        print()
+        print(f"{'backend':>12} {'max |diff|':>11} {'risk level changes':>19}")
+        for name, backend in backends.items():
+            probabilities = backend.predict(features)
+            changed = int(np.count_nonzero(risk_levels(probabilities) != reference_levels))
+            print(f"{name:>12} {float(np.max(np.abs(probabilities - reference))):>11.2e} {changed:>19}")
+
+        print()
+        header = "".join(f" {name + ' us/row':>19} {'rows/s':>10}" for name in backends)
+        print(f"{'batch':>7}{header}")
+        for batch_size in BATCH_SIZES:
+            batch = features[:batch_size]
+            line = f"{batch_size:>7}"
+            for backend in backends.values():
+                seconds = time_per_row(backend.predict, batch, args.repeat_rows)
+                line += f" {seconds * 1e6:>19.2f} {1 / seconds:>10,.0f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
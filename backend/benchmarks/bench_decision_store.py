@@ -0,0 +1,131 @@
+"""
+Decision store benchmark.
+
+Measures SQLite (WAL) write throughput for decisions committed one per
+transaction versus in groups of increasing size, for each synchronous level,
+then the DecisionLog front used by the request path: the cost of record()
+on the event loop, the time for the writer to drain, and lookup latency of
+pending and committed decisions. Decisions are synthetic; no model is
+needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_decision_store [--decisions 20000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import orjson
+
+from app.core.config import get_settings
+from app.schemas.transaction import TransactionInput
+from app.services.decision_store import DecisionLog, DecisionRow, SQLiteDecisionStore
+from benchmarks.bench_service import summarize
+from benchmarks.synthetic import generate_transactions
+
+GROUP_SIZES = (1, 8, 64, 512)
+SYNCHRONOUS_LEVELS = ("NORMAL", "FULL")
+RESULT = {
+    "is_fraud": False,
+    "fraud_probability": 0.0123,
+    "risk_level": "LOW",
+    "recommended_action": "ALLOW",
+    "confidence": 0.9754,
+    "explanation": "Low-risk TRANSFER transaction appears legitimate"
+}
+
+
+def synthetic_decisions(n: int, prefix: str) -> Tuple[List[TransactionInput], List[DecisionRow]]:
+    """Transactions with unique ids and their stored rows."""
+    transactions = [
+        TransactionInput(**payload, transaction_id=f"{prefix}-{index}")
+        for index, payload in enumerate(generate_transactions(n, seed=5))
+    ]
+    decision = orjson.dumps(RESULT)
+    rows = [
+        (
+            transaction.transaction_id, "2026-01-01T00:00:00", "benchmark", "decided", None,
+            orjson.dumps(transaction.model_dump(exclude={"transaction_id"}, exclude_none=True)), decision
+        )
+        for transaction in transactions
+    ]
+    return transactions, rows
+
+
+def bench_group_commit(workdir: Path, n: int) -> None:
+    """Print decisions/s for every commit group size and synchronous level."""
+    _, rows = synthetic_decisions(n, "group")
+    print(f"{'synchronous':>12} {'per commit':>11} {'decisions/s':>12} {'us/decision':>12}")
+    for synchronous in SYNCHRONOUS_LEVELS:
+        for group in GROUP_SIZES:
+            store = SQLiteDecisionStore(workdir / f"{synchronous}-{group}.sqlite3", synchronous)
+            count = min(n, group * 500)  # bound the slow one-per-commit runs
+            start = time.perf_counter()
+            for offset in range(0, count, group):
+                store.write(rows[offset:offset + group], [])
+            elapsed = time.perf_counter() - start
+            store.close()
+            print(f"{synchronous:>12} {group:>11} {count / elapsed:>12,.0f} {elapsed / count * 1e6:>12.1f}")
+
+
+async def bench_decision_log(workdir: Path, n: int) -> Dict[str, Any]:
+    """Measure the request-path cost of recording and looking up decisions."""
+    settings = get_settings()
+    decision_log = DecisionLog()
+    decision_log.start(SQLiteDecisionStore(workdir / "log.sqlite3", settings.decision_store_synchronous))
+    transactions, _ = synthetic_decisions(n, "log")
+    results = [RESULT] * len(transactions)
+
+    record_samples = []
+    start = time.perf_counter()
+    for index, transaction in enumerate(transactions):
+        begin = time.perf_counter()
+        decision_log.record([transaction], [results[index]])
+        record_samples.append(time.perf_counter() - begin)
+        if index % 64 == 63:
+            await asyncio.sleep(0)  # let the writer run, as between requests
+    record_wall = time.perf_counter() - start
+    while decision_log.stats()["pending_writes"]:
+        await asyncio.sleep(0.001)
+    drain_wall = time.perf_counter() - start
+
+    lookup_samples = []
+    for transaction in transactions[:2000]:
+        begin = time.perf_counter()
+        await decision_log.find(transaction.transaction_id)
+        lookup_samples.append(time.perf_counter() - begin)
+    stats = decision_log.stats()
+    await decision_log.stop()
+    return {
+        "record": summarize(record_samples, record_wall, 1),
+        "stored_per_s": round(n / drain_wall, 2),
+        "commits": stats["commits"],
+        "lookup_committed": summarize(lookup_samples, sum(lookup_samples), 1)
+    }
+
+
+def main() -> None:
+    """Run the group commit and DecisionLog measurements."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--decisions", type=int, default=20000, help="Decisions written per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        bench_group_commit(Path(workdir), args.decisions)
+        results = asyncio.run(bench_decision_log(Path(workdir), args.decisions))
+
+    record, lookup = results["record"], results["lookup_committed"]
+    print()
+    print(
+        f"DecisionLog.record: p50 {record['p50_ms'] * 1000:.1f} us, p99 {record['p99_ms'] * 1000:.1f} us; "
+        f"{results['stored_per_s']:,.0f} decisions/s stored in {results['commits']} commits"
+    )
+    print(f"DecisionLog.find (committed): p50 {lookup['p50_ms'] * 1000:.1f} us, p99 {lookup['p99_ms'] * 1000:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
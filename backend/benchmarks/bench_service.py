@@ -0,0 +1,382 @@
+"""
+Scoring service benchmark with regression gates.
+
+Measures schema validation, the PredictionService entry points and the
+/predictions/single and /predictions/batch routes (in-process through the
+ASGI app, no network) on synthetic PaySim-like data, across batch sizes and
+concurrency levels. Feature contributions are only computed by the
+*.contributions* and *.explain.* cases, which measure their overhead per
+batch size (exact TreeSHAP and the Saabas approximation). Results are compared with a JSON baseline; the run
+exits with status 1 when p50/p99 latency or throughput of any case regress
+beyond the tolerance, and with status 2 when there is no baseline to compare
+with.
+
+Baselines are machine specific: record one on the machine that runs the
+gate, before the change under test.
+
+Usage (from backend/):
+    python -m benchmarks.bench_service --update-baseline    # record a baseline
+    python -m benchmarks.bench_service                      # compare against it
+    python -m benchmarks.bench_service --quick -k route     # fewer iterations, route cases only
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.synthetic import generate_transactions
+
+# Keep the cache, log sinks, metrics publishing and background features from
+# skewing the measurement; explicit environment variables still win
+BENCHMARK_ENVIRONMENT = {
+    "PREDICTION_CACHE_ENABLED": "false",
+    "PREDICTION_LOG_SAMPLE_RATE": "0",
+    "LOG_LEVEL": "WARNING",
+    "LOG_FILE": "",
+    "METRICS_DIR": "",
+    "SHADOW_ENABLED": "false",
+    "ARTIFACT_WATCH_ENABLED": "false",
+    "CONTRIBUTIONS_MODE": "on_request"
+}
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "service.json"
+BATCH_SIZES = (1, 10, 100)
+SINGLE_CONCURRENCY = (1, 8, 32)
+BATCH_CONCURRENCY = (1, 8)
+WARMUP_ITERATIONS = 20
+
+
+def summarize(samples: Sequence[float], wall_seconds: float, rows_per_op: int) -> Dict[str, float]:
+    """
+    Reduce per-operation latencies to the gated statistics.
+
+    Args:
+        samples: Latency of each operation in seconds
+        wall_seconds: Wall time of the whole measurement
+        rows_per_op: Transactions handled by one operation
+
+    Returns:
+        Latency percentiles in milliseconds and throughput per second
+    """
+    latencies = np.asarray(samples) * 1000.0
+    throughput = len(samples) / wall_seconds
+    return {
+        "operations": len(samples),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 4),
+        "mean_ms": round(float(latencies.mean()), 4),
+        "throughput_per_s": round(throughput, 2),
+        "rows_per_s": round(throughput * rows_per_op, 2)
+    }
+
+
+def measure_sync(fn: Callable, payloads: Sequence[Any], iterations: int, rows_per_op: int = 1) -> Dict[str, float]:
+    """Time fn over the payloads, cycling through them for the given iterations."""
+    for i in range(WARMUP_ITERATIONS):
+        fn(payloads[i % len(payloads)])
+    samples = []
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for i in range(iterations):
+        payload = payloads[i % len(payloads)]
+        t0 = perf_counter()
+        fn(payload)
+        samples.append(perf_counter() - t0)
+    return summarize(samples, perf_counter() - start, rows_per_op)
+
+
+async def measure_requests(
+    client,
+    url: str,
+    bodies: Sequence[Any],
+    requests: int,
+    concurrency: int,
+    rows_per_op: int
+) -> Dict[str, float]:
+    """POST bodies to url from concurrent clients and time each request."""
+    async def post(body: Any) -> None:
+        response = await client.post(url, json=body)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}: {response.text[:200]}")
+
+    for i in range(WARMUP_ITERATIONS):
+        await post(bodies[i % len(bodies)])
+
+    samples: List[float] = []
+    next_request = 0
+
+    async def worker() -> None:
+        nonlocal next_request
+        while next_request < requests:
+            body = bodies[next_request % len(bodies)]
+            next_request += 1
+            t0 = time.perf_counter()
+            await post(body)
+            samples.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - start, rows_per_op)
+
+
+async def run_cases(iterations: int, requests: int, selected: Callable[[str], bool]) -> Dict[str, Dict[str, float]]:
+    """
+    Run every selected benchmark case inside the application lifespan.
+
+    Args:
+        iterations: Calls per service or validation case
+        requests: Requests per route case
+        selected: Predicate on case names
+
+    Returns:
+        Statistics per case name
+    """
+    import httpx
+
+    from app.core.config import get_settings
+    from app.main import app
+    from app.schemas.transaction import BatchTransactionInput, TransactionInput
+    from app.services.explainer import explainer
+    from app.services.prediction_service import prediction_service
+
+    payloads = generate_transactions(5000, seed=42)
+    transactions = [TransactionInput.model_validate(payload) for payload in payloads]
+    batches = {
+        size: [payloads[i:i + size] for i in range(0, len(payloads) - size + 1, size)]
+        for size in BATCH_SIZES
+    }
+    results: Dict[str, Dict[str, float]] = {}
+
+    def run_sync(name: str, fn: Callable, inputs: Sequence[Any], rows_per_op: int = 1, calls: int = 0) -> None:
+        if selected(name):
+            results[name] = measure_sync(fn, inputs, calls or iterations, rows_per_op)
+            report_progress(name, results[name])
+
+    async with app.router.lifespan_context(app):
+        run_sync("validate.single", TransactionInput.model_validate, payloads)
+        run_sync(
+            "validate.batch.100",
+            lambda batch: BatchTransactionInput.model_validate({"transactions": batch}),
+            batches[100],
+            rows_per_op=100
+        )
+        run_sync("service.preprocess_transaction", prediction_service.preprocess_transaction, transactions)
+        velocity_store = prediction_service.velocity_store
+        if velocity_store is not None:
+            # 2,000 accounts sending to each other, so windows fill up and expire
+            observations = [
+                (f"C{i % 2000}", f"C{(i * 7 + 1) % 2000}", payload["step"], payload["amount"], payload["type"])
+                for i, payload in enumerate(payloads)
+            ]
+            run_sync("service.velocity_observe", lambda args: velocity_store.observe(*args), observations)
+        run_sync("service.predict", prediction_service.predict, transactions)
+        run_sync("service.predict_with_explanation", prediction_service.predict_with_explanation, transactions)
+        for size in BATCH_SIZES:
+            groups = [transactions[i:i + size] for i in range(0, len(transactions) - size + 1, size)]
+            run_sync(f"service.predict_batch.{size}", prediction_service.predict_batch, groups, rows_per_op=size)
+        # Exact TreeSHAP costs milliseconds per row, so these cases make fewer calls
+        settings = get_settings()
+        for approximate, method in ((False, "contributions"), (True, "contributions_approx")):
+            settings.contributions_approximate = approximate
+            try:
+                for size in BATCH_SIZES:
+                    groups = [transactions[i:i + size] for i in range(0, len(transactions) - size + 1, size)]
+                    run_sync(
+                        f"service.{method}.{size}", explainer.explain_rows, groups,
+                        rows_per_op=size, calls=max(iterations // size, 20)
+                    )
+            finally:
+                settings.contributions_approximate = False
+
+        prefix = get_settings().api_prefix
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for concurrency in SINGLE_CONCURRENCY:
+                name = f"route.single.c{concurrency}"
+                if selected(name):
+                    results[name] = await measure_requests(
+                        client, f"{prefix}/predictions/single", payloads, requests, concurrency, 1
+                    )
+                    report_progress(name, results[name])
+            for size in BATCH_SIZES:
+                bodies = [{"transactions": batch} for batch in batches[size]]
+                for concurrency in BATCH_CONCURRENCY:
+                    name = f"route.batch.{size}.c{concurrency}"
+                    if selected(name):
+                        results[name] = await measure_requests(
+                            client, f"{prefix}/predictions/batch", bodies, requests, concurrency, size
+                        )
+                        report_progress(name, results[name])
+                name = f"route.batch.{size}.explain.c1"
+                if selected(name):
+                    results[name] = await measure_requests(
+                        client, f"{prefix}/predictions/batch?explain=true", bodies,
+                        max(requests // size, 20), 1, size
+                    )
+                    report_progress(name, results[name])
+    return results
+
+
+def report_progress(name: str, stats: Dict[str, float]) -> None:
+    """Print one measured case."""
+    print(
+        f"{name:<36} p50 {stats['p50_ms']:>9.3f} ms   p99 {stats['p99_ms']:>9.3f} ms   "
+        f"{stats['throughput_per_s']:>10.1f} ops/s   {stats['rows_per_s']:>10.1f} rows/s",
+        flush=True
+    )
+
+
+def environment_info() -> Dict[str, Any]:
+    """Describe the machine a result set was measured on."""
+    import xgboost
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "xgboost": xgboost.__version__
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    p99_tolerance: float,
+    min_delta_ms: float
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Latency regresses when it exceeds the baseline by more than the relative
+    tolerance and by more than min_delta_ms, which keeps microsecond cases
+    from failing on timer noise. Throughput regresses when it drops by more
+    than the tolerance.
+
+    Args:
+        results: Current statistics per case
+        baseline: Baseline statistics per case
+        tolerance: Allowed relative regression of p50 and throughput
+        p99_tolerance: Allowed relative regression of p99
+        min_delta_ms: Absolute latency slack in milliseconds
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    print()
+    print(f"{'case':<36} {'p50 ms':>18} {'p99 ms':>18} {'ops/s':>20}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<36} (not in baseline)")
+            continue
+        failures = []
+        for key, allowed in (("p50_ms", tolerance), ("p99_ms", p99_tolerance)):
+            limit = max(base[key] * (1 + allowed), base[key] + min_delta_ms)
+            if current[key] > limit:
+                failures.append(f"{key} {base[key]:.3f} -> {current[key]:.3f}")
+        if current["throughput_per_s"] < base["throughput_per_s"] * (1 - tolerance):
+            failures.append(
+                f"throughput {base['throughput_per_s']:.1f} -> {current['throughput_per_s']:.1f}/s"
+            )
+        print(
+            f"{name:<36} {_change(base['p50_ms'], current['p50_ms']):>18} "
+            f"{_change(base['p99_ms'], current['p99_ms']):>18} "
+            f"{_change(base['throughput_per_s'], current['throughput_per_s']):>20}"
+            f"{'   REGRESSED' if failures else ''}"
+        )
+        regressions.extend(f"{name}: {failure}" for failure in failures)
+    return regressions
+
+
+def _change(before: float, after: float) -> str:
+    """Format a value with its relative change against the baseline."""
+    delta = (after - before) / before * 100 if before else 0.0
+    return f"{after:.3f} ({delta:+.0f}%)"
+
+
+def main() -> None:
+    """Run the benchmark and gate on the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results to the baseline instead of comparing")
+    parser.add_argument("--output", type=Path, help="Also write results to this JSON file")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per service case")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route case")
+    parser.add_argument("--quick", action="store_true", help="Run a tenth of the iterations and requests")
+    parser.add_argument("-k", dest="filter", default="", help="Only run cases whose name contains this string")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p50/throughput regression")
+    parser.add_argument("--p99-tolerance", type=float, default=0.5, help="Allowed relative p99 regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.02, help="Latency changes below this never fail")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    for key, value in BENCHMARK_ENVIRONMENT.items():
+        os.environ.setdefault(key, value)
+
+    iterations, requests = args.iterations, args.requests
+    if args.quick:
+        iterations, requests = max(iterations // 10, 50), max(requests // 10, 50)
+
+    results = asyncio.run(run_cases(iterations, requests, lambda name: args.filter in name))
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": environment_info(),
+        "iterations": iterations,
+        "requests": requests,
+        "results": results
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.update_baseline:
+        baseline_report: Dict[str, Any] = {}
+        if args.baseline.exists():
+            baseline_report = json.loads(args.baseline.read_text())
+        # A filtered run only replaces the cases it measured
+        merged = {**baseline_report.get("results", {}), **results}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({**report, "results": merged}, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; record one with --update-baseline")
+        sys.exit(2)
+
+    baseline_report = json.loads(args.baseline.read_text())
+    base_environment: Optional[Dict[str, Any]] = baseline_report.get("environment")
+    if base_environment and base_environment != report["environment"]:
+        print(f"\nWarning: baseline was measured on a different environment: {base_environment}")
+
+    regressions = compare(
+        results,
+        baseline_report.get("results", {}),
+        args.tolerance,
+        args.p99_tolerance,
+        args.min_delta_ms
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond tolerance:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo regressions beyond tolerance")
+
+
+if __name__ == "__main__":
+    main()
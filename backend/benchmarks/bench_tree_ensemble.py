@@ -0,0 +1,67 @@
+"""
+Compiled tree ensemble benchmark.
+
+Checks numerical parity between the compiled flat-array evaluator and the
+XGBoost predict_proba it replaces, then reports per-row latency of both for
+batch sizes from 1 to 10k.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tree_ensemble [--repeat-rows 20000]
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.model_loader import model_loader
+from app.core.tree_ensemble import CompiledTreeEnsemble, parity_probe, verify_parity
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+
+def time_per_row(predict, features: np.ndarray, repeat_rows: int) -> float:
+    """Average seconds per row, repeating the call until repeat_rows rows are scored."""
+    predict(features)  # warm-up
+    repeats = max(1, repeat_rows // len(features))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(features)
+    return (time.perf_counter() - start) / (repeats * len(features))
+
+
+def main() -> None:
+    """Run the parity check and latency benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat-rows", type=int, default=20000, help="Rows scored per measurement")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    settings = get_settings()
+    model, _ = model_loader.load_model(settings.model_path)
+
+    start = time.perf_counter()
+    compiled = CompiledTreeEnsemble.from_booster(model)
+    print(f"Compiled {compiled.n_trees} trees in {time.perf_counter() - start:.3f}s")
+
+    probe = parity_probe(compiled, n_rows=max(BATCH_SIZES), seed=1)
+    print(f"Parity (with missing values): max |diff| = {verify_parity(compiled, model, probe):.2e}")
+    probe = np.nan_to_num(probe)
+    print(f"Parity (dense):               max |diff| = {verify_parity(compiled, model, probe):.2e}")
+
+    print()
+    print(f"{'batch':>7} {'predict_proba us/row':>22} {'compiled us/row':>17} {'speedup':>9}")
+    for batch_size in BATCH_SIZES:
+        features = probe[:batch_size]
+        reference = time_per_row(model.predict_proba, features, args.repeat_rows)
+        flat = time_per_row(compiled.predict_proba, features, args.repeat_rows)
+        print(
+            f"{batch_size:>7} {reference * 1e6:>22.2f} {flat * 1e6:>17.2f} "
+            f"{reference / flat:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
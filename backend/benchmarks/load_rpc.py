@@ -0,0 +1,144 @@
+"""
+RPC listener load test.
+
+Starts the API under uvicorn with the msgpack RPC listener enabled and
+drives the same synthetic transactions through POST
+/api/v1/predictions/single (httpx, keep-alive connections) and the RPC
+`predict` method (pipelined connections), with the same number of requests
+in flight, reporting throughput and latency percentiles of each. Client and
+server share the machine, so absolute numbers include the load generator.
+
+Usage (from backend/):
+    python -m benchmarks.load_rpc [--requests 3000] [--concurrency 1,8,32] [--connections 1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from itertools import cycle
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.api.rpc import RpcClient
+from benchmarks.bench_service import BENCHMARK_ENVIRONMENT, summarize
+from benchmarks.synthetic import generate_transactions
+
+HTTP_PORT = 18000
+RPC_PORT = 18001
+
+
+def start_server(http_port: int, rpc_port: int) -> subprocess.Popen:
+    """Start the API with the RPC listener in a subprocess and wait until it is healthy."""
+    env = {**BENCHMARK_ENVIRONMENT, **os.environ, "RPC_ENABLED": "true", "RPC_PORT": str(rpc_port)}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(http_port), "--log-level", "warning"],
+        env=env
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{http_port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not become healthy within 60s")
+
+
+async def drive(
+    call: Callable[[int, Dict[str, Any]], Awaitable[Any]],
+    payloads: List[Dict[str, Any]],
+    concurrency: int
+) -> Dict[str, float]:
+    """Send every payload with `concurrency` requests in flight and summarize the latencies."""
+    samples: List[float] = []
+    queue = iter(enumerate(payloads))
+
+    async def worker() -> None:
+        for index, payload in queue:
+            start = time.perf_counter()
+            await call(index, payload)
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - start, 1)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    """Run the HTTP and RPC measurements for every concurrency level."""
+    payloads = generate_transactions(args.requests, seed=11)
+    url = f"http://127.0.0.1:{args.http_port}/api/v1/predictions/single"
+    results: Dict[str, Dict[str, float]] = {}
+
+    for concurrency in args.concurrency:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=30) as http:
+            async def http_call(index: int, payload: Dict[str, Any]) -> Any:
+                response = await http.post(url, json=payload)
+                response.raise_for_status()
+                return response.json()
+
+            await drive(http_call, payloads[:50], concurrency)  # warm up connections
+            results[f"http.single.c{concurrency}"] = await drive(http_call, payloads, concurrency)
+            http_reference = await http_call(0, payloads[0])
+
+        clients = [await RpcClient.connect(port=args.rpc_port) for _ in range(args.connections)]
+        pool = cycle(clients)
+        try:
+            async def rpc_call(index: int, payload: Dict[str, Any]) -> Any:
+                return await next(pool).predict(payload)
+
+            await drive(rpc_call, payloads[:50], concurrency)
+            results[f"rpc.predict.c{concurrency}"] = await drive(rpc_call, payloads, concurrency)
+            rpc_reference = await rpc_call(0, payloads[0])
+        finally:
+            for client in clients:
+                await client.close()
+
+        if rpc_reference["fraud_probability"] != http_reference["fraud_probability"]:
+            raise AssertionError(f"RPC and HTTP disagree: {rpc_reference} vs {http_reference}")
+    return results
+
+
+def main() -> None:
+    """Start the server, run the load test and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per protocol and concurrency level")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 8, 32],
+        help="Comma-separated requests in flight"
+    )
+    parser.add_argument("--connections", type=int, default=1, help="RPC connections requests are pipelined over")
+    parser.add_argument("--http-port", type=int, default=HTTP_PORT)
+    parser.add_argument("--rpc-port", type=int, default=RPC_PORT)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    server = start_server(args.http_port, args.rpc_port)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print(f"{'case':<22} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>10}")
+    for name, stats in results.items():
+        print(f"{name:<22} {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['throughput_per_s']:>10,.0f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
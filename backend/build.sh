@@ -10,4 +10,10 @@ pip install -r requirements.txt
 mkdir -p logs
 mkdir -p models
 
+# ONNX Runtime inference backend: install it and export the model at build time
+if [ "${INFERENCE_BACKEND:-xgboost}" = "onnxruntime" ]; then
+    pip install "onnxruntime>=1.16.0" "onnxmltools>=1.12.0" "onnx>=1.15.0" "numpy>=1.26.0,<2.0.0"
+    python -m app.cli convert --onnx
+fi
+
 echo "Build completed successfully!"
@@ -1,3 +1,7 @@
 #!/usr/bin/env bash
 # Start the FastAPI application
+if [ "${ENVIRONMENT:-development}" = "production" ]; then
+    # Pre-fork workers sharing one copy of the model (see gunicorn.conf.py)
+    exec gunicorn app.main:app -c gunicorn.conf.py
+fi
 uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000}
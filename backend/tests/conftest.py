@@ -0,0 +1,70 @@
+"""
+Shared pytest fixtures.
+
+Tests run from backend/ (python -m pytest) against the model artifacts in
+models/.
+"""
+
+import os
+import warnings
+from typing import Any, Dict, Iterator
+
+# Keep test runs from writing log files and metrics snapshots
+os.environ.setdefault("LOG_FILE", "")
+os.environ.setdefault("METRICS_DIR", "")
+os.environ.setdefault("ARTIFACT_WATCH_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.core.model_loader import ModelArtifacts, model_loader
+
+
+@pytest.fixture(scope="session")
+def pickled_model():
+    """The pickled XGBClassifier, as trained."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model, _ = model_loader.load_model(get_settings().model_path)
+    return model
+
+
+@pytest.fixture(scope="session")
+def artifacts() -> ModelArtifacts:
+    """The active model artifacts, loaded once per session."""
+    settings = get_settings()
+    if not model_loader.is_loaded():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model_loader.load_all(
+                model_path=settings.model_path,
+                encoder_path=settings.encoder_path,
+                metadata_path=settings.metadata_path,
+                feature_importance_path=settings.feature_importance_path
+            )
+    return model_loader.artifacts
+
+
+@pytest.fixture
+def overrides() -> Dict[str, Any]:
+    """Settings applied for the duration of a test; parametrize or override to change them."""
+    return {}
+
+
+@pytest.fixture
+def settings(monkeypatch, overrides):
+    """The application settings, with overrides applied and undone after the test."""
+    settings = get_settings()
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    return settings
+
+
+@pytest.fixture
+def client(settings, artifacts) -> Iterator[TestClient]:
+    """A client of the app, started (lifespan included) with the test's settings."""
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,173 @@
+"""Admission control: deadlines, shedding and the overload policies of the routes."""
+
+import pytest
+
+from app.core import admission
+from app.core.admission import AdmissionController, AdmissionRejected, Deadline
+from app.core.executor import inference_executor
+
+TRANSACTION = {
+    "step": 1,
+    "type": "TRANSFER",
+    "amount": 181.0,
+    "oldbalanceOrg": 181.0,
+    "newbalanceOrig": 0.0,
+    "oldbalanceDest": 0.0,
+    "newbalanceDest": 0.0
+}
+
+
+class Clock:
+    """Stand-in for the time module, advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def perf_counter(self):
+        return self.now
+
+
+class StubExecutor:
+    """Executor whose latency estimate is set by the test."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def estimate_latency(self):
+        return self.latency
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission, "time", clock)
+    return clock
+
+
+def test_deadline_counts_down_from_creation(clock):
+    deadline = Deadline(0.5)
+    clock.now += 0.2
+
+    assert deadline.remaining() == pytest.approx(0.3)
+    assert deadline.timeout() == pytest.approx(0.3)
+    assert deadline.timeout(cap=0.1) == pytest.approx(0.1)
+
+    clock.now += 1.0
+    assert deadline.remaining() == pytest.approx(-0.7)
+    assert deadline.timeout(cap=5.0) == 0.0
+
+
+def test_deadline_without_budget_leaves_timeouts_alone(clock):
+    deadline = Deadline(None)
+    clock.now += 100.0
+
+    assert deadline.remaining() is None
+    assert deadline.timeout(cap=5.0) is None
+
+
+@pytest.mark.parametrize("overrides", [{"default_deadline_ms": 250.0}])
+def test_deadline_defaults_to_the_configured_budget(settings):
+    controller = AdmissionController(StubExecutor())
+
+    assert controller.deadline().budget == 0.25
+    assert controller.deadline(100.0).budget == 0.1
+    assert controller.deadline(0.0).budget is None
+
+
+@pytest.mark.parametrize("overrides", [{"admission_max_in_flight": 1}])
+def test_admit_sheds_past_the_in_flight_limit(settings):
+    controller = AdmissionController(StubExecutor())
+
+    with controller.admit(Deadline(None)):
+        with pytest.raises(AdmissionRejected) as rejected:
+            with controller.admit(Deadline(None)):
+                pass
+        assert rejected.value.reason == "in_flight"
+        assert controller.stats()["in_flight"] == 1
+    with controller.admit(Deadline(None)):
+        pass
+
+    stats = controller.stats()
+    assert stats["in_flight"] == 0
+    assert stats["admitted"] == 2
+    assert stats["shed"] == {"in_flight": 1}
+
+
+def test_admit_sheds_when_the_latency_estimate_exceeds_the_deadline(settings, clock):
+    controller = AdmissionController(StubExecutor(latency=0.05))
+
+    with controller.admit(Deadline(1.0)):
+        pass
+    with controller.admit(Deadline(None)):
+        pass
+    with pytest.raises(AdmissionRejected) as rejected:
+        with controller.admit(Deadline(0.01)):
+            pass
+    assert rejected.value.reason == "deadline"
+
+    # An expired deadline is shed even on an idle executor
+    controller.executor.latency = 0.0
+    expired = Deadline(0.01)
+    clock.now += 0.02
+    with pytest.raises(AdmissionRejected):
+        with controller.admit(expired):
+            pass
+
+    assert controller.stats()["shed"] == {"deadline": 2}
+    assert controller.stats()["estimated_latency_ms"] == 0.0
+
+
+@pytest.mark.parametrize("overrides", [{"admission_control_enabled": False, "admission_max_in_flight": 1}])
+def test_disabled_admission_control_admits_everything(settings):
+    controller = AdmissionController(StubExecutor(latency=10.0))
+
+    with controller.admit(Deadline(0.01)):
+        with controller.admit(Deadline(0.01)):
+            pass
+
+    assert controller.stats()["shed"] == {}
+
+
+@pytest.fixture
+def slow_executor(monkeypatch):
+    """Make the inference executor estimate one second per call."""
+    monkeypatch.setattr(inference_executor, "estimate_latency", lambda: 1.0)
+
+
+@pytest.mark.parametrize("overrides", [{"overload_policy": "fallback", "micro_batching_enabled": False}])
+def test_fallback_policy_answers_with_rules(client, slow_executor):
+    response = client.post("/api/v1/predictions/single", json=TRANSACTION, headers={"X-Deadline-Ms": "100"})
+    unhurried = client.post("/api/v1/predictions/single", json=TRANSACTION)
+
+    assert response.status_code == 200
+    assert response.headers["X-Decision-Source"] == "rules"
+    body = response.json()
+    assert body["decision_source"] == "rules"
+    assert body["degraded_reason"] == "deadline"
+    assert body["confidence"] == 0.0
+    # Without a deadline the model still scores the request
+    assert unhurried.status_code == 200
+    assert "X-Decision-Source" not in unhurried.headers
+
+
+@pytest.mark.parametrize("overrides", [{"overload_policy": "reject", "micro_batching_enabled": False}])
+def test_reject_policy_answers_503(client, slow_executor):
+    response = client.post("/api/v1/predictions/single", json=TRANSACTION, headers={"X-Deadline-Ms": "100"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["detail"]["error"] == "Service overloaded"
+
+
+@pytest.mark.parametrize("policy", ["fallback", "reject"])
+def test_batches_are_shed_with_503_under_either_policy(client, slow_executor, settings, monkeypatch, policy):
+    monkeypatch.setattr(settings, "overload_policy", policy)
+
+    response = client.post(
+        "/api/v1/predictions/batch",
+        json={"transactions": [TRANSACTION, TRANSACTION]},
+        headers={"X-Deadline-Ms": "100"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,121 @@
+"""Scoring cascade: fitting, routing and evaluation against the full model."""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.core.cascade import (
+    FULL,
+    MANIFEST_FILE,
+    SHALLOW,
+    TYPE_BOUND,
+    evaluate_cascade,
+    fit_cascade,
+    load_cascade,
+    save_cascade
+)
+from app.services.prediction_service import PredictionService, prediction_service
+from benchmarks.synthetic import generate_transactions
+
+MEDIUM, HIGH = 0.4, 0.8
+
+
+@pytest.fixture(scope="module")
+def rows(artifacts):
+    """Feature matrix and type names of synthetic transactions."""
+    payloads = generate_transactions(4000, seed=3)
+    numeric = np.array(
+        [[payload[name] for name in PredictionService.NUMERIC_FEATURES] for payload in payloads],
+        dtype=np.float32
+    )
+    types = np.array([payload["type"] for payload in payloads])
+    features, known_types, finite = prediction_service.build_features(numeric, types, artifacts)
+    assert (known_types & finite).all()
+    return features, types
+
+
+@pytest.fixture(scope="module")
+def cascade(artifacts, rows):
+    features, _ = rows
+    return fit_cascade(
+        artifacts.model, artifacts.version, artifacts.feature_names, dict(artifacts.type_codes),
+        features, MEDIUM, HIGH, shallow_trees=10
+    )
+
+
+def test_fit_bounds_only_types_that_stay_low(cascade, rows):
+    _, types = rows
+
+    assert cascade.bounded_types
+    for name, entry in cascade.type_bounds.items():
+        assert entry["rows"] == int((types == name).sum())
+        assert (entry["bound"] is not None) == (entry["max_score"] < MEDIUM)
+        assert entry["mean_score"] <= entry["max_score"]
+    assert 0.0 <= cascade.low_cutoff <= MEDIUM
+    assert cascade.high_cutoff >= HIGH
+
+
+def test_route_answers_bounded_types_with_their_mean_score(cascade, rows):
+    features, types = rows
+
+    probabilities, stages = cascade.route(features)
+
+    bounded = stages == TYPE_BOUND
+    assert bounded.any()
+    for name in cascade.bounded_types:
+        rows_of_type = bounded & (types == name)
+        entry = cascade.type_bounds[name]
+        # The reported value is the type's typical score, not its maximum
+        np.testing.assert_allclose(probabilities[rows_of_type], entry["mean_score"], rtol=1e-6)
+        assert entry["mean_score"] < entry["bound"]
+
+    shallow = stages == SHALLOW
+    np.testing.assert_allclose(probabilities[shallow], cascade.shallow_proba(features[shallow]), rtol=1e-5)
+    assert ((probabilities[shallow] < cascade.low_cutoff) | (probabilities[shallow] >= cascade.high_cutoff)).all()
+    assert np.isnan(probabilities[stages == FULL]).all()
+    assert not np.isnan(probabilities[stages != FULL]).any()
+
+
+def test_route_sends_rows_outside_the_fit_ranges_on(cascade, rows):
+    features, types = rows
+    name = cascade.bounded_types[0]
+    row = features[types == name][:1].copy()
+    row[0, 1] = cascade.type_bounds[name]["high"][1] * 10  # amount beyond any fit row of the type
+
+    _, stages = cascade.route(row)
+
+    assert stages[0] != TYPE_BOUND
+
+
+def test_evaluate_cascade_agrees_with_the_full_model(cascade, rows, artifacts):
+    features, types = rows
+    labels = np.zeros(len(features), dtype=int)
+
+    report = evaluate_cascade(cascade, artifacts.model, features, types, MEDIUM, HIGH, labels)
+
+    assert report["rows"] == len(features)
+    assert sum(report["stages"].values()) == len(features)
+    assert report["short_circuited"] > 0
+    assert report["risk_level_agreement"] >= 0.99
+    assert sum(entry["rows"] for entry in report["by_type"].values()) == len(features)
+    for name in cascade.bounded_types:
+        assert report["by_type"][name]["type_bound"] > 0
+    assert set(report["labels"]) == {"fraud_rows", "full", "cascade", "delta"}
+
+
+def test_saved_cascade_loads_for_its_model_version_only(cascade, artifacts, tmp_path):
+    save_cascade(cascade, tmp_path)
+    type_codes = dict(artifacts.type_codes)
+
+    loaded = load_cascade(tmp_path, artifacts.version, artifacts.feature_names, type_codes)
+
+    assert loaded.fit_id == cascade.fit_id
+    with pytest.raises(ValueError):
+        load_cascade(tmp_path, "other-version", artifacts.feature_names, type_codes)
+
+    # Cascades written before mean scores were recorded have to be refit
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    (tmp_path / MANIFEST_FILE).write_text(json.dumps({**manifest, "format_version": 1}))
+    with pytest.raises(ValueError):
+        load_cascade(tmp_path, artifacts.version, artifacts.feature_names, type_codes)
@@ -0,0 +1,217 @@
+"""Decision store: DecisionLog, the stores and the routes answering from them."""
+
+import asyncio
+
+import pytest
+
+from app.core.executor import InferenceRejected, inference_executor
+from app.schemas.transaction import TransactionInput
+from app.services.decision_store import (
+    DecisionLog,
+    InMemoryDecisionStore,
+    SQLiteDecisionStore,
+    merge_decided
+)
+
+TRANSACTION = {
+    "step": 1,
+    "type": "TRANSFER",
+    "amount": 181.0,
+    "oldbalanceOrg": 181.0,
+    "newbalanceOrig": 0.0,
+    "oldbalanceDest": 0.0,
+    "newbalanceDest": 0.0
+}
+RESULT = {
+    "is_fraud": False,
+    "fraud_probability": 0.1,
+    "risk_level": "LOW",
+    "recommended_action": "ALLOW",
+    "confidence": 0.8,
+    "explanation": "Low-risk TRANSFER transaction appears legitimate"
+}
+
+
+def transaction(transaction_id: str, **fields) -> TransactionInput:
+    return TransactionInput(**{**TRANSACTION, **fields}, transaction_id=transaction_id)
+
+
+async def started_log(store=None) -> DecisionLog:
+    decision_log = DecisionLog()
+    decision_log.start(store or InMemoryDecisionStore())
+    return decision_log
+
+
+async def drained(decision_log: DecisionLog) -> None:
+    while decision_log.stats()["pending_writes"]:
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.parametrize("overrides", [{"decision_store_linger_ms": 0.0}])
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_first_decision_wins(settings, backend, tmp_path):
+    async def run():
+        store = InMemoryDecisionStore() if backend == "memory" else SQLiteDecisionStore(tmp_path / "d.sqlite3")
+        decision_log = await started_log(store)
+        decision_log.record([transaction("t-1")], [RESULT])
+        await drained(decision_log)
+        # A later decision for the id, committed or still pending, is ignored
+        decision_log.record([transaction("t-1")], [{**RESULT, "risk_level": "HIGH"}])
+        await drained(decision_log)
+        found = await decision_log.find("t-1")
+        await decision_log.stop()
+        return found
+
+    found = asyncio.run(run())
+    assert found["decision"]["risk_level"] == "LOW"
+    assert found["status"] == "decided"
+    assert found["transaction"]["amount"] == TRANSACTION["amount"]
+
+
+@pytest.mark.parametrize("overrides", [{"decision_store_linger_ms": 10_000.0}])
+def test_pending_decisions_are_found_before_commit(settings):
+    async def run():
+        store = InMemoryDecisionStore()
+        decision_log = await started_log(store)
+        decision_log.record([transaction("t-1"), transaction("t-2")], [RESULT, RESULT])
+        await asyncio.sleep(0)
+        committed = store.get_many(["t-1", "t-2"])
+        found = await decision_log.find_many(["t-1", "t-2", "t-3"])
+        await decision_log.stop()
+        return committed, found, store.get_many(["t-1", "t-2"])
+
+    committed, found, after_stop = asyncio.run(run())
+    assert committed == {}
+    assert sorted(found) == ["t-1", "t-2"]
+    assert sorted(after_stop) == ["t-1", "t-2"]  # stop() commits what was queued
+
+
+@pytest.mark.parametrize("overrides", [{"decision_store_linger_ms": 10_000.0, "decision_store_queue_depth": 2}])
+def test_writes_are_dropped_when_the_queue_is_full(settings):
+    async def run():
+        decision_log = await started_log()
+        decision_log.record([transaction(f"t-{index}") for index in range(3)], [RESULT] * 3)
+        stats = decision_log.stats()
+        found = await decision_log.find_many(["t-0", "t-1", "t-2"])
+        with pytest.raises(RuntimeError):
+            await decision_log.approve("t-0")
+        await decision_log.stop()
+        return stats, found
+
+    stats, found = asyncio.run(run())
+    assert stats["dropped"] == 1
+    assert stats["decisions_queued"] == 2
+    assert sorted(found) == ["t-0", "t-1"]
+
+
+@pytest.mark.parametrize("overrides", [{"decision_store_linger_ms": 0.0}])
+def test_unscored_and_rules_decisions_are_not_stored(settings):
+    async def run():
+        decision_log = await started_log()
+        decision_log.record(
+            [transaction("unknown"), transaction("rules")],
+            [{**RESULT, "risk_level": "UNKNOWN"}, {**RESULT, "decision_source": "rules", "confidence": 0.0}]
+        )
+        found = await decision_log.find_many(["unknown", "rules"])
+        await decision_log.stop()
+        return found
+
+    assert asyncio.run(run()) == {}
+
+
+@pytest.mark.parametrize("overrides", [{"decision_store_linger_ms": 0.0}])
+def test_split_decided_answers_stored_and_repeated_ids(settings):
+    async def run():
+        decision_log = await started_log()
+        decision_log.record([transaction("stored")], [RESULT])
+        batch = [
+            transaction("new"),
+            transaction("stored"),
+            transaction("new"),
+            TransactionInput(**TRANSACTION),
+            transaction("other")
+        ]
+        split = await decision_log.split_decided(batch)
+        duplicates = decision_log.stats()["duplicates_answered"]
+        await decision_log.stop()
+        return split, duplicates
+
+    (fresh_rows, stored, repeated), duplicates = asyncio.run(run())
+    assert fresh_rows == [0, 3, 4]
+    assert list(stored) == [1]
+    assert stored[1]["duplicate"] is True
+    assert stored[1]["transaction_id"] == "stored"
+    assert repeated == {2: 0}
+    assert duplicates == 2
+
+
+def test_merge_decided_records():
+    stored = {1: {**RESULT, "risk_level": "MEDIUM", "duplicate": True}}
+    merged = merge_decided(4, [0, 3], [dict(RESULT, fraud_probability=0.2), RESULT], stored, {2: 0})
+
+    assert [result["fraud_probability"] for result in merged] == [0.2, 0.1, 0.2, 0.1]
+    assert merged[1]["risk_level"] == "MEDIUM"
+    assert merged[2]["duplicate"] is True
+    assert "duplicate" not in merged[0]
+
+
+def test_merge_decided_columnar_remaps_error_indexes():
+    predictions = {
+        "fraud_probability": [0.2, 0.0, 0.9],
+        "risk_level": ["LOW", "UNKNOWN", "HIGH"],
+        "errors": [{"index": 1, "message": "Prediction failed"}]
+    }
+    stored = {0: {**RESULT, "contributions": {"amount": 0.5, "bias": -1.0}}}
+
+    merged = merge_decided(5, [1, 2, 4], predictions, stored, {3: 1})
+
+    assert merged["fraud_probability"] == [0.1, 0.2, 0.0, 0.2, 0.9]
+    assert merged["risk_level"] == ["LOW", "LOW", "UNKNOWN", "LOW", "HIGH"]
+    assert merged["errors"] == [{"index": 2, "message": "Prediction failed"}]
+    assert merged["duplicate"] == [True, False, False, True, False]
+    assert merged["contributions"] == [{"amount": 0.5, "bias": -1.0}, None, None, None, None]
+
+
+STORE_ENABLED = {
+    "decision_store_enabled": True,
+    "decision_store_backend": "memory",
+    "decision_store_linger_ms": 0.0,
+    "micro_batching_enabled": False
+}
+
+
+@pytest.mark.parametrize("overrides", [STORE_ENABLED])
+def test_retry_is_answered_from_the_store_and_approved(client):
+    payload = {**TRANSACTION, "transaction_id": "api-1"}
+
+    first = client.post("/api/v1/predictions/single", json=payload).json()
+    retry = client.post("/api/v1/predictions/single", json={**payload, "amount": 1.0}).json()
+    approved = client.post("/api/v1/predictions/approve", json=payload)
+    decision = client.get("/api/v1/predictions/decisions/api-1").json()
+
+    assert not first.get("duplicate")
+    assert retry["duplicate"] is True
+    assert retry["fraud_probability"] == first["fraud_probability"]
+    assert approved.status_code == 200
+    assert decision["status"] == "approved"
+    assert decision["approved_at"] == approved.json()["transaction_details"]["approval_timestamp"]
+    assert client.get("/api/v1/predictions/decisions/unknown").status_code == 404
+
+
+@pytest.mark.parametrize("overrides", [{**STORE_ENABLED, "overload_policy": "fallback"}])
+def test_retry_after_rules_fallback_is_scored_by_the_model(client, monkeypatch):
+    payload = {**TRANSACTION, "transaction_id": "api-overload"}
+
+    async def rejecting(*args, **kwargs):
+        raise InferenceRejected("Inference queue is full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(inference_executor, "run", rejecting)
+        fallback = client.post("/api/v1/predictions/single", json=payload)
+    retry = client.post("/api/v1/predictions/single", json=payload).json()
+
+    assert fallback.headers["X-Decision-Source"] == "rules"
+    assert retry.get("decision_source", "model") == "model"
+    assert not retry.get("duplicate")
+    assert retry["confidence"] > 0
+    assert client.get("/api/v1/predictions/decisions/api-overload").json()["decision"]["confidence"] > 0
@@ -0,0 +1,99 @@
+"""Velocity feature store: sliding windows, LRU eviction and memoization."""
+
+import numpy as np
+
+from app.schemas.transaction import TransactionInput
+from app.services.feature_store import VELOCITY_FEATURES, VelocityFeatureStore
+from app.services.prediction_service import prediction_service
+
+ORIG_OUT_COUNT = VELOCITY_FEATURES.index("orig_out_count")
+ORIG_OUT_AMOUNT = VELOCITY_FEATURES.index("orig_out_amount")
+DEST_IN_COUNT = VELOCITY_FEATURES.index("dest_in_count")
+
+
+def transaction(**fields) -> TransactionInput:
+    return TransactionInput(**{
+        "step": 1,
+        "type": "TRANSFER",
+        "amount": 100.0,
+        "oldbalanceOrg": 100.0,
+        "newbalanceOrig": 0.0,
+        "oldbalanceDest": 0.0,
+        "newbalanceDest": 0.0,
+        **fields
+    })
+
+
+def test_window_expires_across_ring_buckets():
+    store = VelocityFeatureStore(max_accounts=10, window_steps=4)
+    # Steps 3, 4 and 5 land in buckets 3, 0 and 1 of the ring
+    for step, amount in ((3, 1.0), (4, 2.0), (5, 4.0)):
+        store.observe("A", None, step, amount, "PAYMENT")
+
+    # Window 4..7: the step 3 bucket has expired
+    values = store.observe("A", None, 7, 8.0, "PAYMENT")
+    assert values[ORIG_OUT_COUNT] == 2
+    assert values[ORIG_OUT_AMOUNT] == 6.0
+
+    # Window 6..9, wrapping past the end of the ring: only step 7 is left
+    values = store.observe("A", None, 9, 16.0, "PAYMENT")
+    assert values[ORIG_OUT_COUNT] == 1
+    assert values[ORIG_OUT_AMOUNT] == 8.0
+
+    # A jump of a full window or more clears everything
+    values = store.observe("A", None, 20, 1.0, "PAYMENT")
+    assert values[ORIG_OUT_COUNT] == 0
+    assert values[ORIG_OUT_AMOUNT] == 0.0
+
+    # A late transaction older than the window is not counted
+    store.observe("A", None, 2, 32.0, "PAYMENT")
+    values = store.observe("A", None, 20, 1.0, "PAYMENT")
+    assert values[ORIG_OUT_COUNT] == 1
+    assert values[ORIG_OUT_AMOUNT] == 1.0
+
+
+def test_least_recently_seen_account_is_evicted():
+    store = VelocityFeatureStore(max_accounts=2, window_steps=4)
+    store.observe(None, "A", 1, 1.0, "PAYMENT")
+    store.observe(None, "B", 1, 1.0, "PAYMENT")
+    store.observe(None, "A", 1, 1.0, "PAYMENT")
+    store.observe(None, "C", 1, 1.0, "PAYMENT")
+
+    assert list(store._slots) == ["A", "C"]
+    assert store.stats()["evictions"] == 1
+    assert store.stats()["accounts"] == 2
+
+    # B's history went with its slot, which C reused from a clean state
+    assert store.observe(None, "B", 1, 1.0, "PAYMENT")[DEST_IN_COUNT] == 0
+    assert store.observe(None, "C", 1, 1.0, "PAYMENT")[DEST_IN_COUNT] == 1
+    assert store.stats()["evictions"] == 2
+
+
+def test_features_are_memoized_on_the_transaction():
+    store = VelocityFeatureStore(max_accounts=10, window_steps=4)
+    store.observe("A", None, 1, 50.0, "PAYMENT")
+    named = transaction(nameOrig="A")
+    anonymous = transaction()
+
+    first = store.features(named)
+    again = store.features(named)
+    batch = store.features_batch([named, anonymous])
+
+    assert first is again
+    assert first[ORIG_OUT_COUNT] == 1
+    np.testing.assert_array_equal(batch[0], first)
+    assert np.isnan(batch[1]).all()
+    assert store.stats()["observed"] == 2
+    assert store.features_batch([anonymous]) is None
+
+
+def test_store_is_not_updated_for_models_without_velocity_features(artifacts):
+    assert prediction_service.velocity_columns(artifacts) == []
+    observed = prediction_service.velocity_store.stats()["observed"]
+    transactions = [transaction(nameOrig="C1", nameDest="M1"), transaction(nameOrig="C2")]
+
+    prediction_service.predict_batch(transactions)
+    prediction_service.predict_with_explanation(transactions[0])
+
+    assert prediction_service.velocity_store.stats()["observed"] == observed
+    assert all(t._velocity is None for t in transactions)
@@ -0,0 +1,172 @@
+"""Micro-batcher: coalescing, flushing, shedding and error propagation."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.executor import InferenceRejected, InferenceTimeout
+from app.schemas.transaction import TransactionInput
+from app.services.micro_batcher import MicroBatcher, micro_batcher
+
+TRANSACTION = {
+    "step": 1,
+    "type": "TRANSFER",
+    "amount": 181.0,
+    "oldbalanceOrg": 181.0,
+    "newbalanceOrig": 0.0,
+    "oldbalanceDest": 0.0,
+    "newbalanceDest": 0.0
+}
+
+
+def transaction(amount: float) -> TransactionInput:
+    return TransactionInput(**{**TRANSACTION, "amount": amount})
+
+
+class StubService:
+    """Scores a transaction as its amount / 1000; amounts listed in failures are not scored."""
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+
+    def predict_batch(self, transactions):
+        return [
+            {"risk_level": "UNKNOWN", "explanation": f"Processing failed: {self.failures[t.amount]}"}
+            if t.amount in self.failures
+            else {"risk_level": "LOW", "fraud_probability": t.amount / 1000}
+            for t in transactions
+        ]
+
+
+class StubExecutor:
+    """Runs calls inline, recording batch sizes and timeouts."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+        self.timeouts = []
+
+    async def run(self, func, *args, timeout=None):
+        self.batches.append(len(args[0]))
+        self.timeouts.append(timeout)
+        if self.error is not None:
+            raise self.error
+        return func(*args)
+
+
+def run_batcher(scenario, service=None, executor=None, **limits):
+    """Run scenario(batcher, executor) against a started batcher with stub dependencies."""
+    executor = executor or StubExecutor()
+
+    async def run():
+        batcher = MicroBatcher(service or StubService(), executor)
+        batcher.start(**limits)
+        try:
+            return await scenario(batcher, executor)
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(run())
+
+
+def test_concurrent_requests_are_coalesced():
+    async def scenario(batcher, executor):
+        results = await asyncio.gather(*(batcher.submit(transaction(amount)) for amount in range(1, 6)))
+        return results, executor.batches, batcher.stats()
+
+    results, batches, stats = run_batcher(scenario, max_batch_size=8, max_wait_us=50_000)
+    assert [result["fraud_probability"] for result in results] == [0.001, 0.002, 0.003, 0.004, 0.005]
+    assert batches == [5]
+    assert stats["batches"] == 1
+    assert stats["batch_size_histogram"]["<=8"] == 1
+
+
+def test_batches_are_cut_at_max_batch_size():
+    async def scenario(batcher, executor):
+        await asyncio.gather(*(batcher.submit(transaction(amount)) for amount in range(1, 6)))
+        return executor.batches
+
+    assert run_batcher(scenario, max_batch_size=2, max_wait_us=50_000) == [2, 2, 1]
+
+
+def test_lone_request_is_flushed_after_max_wait():
+    async def scenario(batcher, executor):
+        started = time.perf_counter()
+        result = await batcher.submit(transaction(1.0))
+        return result, time.perf_counter() - started, executor.batches
+
+    result, elapsed, batches = run_batcher(scenario, max_batch_size=8, max_wait_us=20_000)
+    assert result["fraud_probability"] == 0.001
+    assert batches == [1]
+    assert 0.015 <= elapsed < 1.0
+
+
+def test_requests_past_queue_depth_are_shed():
+    async def scenario(batcher, executor):
+        # All three are queued before the collector runs again
+        return await asyncio.gather(
+            *(batcher.submit(transaction(amount)) for amount in (1.0, 2.0, 3.0)),
+            return_exceptions=True
+        )
+
+    results = run_batcher(scenario, max_batch_size=8, max_wait_us=1_000, max_queue_depth=2)
+    assert [result["fraud_probability"] for result in results[:2]] == [0.001, 0.002]
+    assert isinstance(results[2], InferenceRejected)
+
+
+def test_row_failures_reach_only_their_caller():
+    service = StubService({
+        2.0: "Invalid transaction type: WIRE",
+        3.0: "Prediction failed: model error"
+    })
+
+    async def scenario(batcher, executor):
+        return await asyncio.gather(
+            *(batcher.submit(transaction(amount)) for amount in (1.0, 2.0, 3.0)),
+            return_exceptions=True
+        )
+
+    ok, invalid, failed = run_batcher(scenario, service=service, max_batch_size=8, max_wait_us=10_000)
+    assert ok["fraud_probability"] == 0.001
+    # ValueError is answered 400 by the route, other errors 500
+    assert type(invalid) is ValueError
+    assert "Invalid transaction type" in str(invalid)
+    assert type(failed) is RuntimeError
+
+
+def test_executor_errors_reach_every_caller():
+    async def scenario(batcher, executor):
+        return await asyncio.gather(
+            *(batcher.submit(transaction(amount)) for amount in (1.0, 2.0)),
+            return_exceptions=True
+        )
+
+    error = InferenceTimeout("Inference did not finish within 0.1s")
+    results = run_batcher(scenario, executor=StubExecutor(error), max_batch_size=8, max_wait_us=10_000)
+    assert results == [error, error]
+
+
+def test_model_call_gets_the_tightest_caller_timeout():
+    async def scenario(batcher, executor):
+        await asyncio.gather(
+            batcher.submit(transaction(1.0), timeout=5.0),
+            batcher.submit(transaction(2.0), timeout=0.5),
+            batcher.submit(transaction(3.0))
+        )
+        await batcher.submit(transaction(4.0))
+        return executor.timeouts
+
+    tightest, unbounded = run_batcher(scenario, max_batch_size=8, max_wait_us=10_000)
+    assert 0.4 < tightest <= 0.5
+    assert unbounded is None
+
+
+@pytest.mark.parametrize("overrides", [{"micro_batching_enabled": True, "micro_batch_max_wait_us": 1_000}])
+def test_preprocessing_failure_is_a_bad_request(client, monkeypatch):
+    monkeypatch.setattr(micro_batcher, "service", StubService({181.0: "Invalid transaction type: TRANSFER"}))
+
+    response = client.post("/api/v1/predictions/single", json=TRANSACTION)
+
+    assert response.status_code == 400
+    assert "Invalid transaction type" in response.json()["detail"]["message"]
@@ -0,0 +1,64 @@
+"""Artifact warmup for models with and without velocity features."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from app.core.model_loader import ModelArtifacts
+from app.core.tree_ensemble import CompiledTreeEnsemble
+from app.schemas.transaction import TransactionInput
+from app.services.prediction_service import prediction_service
+
+BASE_FEATURES = list(ModelArtifacts.WARMUP_VALUES)
+VELOCITY_FEATURES = ["orig_out_count", "dest_in_amount"]
+
+
+@pytest.fixture(scope="module")
+def velocity_artifacts(artifacts) -> ModelArtifacts:
+    """A small model trained with two velocity columns after the base features."""
+    names = BASE_FEATURES + VELOCITY_FEATURES
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.random((200, len(names))).astype(np.float32), columns=names)
+    frame["type_encoded"] = rng.integers(0, len(artifacts.type_codes), 200)
+    model = xgb.XGBClassifier(n_estimators=5, max_depth=3)
+    model.fit(frame, (frame["amount"] > 0.5).astype(int))
+    return ModelArtifacts(
+        model,
+        artifacts.encoder,
+        {"features": names},
+        {},
+        {"model": "a" * 64, "encoder": "b" * 64},
+        compiled_model=CompiledTreeEnsemble.from_booster(model.get_booster())
+    )
+
+
+def test_shipped_artifacts_warm_up(artifacts):
+    assert artifacts.warmup() > 0
+
+
+def test_artifacts_with_velocity_features_warm_up(velocity_artifacts):
+    assert velocity_artifacts.feature_names == BASE_FEATURES + VELOCITY_FEATURES
+    assert velocity_artifacts.warmup() > 0
+
+
+def test_warmup_rows_match_the_preprocessed_layout(velocity_artifacts, monkeypatch):
+    seen = []
+    monkeypatch.setattr(velocity_artifacts.backend, "warmup", seen.append)
+    transaction = TransactionInput(
+        step=1,
+        type="PAYMENT",
+        amount=1000.0,
+        oldbalanceOrg=5000.0,
+        newbalanceOrig=4000.0,
+        oldbalanceDest=0.0,
+        newbalanceDest=1000.0
+    )
+
+    velocity_artifacts.warmup()
+    features, _, _ = prediction_service.preprocess_batch([transaction], velocity_artifacts)
+
+    (rows,) = seen
+    assert rows.shape == (len(velocity_artifacts.type_codes), features.shape[1])
+    warmup_row = rows[list(velocity_artifacts.type_codes).index("PAYMENT")]
+    np.testing.assert_array_equal(warmup_row, features[0])
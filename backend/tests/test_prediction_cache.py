@@ -0,0 +1,154 @@
+"""Prediction caches: LRU eviction, TTL expiry, version flushes and shared slots."""
+
+import uuid
+
+import pytest
+
+from app.services import prediction_cache as cache_module
+from app.services.prediction_cache import PredictionCache, SharedMemoryPredictionCache
+
+# Artifact versions are content hashes; the shared cache tags slots with their first 16 hex digits
+VERSION = "0123456789abcdef0123"
+NEXT_VERSION = "fedcba98765432100123"
+
+
+class Clock:
+    """Stand-in for the time module, advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def shared_cache():
+    """Build shared caches on fresh blocks, unlinked after the test."""
+    caches = []
+
+    def build(max_entries, ttl_seconds=60.0):
+        cache = SharedMemoryPredictionCache(max_entries, ttl_seconds, f"test_cache_{uuid.uuid4().hex[:12]}")
+        caches.append(cache)
+        return cache
+
+    yield build
+    for cache in caches:
+        if cache._shm is not None:
+            cache._shm.close()
+            cache._shm.unlink()
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60.0)
+    cache.put_many([b"a", b"b"], [0.1, 0.2], VERSION)
+    cache.get_many([b"a"], VERSION)  # b is now the least recently used
+    cache.put_many([b"c"], [0.3], VERSION)
+
+    assert cache.get_many([b"a", b"b", b"c"], VERSION) == [0.1, None, 0.3]
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_entries=10, ttl_seconds=5.0)
+    cache.put_many([b"a"], [0.1], VERSION)
+
+    clock.now += 4.9
+    assert cache.get_many([b"a"], VERSION) == [0.1]
+    clock.now += 0.1
+    assert cache.get_many([b"a"], VERSION) == [None]
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_artifact_version_change_flushes_the_cache():
+    cache = PredictionCache(max_entries=10, ttl_seconds=60.0)
+    cache.put_many([b"a", b"b"], [0.1, 0.2], VERSION)
+
+    assert cache.get_many([b"a"], NEXT_VERSION) == [None]
+    assert cache.stats()["flushes"] == 1
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["version"] == NEXT_VERSION
+    # Rows scored with the old version are not served to it afterwards either
+    assert cache.get_many([b"b"], VERSION) == [None]
+
+
+def test_shared_cache_entries_are_per_version_and_expire(shared_cache, clock):
+    cache = shared_cache(max_entries=16, ttl_seconds=5.0)
+    cache.put_many([b"a", b"b"], [0.1, 0.2], VERSION)
+
+    assert cache.get_many([b"a", b"b", b"c"], VERSION) == [0.1, 0.2, None]
+    assert cache.get_many([b"a"], NEXT_VERSION) == [None]
+    clock.now += 5.0
+    assert cache.get_many([b"a"], VERSION) == [None]
+    assert cache.stats()["expirations"] == 1
+
+
+def test_shared_cache_is_seen_by_other_attachments(shared_cache):
+    writer = shared_cache(max_entries=16)
+    writer.put_many([b"a"], [0.1], VERSION)
+    reader = SharedMemoryPredictionCache(16, 60.0, writer.name)
+    try:
+        assert reader.get_many([b"a"], VERSION) == [0.1]
+    finally:
+        reader._shm.close()
+
+
+def test_shared_slot_collision_replaces_the_entry_closest_to_expiry(shared_cache, clock):
+    # Four slots and four probes: every key collides with every other
+    cache = shared_cache(max_entries=4)
+    assert cache.n_slots == cache.PROBE_LENGTH
+    for index, key in enumerate([b"a", b"b", b"c", b"d"]):
+        cache.put_many([key], [index / 10], VERSION)
+        clock.now += 1.0
+
+    cache.put_many([b"e"], [0.9], VERSION)
+
+    assert cache.get_many([b"a", b"b", b"c", b"d", b"e"], VERSION) == [None, 0.1, 0.2, 0.3, 0.9]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_shared_slot_is_overwritten_in_place(shared_cache):
+    cache = shared_cache(max_entries=4)
+    cache.put_many([b"a", b"b"], [0.1, 0.2], VERSION)
+    cache.put_many([b"a"], [0.5], VERSION)
+
+    assert cache.get_many([b"a", b"b"], VERSION) == [0.5, 0.2]
+    assert cache.stats()["evictions"] == 0
+    assert cache.stats()["entries"] == 2
+
+
+def test_shared_slot_being_written_reads_as_a_miss(shared_cache):
+    cache = shared_cache(max_entries=4)
+    cache.put_many([b"a"], [0.1], VERSION)
+    slots = cache._table()
+    index = int(slots["probability"].argmax())
+
+    slots["sequence"][index] += 1  # odd: a writer is midway through the slot
+    assert cache.get_many([b"a"], VERSION) == [None]
+    slots["sequence"][index] += 1
+    assert cache.get_many([b"a"], VERSION) == [0.1]
+
+
+def test_shared_clear_invalidates_every_slot(shared_cache):
+    cache = shared_cache(max_entries=4)
+    cache.put_many([b"a", b"b"], [0.1, 0.2], VERSION)
+
+    cache.clear()
+
+    assert cache.get_many([b"a", b"b"], VERSION) == [None, None]
+    assert cache.stats()["flushes"] == 1
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,58 @@
+"""Parity of the batch and single-transaction prediction paths."""
+
+import numpy as np
+import pytest
+
+from app.schemas.transaction import TransactionInput
+from app.services.prediction_service import prediction_service
+from benchmarks.synthetic import generate_transactions
+
+
+def transaction(amount: float, old_balance: float, new_balance: float) -> TransactionInput:
+    return TransactionInput(
+        step=1,
+        type="TRANSFER",
+        amount=amount,
+        oldbalanceOrg=old_balance,
+        newbalanceOrig=new_balance,
+        oldbalanceDest=0.0,
+        newbalanceDest=0.0
+    )
+
+
+# Values at the pattern thresholds, some within float32 rounding of them
+THRESHOLD_TRANSACTIONS = [
+    transaction(100000.001, 0.0, 0.0),                 # amount just above HIGH_AMOUNT_THRESHOLD
+    transaction(99999.999, 0.0, 0.0),                  # amount just below it
+    transaction(100000.0, 0.0, 0.0),                   # amount on it
+    transaction(50000.0, 1000000.0, 199999.995),       # drain ratio just above DRAIN_RATIO_THRESHOLD
+    transaction(50000.0, 1000000.0, 200000.005),       # drain ratio just below it
+    transaction(50000.0, 0.5, 0.0),                    # balance below 1
+    transaction(1000000.0, 1000000.0, 199999.995),     # HIGH risk, drain ratio just above the threshold
+    transaction(1000000.0, 1000000.0, 200000.005),     # HIGH risk, drain ratio just below it
+]
+
+
+@pytest.mark.parametrize("risk_code", [0, 1, 2])
+def test_explanation_batch_matches_single_at_thresholds(risk_code):
+    risk_level = prediction_service.RISK_LEVELS[risk_code]
+    risk_codes = np.full(len(THRESHOLD_TRANSACTIONS), risk_code)
+
+    batch = prediction_service.generate_explanation_batch(THRESHOLD_TRANSACTIONS, risk_codes)
+
+    assert batch == [
+        prediction_service.generate_explanation(transaction, risk_code == 2, risk_level)
+        for transaction in THRESHOLD_TRANSACTIONS
+    ]
+
+
+def test_predict_batch_matches_predict_with_explanation(artifacts):
+    transactions = [TransactionInput(**payload) for payload in generate_transactions(300, seed=11)]
+    transactions += THRESHOLD_TRANSACTIONS
+
+    batch = prediction_service.predict_batch(transactions)
+
+    for transaction, result in zip(transactions, batch):
+        single = prediction_service.predict_with_explanation(transaction)
+        assert result["risk_level"] == single["risk_level"]
+        assert result["explanation"] == single["explanation"]
@@ -0,0 +1,131 @@
+"""NDJSON streaming endpoint: line handling, chunked scoring and backpressure."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.executor import InferenceRejected, inference_executor
+
+TRANSACTION = {
+    "step": 1,
+    "type": "TRANSFER",
+    "amount": 181.0,
+    "oldbalanceOrg": 181.0,
+    "newbalanceOrig": 0.0,
+    "oldbalanceDest": 0.0,
+    "newbalanceDest": 0.0
+}
+
+
+def line(**fields) -> bytes:
+    return json.dumps({**TRANSACTION, **fields}).encode()
+
+
+def stream(pieces, headers=None):
+    """POST the pieces to /predictions/stream as separate body chunks and parse the result lines."""
+    from app.main import app
+
+    async def body():
+        for piece in pieces:
+            yield piece
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/predictions/stream",
+                content=body(),
+                headers={"Content-Type": "application/x-ndjson", **(headers or {})}
+            )
+        assert response.status_code == 200
+        return [json.loads(text) for text in response.text.splitlines()]
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def executor_calls(monkeypatch):
+    """Record the number of rows of every inference call."""
+    calls = []
+    run = inference_executor.run
+
+    async def recording(func, *args, **kwargs):
+        calls.append(len(args[0]))
+        return await run(func, *args, **kwargs)
+
+    monkeypatch.setattr(inference_executor, "run", recording)
+    return calls
+
+
+@pytest.mark.parametrize("overrides", [{"stream_max_line_bytes": 300}])
+def test_invalid_and_oversized_lines_get_errors(settings, artifacts):
+    oversized = line(note="x" * 400)
+    results = stream([
+        line() + b"\n" + b"{not json\n\n" + oversized[:150],
+        oversized[150:],                                    # the buffered line passes the limit mid-upload
+        b"\n" + oversized + b"\n" + line(amount=5.0) + b"\n",
+        line(amount=7.0)                                    # last line without a newline
+    ])
+
+    assert [result["line"] for result in results] == [1, 2, 4, 5, 6, 7]
+    assert results[0]["risk_level"] != "UNKNOWN"
+    assert "error" in results[1]
+    assert results[2]["error"] == "Line exceeds 300 bytes"
+    assert results[3]["error"] == "Line exceeds 300 bytes"
+    assert results[4]["fraud_probability"] >= 0 and "error" not in results[4]
+    assert "error" not in results[5]
+
+
+@pytest.mark.parametrize("overrides", [{"stream_chunk_size": 3}])
+def test_lines_are_scored_in_chunks(settings, artifacts, executor_calls):
+    amounts = [100.0 * (index + 1) for index in range(8)]
+
+    results = stream([line(amount=amount) + b"\n" for amount in amounts])
+
+    assert executor_calls == [3, 3, 2]
+    assert [result["line"] for result in results] == list(range(1, 9))
+    assert all(result["risk_level"] != "UNKNOWN" for result in results)
+
+
+def test_full_queue_is_retried_until_there_is_room(settings, artifacts, monkeypatch):
+    run = inference_executor.run
+    attempts = []
+
+    async def busy_twice(func, *args, **kwargs):
+        attempts.append(kwargs.get("timeout"))
+        if len(attempts) <= 2:
+            raise InferenceRejected("Inference queue is full")
+        return await run(func, *args, **kwargs)
+
+    monkeypatch.setattr(inference_executor, "run", busy_twice)
+
+    results = stream([line() + b"\n" + line(amount=5.0) + b"\n"])
+
+    assert len(attempts) == 3
+    assert [result.get("decision_source", "model") for result in results] == ["model", "model"]
+
+
+@pytest.mark.parametrize("policy", ["fallback", "reject"])
+def test_full_queue_past_the_deadline_follows_the_overload_policy(settings, artifacts, monkeypatch, policy):
+    monkeypatch.setattr(settings, "overload_policy", policy)
+    attempts = []
+
+    async def always_busy(func, *args, **kwargs):
+        attempts.append(kwargs.get("timeout"))
+        raise InferenceRejected("Inference queue is full")
+
+    monkeypatch.setattr(inference_executor, "run", always_busy)
+
+    results = stream([line(amount=5.0) + b"\n"], headers={"X-Deadline-Ms": "100"})
+
+    # Retried with backoff until the deadline, then answered without the model
+    assert 1 < len(attempts) < 100
+    assert attempts[-1] <= 0.1
+    if policy == "fallback":
+        assert results[0]["decision_source"] == "rules"
+        # Shed by admission control or by the retry loop, whichever sees the deadline pass first
+        assert results[0]["degraded_reason"] in ("deadline", "queue_full")
+    else:
+        assert results[0]["risk_level"] == "UNKNOWN"
+        assert "Service overloaded" in results[0]["explanation"]
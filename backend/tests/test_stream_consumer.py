@@ -0,0 +1,89 @@
+"""Stream consumer: checkpoint resume and deduplication through the decision store."""
+
+import json
+
+import pytest
+
+from app.services.prediction_service import prediction_service
+from app.services.stream_consumer import StreamConsumer
+from app.services.stream_sources import FileSink, FileSource, OffsetCheckpoint
+
+TRANSACTION = {
+    "step": 1,
+    "type": "TRANSFER",
+    "amount": 181.0,
+    "oldbalanceOrg": 181.0,
+    "newbalanceOrig": 0.0,
+    "oldbalanceDest": 0.0,
+    "newbalanceDest": 0.0
+}
+
+
+class StoppingService:
+    """Scores with the prediction service and stops the consumer at its stop_after-th model call."""
+
+    def __init__(self, stop_after=None):
+        self.stop_after = stop_after
+        self.calls = 0
+        self.consumer = None
+
+    def predict_batch(self, transactions):
+        self.calls += 1
+        if self.calls == self.stop_after:
+            self.consumer.stop()
+        return prediction_service.predict_batch(transactions)
+
+
+def consume(tmp_path, stop_after=None):
+    """Run a consumer over input.ndjson, appending to decisions.ndjson."""
+    service = StoppingService(stop_after)
+    consumer = StreamConsumer(
+        FileSource(tmp_path / "input.ndjson", follow=False),
+        FileSink(tmp_path / "decisions.ndjson"),
+        service=service,
+        checkpoint=OffsetCheckpoint(tmp_path / "checkpoint.json"),
+        batch_size=4,
+        linger_ms=50.0,
+        commit_interval_seconds=0.0,
+        metrics_path="",
+        store_decisions=True
+    )
+    service.consumer = consumer
+    return consumer.run()
+
+
+@pytest.mark.parametrize("overrides", [{"decision_store_enabled": True, "decision_store_linger_ms": 0.0}])
+def test_restart_resumes_at_the_checkpoint_and_answers_duplicates_from_the_store(
+    settings, artifacts, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(settings, "decision_store_path", str(tmp_path / "decisions.sqlite3"))
+    ids = [f"t-{index}" for index in range(20)] + ["t-2", "t-15"]
+    lines = [
+        json.dumps({**TRANSACTION, "amount": 100.0 * (index + 1), "transaction_id": transaction_id}).encode() + b"\n"
+        for index, transaction_id in enumerate(ids)
+    ]
+    (tmp_path / "input.ndjson").write_bytes(b"".join(lines))
+    offsets = [sum(len(text) for text in lines[:index + 1]) for index in range(len(lines))]
+
+    first = consume(tmp_path, stop_after=2)
+    second = consume(tmp_path)
+
+    # Stopped after its second batch, committed, and the restart picked up there
+    assert first["committed_offset"] == offsets[7]
+    assert second["started_offset"] == offsets[7]
+    assert second["committed_offset"] == offsets[-1]
+
+    decisions = [json.loads(text) for text in (tmp_path / "decisions.ndjson").read_text().splitlines()]
+    # Every record was answered exactly once, in order
+    assert [decision["offset"] for decision in decisions] == offsets
+    by_id = {}
+    for decision in decisions:
+        by_id.setdefault(decision["transaction_id"], decision)
+
+    # t-2 was decided before the restart, t-15 earlier in the same run
+    for decision in decisions[20:]:
+        original = by_id[decision["transaction_id"]]
+        assert decision["duplicate"] is True
+        assert decision["fraud_probability"] == original["fraud_probability"]
+        assert decision["explanation"] == original["explanation"]
+    assert not any(decision.get("duplicate") for decision in decisions[:20])
@@ -0,0 +1,31 @@
+"""Parity of the compiled tree evaluator with XGBoost."""
+
+import numpy as np
+import pytest
+
+from app.core.tree_ensemble import CompiledTreeEnsemble, parity_probe
+
+
+@pytest.fixture(scope="module")
+def compiled(pickled_model) -> CompiledTreeEnsemble:
+    """The pickled model's trees, compiled."""
+    return CompiledTreeEnsemble.from_booster(pickled_model.get_booster())
+
+
+@pytest.mark.parametrize("n_rows", [1, 10, 1000])
+def test_predict_proba_matches_xgboost(compiled, pickled_model, n_rows):
+    rows = parity_probe(compiled, n_rows, seed=n_rows)
+    expected = pickled_model.predict_proba(rows)
+
+    np.testing.assert_allclose(compiled.predict_proba(rows), expected, rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("n_rows", [1, 10, 1000])
+def test_predict_proba_matches_xgboost_with_missing_values(compiled, pickled_model, n_rows):
+    rows = parity_probe(compiled, n_rows, seed=n_rows + 1)
+    rng = np.random.default_rng(n_rows)
+    rows[rng.random(rows.shape) < 0.2] = np.nan
+    rows[0, :] = np.nan  # every split takes its default direction
+    expected = pickled_model.predict_proba(rows)
+
+    np.testing.assert_allclose(compiled.predict_proba(rows), expected, rtol=0, atol=1e-6)